@@ -8,12 +8,15 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from jurusan_ranking import analyze_by_jurusan
+from snapshot_store import ANALYSIS_COLUMNS, read_snapshot
+
 def load_and_analyze_data():
     """Load data dan analisis top 50 per jurusan"""
     try:
         # Load data
         print("📊 Loading data dari hasil_all_prestasi_rapor.csv...")
-        df = pd.read_csv('hasil_all_prestasi_rapor.csv')
+        df = read_snapshot('hasil_all_prestasi_rapor.csv', columns=ANALYSIS_COLUMNS)
         print(f"✅ Data berhasil dimuat: {len(df)} records")
         
         # Tampilkan info dasar
@@ -45,29 +48,19 @@ def load_and_analyze_data():
         print(f"❌ Error loading data: {e}")
         return None
 
-def create_top50_per_jurusan(df):
+def create_top50_per_jurusan(df, n=50):
     """Buat tabel top 50 untuk setiap jurusan"""
     
-    # Dapatkan daftar jurusan
-    jurusan_list = df['first_option_name'].unique()
-    print(f"\n🎓 Ditemukan {len(jurusan_list)} jurusan:")
+    # Top n dan statistik semua jurusan sekaligus
+    analysis = analyze_by_jurusan(df, n)
+    print(f"\n🎓 Ditemukan {len(analysis)} jurusan:")
     
     results = {}
     
-    for i, jurusan in enumerate(jurusan_list, 1):
+    for i, (jurusan, data) in enumerate(analysis.items(), 1):
         print(f"  {i}. {jurusan}")
         
-        # Filter data untuk jurusan ini
-        jurusan_df = df[df['first_option_name'] == jurusan].copy()
-        
-        # Sort berdasarkan score (descending)
-        jurusan_df = jurusan_df.sort_values('score', ascending=False)
-        
-        # Ambil top 50 (atau semua jika kurang dari 50)
-        top_50 = jurusan_df.head(50).copy()
-        
-        # Tambahkan ranking
-        top_50['Ranking'] = range(1, len(top_50) + 1)
+        top_50 = data['data']
         
         # Pilih kolom yang akan ditampilkan
         display_cols = ['Ranking', 'registration_number', 'name', 'score']
@@ -82,15 +75,15 @@ def create_top50_per_jurusan(df):
         
         results[jurusan] = {
             'data': top_50_display,
-            'total_siswa': len(jurusan_df),
-            'score_tertinggi': jurusan_df['score'].max(),
-            'score_terendah': jurusan_df['score'].min(),
-            'rata_rata_score': jurusan_df['score'].mean()
+            'total_siswa': data['total_siswa'],
+            'score_tertinggi': data['score_tertinggi'],
+            'score_terendah': data['score_terendah'],
+            'rata_rata_score': data['rata_rata_score']
         }
         
-        print(f"     - Total siswa: {len(jurusan_df)}")
-        print(f"     - Top 50: {len(top_50)} siswa")
-        print(f"     - Score range: {jurusan_df['score'].min():.1f} - {jurusan_df['score'].max():.1f}")
+        print(f"     - Total siswa: {data['total_siswa']}")
+        print(f"     - Top {n}: {len(top_50)} siswa")
+        print(f"     - Score range: {data['score_terendah']:.1f} - {data['score_tertinggi']:.1f}")
     
     return results
 
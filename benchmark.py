@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the scrape, load, lookup and top-N paths on synthetic data.
+
+Each benchmark runs in a fresh interpreter so peak RSS belongs to that path alone;
+scrapers run against mock_spmb_server.py. Results are written as JSON:
+
+    python benchmark.py --sizes 1k,10k,100k,1M
+    python benchmark.py --sizes 10M --benchmarks load_snapshot,analyze_prestasi_by_jurusan
+    python benchmark.py --compare benchmark_results/<previous>.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PACKAGE_DIR)
+
+ZONASI_FILE = "hasil_zonasi_only.csv"
+PRESTASI_FILE = "hasil_all_prestasi_rapor.csv"
+
+# name -> (function(workdir, size, api_base) -> dict, largest size it runs at)
+BENCHMARKS: Dict[str, tuple] = {}
+
+def benchmark(name: str, max_size: Optional[int] = None):
+    def register(fn: Callable) -> Callable:
+        BENCHMARKS[name] = (fn, max_size)
+        return fn
+    return register
+
+def parse_size(text: str) -> int:
+    """Parse 1000, 10k, 1M, 1.5M"""
+    text = text.strip().lower().replace('_', '')
+    multiplier = {'k': 1000, 'm': 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+def make_zonasi_frame(size: int, seed: int = 0):
+    """Zonasi results already ranked by distance_1, with registration numbers in random order"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    numbers = pd.Series(rng.permutation(size)).astype(str).str.zfill(7)
+    return pd.DataFrame({
+        'registration_number': '20227910-16-1-' + numbers,
+        'name': 'SISWA ' + pd.Series(np.arange(size)).astype(str),
+        'school_name': pd.Categorical.from_codes(rng.integers(0, 50, size),
+                                                 [f"SMP NEGERI {i} PADALARANG" for i in range(1, 51)]),
+        'option_type': 'zonasi',
+        'first_option_name': 'SMAN 2 PADALARANG - ZONASI',
+        'distance_1': np.sort(rng.uniform(50, 8000, size)).round(1),
+        'created_at': '2025-06-10 08:00:00',
+        'address_city': 'KAB. BANDUNG BARAT',
+    })
+
+def make_prestasi_frame(size: int, seed: int = 0):
+    """Prestasi-rapor results ranked by score, spread over roughly one jurusan per 1000 students"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    jurusan_count = min(1000, max(5, size // 1000))
+    jurusan = [f"SMKN {i // 5 + 1} JABAR - JURUSAN {i + 1} - PRESTASI NILAI RAPOR" for i in range(jurusan_count)]
+    df = pd.DataFrame({
+        'registration_number': '20206224-16-2-' + pd.Series(np.arange(size)).astype(str).str.zfill(7),
+        'name': 'SISWA ' + pd.Series(np.arange(size)).astype(str),
+        'school_name': pd.Categorical.from_codes(rng.integers(0, 50, size),
+                                                 [f"SMP NEGERI {i} PADALARANG" for i in range(1, 51)]),
+        'option_type': 'prestasi-rapor',
+        'first_option_name': pd.Categorical.from_codes(rng.integers(0, jurusan_count, size), jurusan),
+        'score': rng.uniform(300, 400, size).round(2),
+        'created_at': '2025-06-10 08:00:00',
+    })
+    return df.sort_values('score', ascending=False, kind='stable').reset_index(drop=True)
+
+def write_dataset(workdir: str, size: int, seed: int = 0):
+    """Write the zonasi and prestasi CSV files plus their Parquet snapshots"""
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    from snapshot_store import CATEGORY_COLUMNS, snapshot_path
+
+    os.makedirs(workdir, exist_ok=True)
+    for file_name, make_frame in ((ZONASI_FILE, make_zonasi_frame),
+                                  (PRESTASI_FILE, make_prestasi_frame)):
+        path = os.path.join(workdir, file_name)
+        df = make_frame(size, seed)
+        df = df.astype({col: 'category' for col in CATEGORY_COLUMNS if col in df.columns})
+        # The frame is generated already typed, and pandas.to_csv/write_snapshot's per-value
+        # conversion would dominate generation at 10M rows
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pa_csv.write_csv(table, path)
+        pq.write_table(table, snapshot_path(path))
+
+def sample_registrations(workdir: str, count: int = 1000, seed: int = 0) -> List[str]:
+    import pandas as pd
+
+    numbers = pd.read_parquet(os.path.join(workdir, 'hasil_zonasi_only.parquet'),
+                              columns=['registration_number'])['registration_number']
+    return numbers.sample(n=min(count, len(numbers)), random_state=seed, replace=False).tolist()
+
+def timed(fn: Callable, *args, **kwargs):
+    """Call fn with stdout silenced; return (result, seconds)"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return result, time.perf_counter() - started
+
+@benchmark('scrape_pages', max_size=100000)
+def bench_scrape_pages(workdir, size, api_base):
+    from scrape_paginated import PaginatedScraper
+
+    scraper = PaginatedScraper(f"{api_base}/registration", output_file=os.path.join(workdir, 'paginated.csv'),
+                               use_cache=False, requests_per_second=0)
+    records, seconds = timed(scraper.scrape_all_pages, limit_per_page=100, delay=0)
+    return {'seconds': seconds, 'items': len(records), 'unit': 'records'}
+
+@benchmark('scrape_registrations', max_size=10000)
+def bench_scrape_registrations(workdir, size, api_base):
+    from run import RegistrationScraper
+
+    scraper = RegistrationScraper(f"{api_base}/registration", output_file=os.path.join(workdir, 'hasil_valid.csv'),
+                                  max_workers=8, use_cache=False)
+    records, seconds = timed(scraper.scrape_all_registrations, 0, size - 1)
+    return {'seconds': seconds, 'items': size, 'unit': 'probes', 'hits': len(records)}
+
+@benchmark('load_csv')
+def bench_load_csv(workdir, size, api_base):
+    import pandas as pd
+
+    # Both load benchmarks time a second read, after imports and the page cache are warm
+    pd.read_csv(os.path.join(workdir, ZONASI_FILE))
+    df, seconds = timed(pd.read_csv, os.path.join(workdir, ZONASI_FILE))
+    return {'seconds': seconds, 'items': len(df), 'unit': 'rows'}
+
+@benchmark('load_snapshot')
+def bench_load_snapshot(workdir, size, api_base):
+    from snapshot_store import LOOKUP_COLUMNS, read_snapshot
+
+    read_snapshot(os.path.join(workdir, ZONASI_FILE), columns=LOOKUP_COLUMNS)
+    df, seconds = timed(read_snapshot, os.path.join(workdir, ZONASI_FILE), columns=LOOKUP_COLUMNS)
+    return {'seconds': seconds, 'items': len(df), 'unit': 'rows'}
+
+@benchmark('find_registration_position')
+def bench_find_registration_position(workdir, size, api_base):
+    from lookup_position import find_registration_position
+
+    csv_file = os.path.join(workdir, ZONASI_FILE)
+    index_file = os.path.join(workdir, 'hasil_zonasi_only.index.sqlite')
+    if os.path.exists(index_file):
+        os.remove(index_file)
+    targets = sample_registrations(workdir)
+
+    # The first lookup builds the index
+    _, cold = timed(find_registration_position, targets[0], csv_file)
+    _, seconds = timed(lambda: [find_registration_position(number, csv_file) for number in targets])
+    return {'seconds': seconds, 'items': len(targets), 'unit': 'lookups', 'cold_seconds': cold}
+
+@benchmark('show_student_neighbors')
+def bench_show_student_neighbors(workdir, size, api_base):
+    from show_neighbors import show_student_neighbors
+
+    csv_file = os.path.join(workdir, ZONASI_FILE)
+    targets = sample_registrations(workdir)
+
+    # The first query parses the snapshot into the neighbor engine
+    _, cold = timed(show_student_neighbors, targets[0], csv_file)
+    _, seconds = timed(lambda: [show_student_neighbors(number, csv_file) for number in targets])
+    return {'seconds': seconds, 'items': len(targets), 'unit': 'queries', 'cold_seconds': cold}
+
+@benchmark('analyze_prestasi_by_jurusan')
+def bench_analyze_prestasi_by_jurusan(workdir, size, api_base):
+    from jurusan_ranking import analyze_prestasi_by_jurusan
+    from snapshot_store import ANALYSIS_COLUMNS, read_snapshot
+
+    df = read_snapshot(os.path.join(workdir, PRESTASI_FILE), columns=ANALYSIS_COLUMNS)
+    analysis, seconds = timed(analyze_prestasi_by_jurusan, df)
+    return {'seconds': seconds, 'items': len(df), 'unit': 'rows', 'jurusan': len(analysis)}
+
+@benchmark('save_results_to_files')
+def bench_save_results_to_files(workdir, size, api_base):
+    from analisis_top50_jurusan import create_top50_per_jurusan, save_results_to_files
+    from snapshot_store import ANALYSIS_COLUMNS, read_snapshot
+
+    df = read_snapshot(os.path.join(workdir, PRESTASI_FILE), columns=ANALYSIS_COLUMNS)
+    results, _ = timed(create_top50_per_jurusan, df)
+
+    # save_results_to_files writes into the current directory
+    out_dir = os.path.join(workdir, 'top50')
+    os.makedirs(out_dir, exist_ok=True)
+    os.chdir(out_dir)
+    _, seconds = timed(save_results_to_files, results)
+    return {'seconds': seconds, 'items': len(results), 'unit': 'files'}
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB"""
+    # ru_maxrss survives exec on Linux and would report the parent's peak; VmHWM does not
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def run_child(name: str, size: int, workdir: str, api_base: str) -> Dict:
+    """Run one benchmark in this process and return its measurements"""
+    fn, _ = BENCHMARKS[name]
+    baseline = peak_rss_mb()
+    result = fn(workdir, size, api_base)
+    result.update({
+        'benchmark': name,
+        'size': size,
+        'throughput_per_s': round(result['items'] / result['seconds'], 1) if result['seconds'] > 0 else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline,
+    })
+    return result
+
+def run_isolated(name: str, size: int, workdir: str, api_base: str = '') -> Dict:
+    """Run one benchmark in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', name, str(size), workdir, api_base],
+        cwd=PACKAGE_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {'benchmark': name, 'size': size, 'error': completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def run_suite(sizes: List[int], names: List[str], workdir: str, latency: float = 0.0) -> Dict:
+    """Generate data for each size, run the selected benchmarks and collect the results"""
+    from mock_spmb_server import MockSPMBServer, SyntheticDataset
+
+    results = []
+    for size in sizes:
+        size_dir = os.path.join(workdir, f"size_{size}")
+        selected = [name for name in names if BENCHMARKS[name][1] is None or size <= BENCHMARKS[name][1]]
+        skipped = sorted(set(names) - set(selected))
+        if skipped:
+            print(f"⏭️  {size:,} rows: skipping {', '.join(skipped)} (above their size limit)")
+
+        started = time.perf_counter()
+        write_dataset(size_dir, size)
+        print(f"📦 {size:,} rows: data generated in {time.perf_counter() - started:.1f}s")
+
+        server = None
+        if any(name.startswith('scrape_') for name in selected):
+            dataset = SyntheticDataset(registrations_per_school=size)
+            # Generate and sort up front so the scrape timings only measure the client
+            dataset.query('20227910', orderby='distance_1', order='asc')
+            server = MockSPMBServer(dataset, latency=latency).start()
+
+        try:
+            for name in selected:
+                result = run_isolated(name, size, size_dir, server.base_url if server else '')
+                results.append(result)
+                print(format_result(result))
+        finally:
+            if server is not None:
+                server.stop()
+
+    return {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'mock_latency': latency,
+        'results': results,
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PACKAGE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def format_result(result: Dict) -> str:
+    if 'error' in result:
+        return f"   ❌ {result['benchmark']:<28} {result['size']:>10,}  {result['error']}"
+    cold = f"  (cold {result['cold_seconds'] * 1000:.0f} ms)" if 'cold_seconds' in result else ""
+    return (f"   {result['benchmark']:<28} {result['size']:>10,}  {result['seconds'] * 1000:10.1f} ms  "
+            f"{result['throughput_per_s'] or 0:>12,.0f} {result['unit']}/s  "
+            f"peak {result['peak_rss_mb']} MB{cold}")
+
+def compare_runs(current: Dict, previous: Dict) -> List[Dict]:
+    """Match results by (benchmark, size) and report the speedup against a previous run"""
+    before = {(r['benchmark'], r['size']): r for r in previous.get('results', []) if 'seconds' in r}
+    rows = []
+    for result in current.get('results', []):
+        old = before.get((result['benchmark'], result['size']))
+        if old is None or 'seconds' not in result or not result['seconds']:
+            continue
+        rows.append({
+            'benchmark': result['benchmark'],
+            'size': result['size'],
+            'before_seconds': old['seconds'],
+            'after_seconds': result['seconds'],
+            'speedup': round(old['seconds'] / result['seconds'], 2),
+            'rss_delta_mb': round((result.get('peak_rss_mb') or 0) - (old.get('peak_rss_mb') or 0), 1),
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scrape, load, lookup and top-N paths")
+    parser.add_argument('--sizes', default='1k,10k,100k,1M', help="Comma-separated row counts, e.g. 1k,10k,10M")
+    parser.add_argument('--benchmarks', default='all', help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--output', help="Result file (default benchmark_results/<timestamp>.json)")
+    parser.add_argument('--workdir', help="Where synthetic data is written (default: a temporary directory)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Mock API latency in seconds")
+    parser.add_argument('--compare', help="Previous result file to compare against")
+    parser.add_argument('--child', nargs=4, metavar=('NAME', 'SIZE', 'WORKDIR', 'API_BASE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        name, size, workdir, api_base = args.child
+        print(json.dumps(run_child(name, int(size), workdir, api_base)))
+        return
+
+    names = list(BENCHMARKS) if args.benchmarks == 'all' else [name.strip() for name in args.benchmarks.split(',')]
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmarks: {', '.join(unknown)}")
+        sys.exit(1)
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='spmb_bench_')
+    print(f"🏁 Benchmarking {', '.join(names)} at sizes {sizes}")
+    try:
+        run = run_suite(sizes, names, workdir, args.latency)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = args.output or os.path.join('benchmark_results', f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(run, f, indent=2)
+    print(f"\n📁 Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        print(f"\n📊 Compared with {args.compare}:")
+        for row in compare_runs(run, previous):
+            print(f"   {row['benchmark']:<28} {row['size']:>10,}  {row['before_seconds'] * 1000:9.1f} -> "
+                  f"{row['after_seconds'] * 1000:9.1f} ms  x{row['speedup']}  RSS {row['rss_delta_mb']:+} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Province-wide crawl: NPSN x option_type jobs on a persistent SQLite work queue.
+
+Any number of worker processes (spawned here, or started by hand with --worker on
+the same queue file) claim jobs, scrape them with SPMBClient and write one CSV plus
+Parquet snapshot per job. Jobs are leased, so a crashed worker's job is picked up
+again once its lease runs out; rerunning the same command resumes the crawl, and
+--refresh brings finished results up to date: every page is re-verified and a result
+file is rewritten only when its list changed.
+"""
+
+import argparse
+import csv
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from rate_limiter import get_rate_limiter
+from delta_scrape import scrape_delta
+from spmb_client import REGISTRATION_URL, SPMBClient
+
+DEFAULT_OPTION_TYPES = ['zonasi', 'ketm', 'prestasi-rapor']
+
+# Ranking order the portal uses for each option type
+OPTION_ORDERING = {
+    'zonasi': ('distance_1', 'asc'),
+    'ketm': ('distance_1', 'asc'),
+    'perpindahan-tugas-ortu': ('distance_1', 'asc'),
+    'prestasi-rapor': ('score', 'desc'),
+}
+
+DEFAULT_CONFIG = {
+    'base_url': REGISTRATION_URL,
+    'output_dir': 'crawl_results',
+    'requests_per_second': 20.0,
+    'max_requests': None,
+    'page_workers': 4,
+    'limit_per_page': 100,
+    'max_attempts': 4,
+    'retry_delay': 5.0,
+    'lease': 60.0,
+    # Refresh existing result files, rewriting only those that changed (delta_scrape.py)
+    'delta': True,
+}
+
+class BudgetExhausted(Exception):
+    pass
+
+class CrawlQueue:
+    """SQLite-backed job queue shared by worker processes.
+
+    A job is pending, running (leased to one worker until lease_until), done or
+    failed. Failed attempts go back to pending after an exponential delay until
+    max_attempts is reached. The meta table holds the crawl config and the global
+    request counter.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Page-fetch threads spend budget through the same connection
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                npsn TEXT NOT NULL,
+                option_type TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                lease_until REAL,
+                worker TEXT,
+                records INTEGER,
+                output TEXT,
+                error TEXT,
+                updated_at REAL,
+                UNIQUE (npsn, option_type)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front so two workers never claim the same job
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, npsns: List[str], option_types: List[str]) -> int:
+        """Add missing NPSN x option_type jobs; existing jobs keep their state. Returns how many were added"""
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO jobs (npsn, option_type, updated_at) VALUES (?, ?, ?)",
+                             [(npsn, option_type, time.time()) for npsn in npsns for option_type in option_types])
+            return conn.total_changes - before
+
+    def retry_failed(self) -> int:
+        """Give failed jobs a fresh set of attempts"""
+        with self._transaction() as conn:
+            return conn.execute("UPDATE jobs SET status = 'pending', attempts = 0, available_at = 0, error = NULL "
+                                "WHERE status = 'failed'").rowcount
+
+    def refresh_done(self) -> int:
+        """Queue finished jobs again, e.g. to bring a whole crawl up to date"""
+        with self._transaction() as conn:
+            return conn.execute("UPDATE jobs SET status = 'pending', attempts = 0, available_at = 0 "
+                                "WHERE status = 'done'").rowcount
+
+    def claim(self, worker: str, lease: float) -> Optional[Dict]:
+        """Lease the next runnable job (pending, or running with an expired lease) to worker"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE (status = 'pending' AND available_at <= ?) "
+                "OR (status = 'running' AND lease_until < ?) ORDER BY id LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, "
+                         "worker = ?, updated_at = ? WHERE id = ?", (now + lease, worker, now, row['id']))
+        return dict(row, status='running', attempts=row['attempts'] + 1, lease_until=now + lease, worker=worker)
+
+    def extend(self, job_id: int, worker: str, lease: float) -> bool:
+        """Renew a lease; False if the job was taken over by another worker"""
+        with self._transaction() as conn:
+            return conn.execute("UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                                (time.time() + lease, job_id, worker)).rowcount == 1
+
+    def complete(self, job_id: int, worker: str, records: int, output: str) -> bool:
+        """Mark a job done; False (and nothing changed) if worker no longer holds its lease"""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'done', records = ?, output = ?, error = NULL, lease_until = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (records, output, time.time(), job_id, worker)
+            ).rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str, max_attempts: int, retry_delay: float) -> Optional[str]:
+        """Record a failed attempt: back to pending after a delay, or failed for good.
+
+        Returns the new status, or None if worker no longer holds the lease.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'running'",
+                               (job_id, worker)).fetchone()
+            if row is None:
+                return None
+            attempts = row[0]
+            status = 'failed' if attempts >= max_attempts else 'pending'
+            conn.execute("UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_until = NULL, updated_at = ? "
+                         "WHERE id = ?", (status, error, now + retry_delay * 2 ** (attempts - 1), now, job_id))
+        return status
+
+    def release(self, job_id: int, worker: str) -> bool:
+        """Hand a job back untouched (e.g. when the request budget runs out mid-job)"""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), lease_until = NULL, "
+                "updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'", (time.time(), job_id, worker)
+            ).rowcount == 1
+
+    def next_available(self) -> Optional[float]:
+        """When the next job could become runnable, or None if nothing is left to do"""
+        row = self.conn.execute(
+            "SELECT MIN(CASE WHEN status = 'pending' THEN available_at ELSE lease_until END) "
+            "FROM jobs WHERE status IN ('pending', 'running')"
+        ).fetchone()
+        return row[0]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        counts.update(dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()))
+        return counts
+
+    def jobs(self, status: Optional[str] = None) -> List[Dict]:
+        if status is None:
+            rows = self.conn.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        else:
+            rows = self.conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def set_config(self, config: Dict):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('config', ?)", (json.dumps(config),))
+
+    def config(self) -> Dict:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'config'").fetchone()
+        return dict(DEFAULT_CONFIG, **(json.loads(row[0]) if row else {}))
+
+    def spend(self, max_requests: Optional[int]) -> bool:
+        """Count one request against the crawl-wide budget; False once it is used up"""
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO meta VALUES ('requests_used', '0')")
+            return conn.execute(
+                "UPDATE meta SET value = CAST(value AS INTEGER) + 1 "
+                "WHERE key = 'requests_used' AND (? IS NULL OR CAST(value AS INTEGER) < ?)",
+                (max_requests, max_requests)
+            ).rowcount == 1
+
+    def requests_used(self) -> int:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'requests_used'").fetchone()
+        return int(row[0]) if row else 0
+
+class BudgetedLimiter:
+    """Rate limiter front that also counts every request against the queue's budget"""
+
+    def __init__(self, queue: CrawlQueue, limiter, max_requests: Optional[int]):
+        self.queue = queue
+        self.limiter = limiter
+        self.max_requests = max_requests
+
+    def acquire(self):
+        if not self.queue.spend(self.max_requests):
+            raise BudgetExhausted(f"request budget of {self.max_requests} used up")
+        self.limiter.acquire()
+
+    def record(self, status: Optional[int], latency: float) -> Optional[float]:
+        return self.limiter.record(status, latency)
+
+class JobProgress:
+    """progress_bar/status_text for one job; renews the lease as pages arrive"""
+
+    def __init__(self, queue: CrawlQueue, job: Dict, worker: str, lease: float):
+        self.queue = queue
+        self.job = job
+        self.worker = worker
+        self.lease = lease
+        self.renewed_at = time.time()
+        self.message = ""
+
+    def progress(self, value: float):
+        if time.time() - self.renewed_at > self.lease / 4:
+            self.queue.extend(self.job['id'], self.worker, self.lease)
+            self.renewed_at = time.time()
+
+    def text(self, message: str):
+        self.message = message
+
+def job_output_path(output_dir: str, npsn: str, option_type: str) -> str:
+    return os.path.join(output_dir, f"hasil_{npsn}_{option_type}.csv")
+
+def run_job(client: SPMBClient, job: Dict, progress: JobProgress, config: Dict) -> Dict:
+    """Scrape (or delta-refresh) one NPSN x option_type; raises if any page failed so the job is retried"""
+    errors = []
+    client.on_error = errors.append
+    orderby, order = OPTION_ORDERING.get(job['option_type'], ('distance_1', 'asc'))
+    output = job_output_path(config['output_dir'], job['npsn'], job['option_type'])
+    summary = scrape_delta(client, output, progress, progress, config['limit_per_page'], job['npsn'],
+                           job['option_type'], orderby, order, full=not config['delta'])
+    if summary is None or errors:
+        raise RuntimeError(errors[0] if errors else "scrape failed")
+    return summary
+
+def run_worker(queue_path: str, worker: Optional[str] = None) -> Dict:
+    """Drain the queue until no job is left (or the request budget is used up)"""
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    queue = CrawlQueue(queue_path)
+    config = queue.config()
+    client = SPMBClient(config['base_url'], max_workers=config['page_workers'], use_cache=False,
+                        requests_per_second=config['requests_per_second'])
+    client.rate_limiter = BudgetedLimiter(queue, get_rate_limiter(config['base_url'], config['requests_per_second']),
+                                          config['max_requests'])
+    summary = {'worker': worker, 'done': 0, 'retried': 0, 'failed': 0, 'lost': 0, 'records': 0, 'pages': 0,
+               'budget_exhausted': False}
+
+    try:
+        while True:
+            job = queue.claim(worker, config['lease'])
+            if job is None:
+                next_at = queue.next_available()
+                if next_at is None:
+                    break
+                # Wait for a retry delay or another worker's lease instead of exiting early
+                time.sleep(min(max(next_at - time.time(), 0.05), 1.0))
+                continue
+
+            label = f"{job['npsn']}/{job['option_type']}"
+            try:
+                result = run_job(client, job, JobProgress(queue, job, worker, config['lease']), config)
+                if not queue.complete(job['id'], worker, result['records'], result['output']):
+                    # The lease expired and another worker took the job over; its result counts
+                    summary['lost'] += 1
+                    print(f"⚠️  [{worker}] {label}: lease lost to another worker, result ignored")
+                    continue
+                summary['done'] += 1
+                summary['records'] += result['records']
+                summary['pages'] += result['pages_fetched']
+                print(f"✓ [{worker}] {label}: {result['records']} records ({result['mode']}, "
+                      f"{result['pages_fetched']}/{result['total_pages']} pages fetched)")
+            except BudgetExhausted as e:
+                queue.release(job['id'], worker)
+                summary['budget_exhausted'] = True
+                print(f"⏸️  [{worker}] {label}: {e}, stopping")
+                break
+            except Exception as e:
+                status = queue.fail(job['id'], worker, str(e), config['max_attempts'], config['retry_delay'])
+                if status is None:
+                    summary['lost'] += 1
+                    print(f"⚠️  [{worker}] {label}: lease lost to another worker, error ignored: {e}")
+                    continue
+                summary['failed' if status == 'failed' else 'retried'] += 1
+                print(f"❌ [{worker}] {label} attempt {job['attempts']}: {e}"
+                      f"{'' if status == 'pending' else ' (giving up)'}")
+    finally:
+        queue.close()
+
+    return summary
+
+def crawl(npsns: List[str], option_types: List[str], queue_path: str, workers: int = 4,
+          retry_failed: bool = False, refresh: bool = False, poll_interval: float = 2.0, **config) -> Dict:
+    """Queue NPSN x option_type jobs, run worker processes until the queue drains and report.
+
+    config overrides DEFAULT_CONFIG (base_url, output_dir, requests_per_second,
+    max_requests, ...) and is stored in the queue so workers started by hand use it too.
+    """
+    queue = CrawlQueue(queue_path)
+    try:
+        queue.set_config(dict(queue.config(), **config))
+        added = queue.enqueue(npsns, option_types)
+        if retry_failed:
+            queue.retry_failed()
+        if refresh:
+            queue.refresh_done()
+        print(f"📋 {added} new jobs queued, {queue.counts()}")
+
+        started = time.time()
+        processes = [
+            subprocess.Popen([sys.executable, os.path.abspath(__file__), '--worker', '--queue', queue_path],
+                             cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.DEVNULL)
+            for _ in range(max(1, workers))
+        ]
+        while any(process.poll() is None for process in processes):
+            time.sleep(poll_interval)
+            counts = queue.counts()
+            print(f"   {counts['done']} done, {counts['running']} running, {counts['pending']} pending, "
+                  f"{counts['failed']} failed, {queue.requests_used()} requests "
+                  f"({time.time() - started:.0f}s)")
+
+        counts = queue.counts()
+        report = {
+            'counts': counts,
+            'records': sum(job['records'] or 0 for job in queue.jobs('done')),
+            'requests': queue.requests_used(),
+            'seconds': round(time.time() - started, 1),
+            'failed_jobs': [(job['npsn'], job['option_type'], job['error']) for job in queue.jobs('failed')],
+        }
+    finally:
+        queue.close()
+
+    print(f"🏁 {counts['done']} jobs done ({report['records']:,} records, {report['requests']} requests) "
+          f"in {report['seconds']}s; {counts['failed']} failed, {counts['pending'] + counts['running']} left")
+    return report
+
+def read_npsn_file(path: str) -> List[str]:
+    """NPSNs from a text file (one per line, # comments) or a CSV with an npsn column"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if path.endswith('.csv'):
+            return [row['npsn'].strip() for row in csv.DictReader(f) if row.get('npsn', '').strip()]
+        return [line.split('#')[0].strip() for line in f if line.split('#')[0].strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl many schools x option types through a resumable work queue")
+    parser.add_argument('--npsn', nargs='*', default=[], help="NPSNs to crawl")
+    parser.add_argument('--npsn-file', help="File with NPSNs (one per line, or a CSV with an npsn column)")
+    parser.add_argument('--option-types', default=','.join(DEFAULT_OPTION_TYPES), help="Comma-separated option types")
+    parser.add_argument('--queue', default='crawl_queue.sqlite', help="Work queue file")
+    parser.add_argument('--workers', type=int, default=4, help="Worker processes")
+    parser.add_argument('--page-workers', type=int, default=DEFAULT_CONFIG['page_workers'],
+                        help="Concurrent page fetches per worker")
+    parser.add_argument('--rps', type=float, default=DEFAULT_CONFIG['requests_per_second'],
+                        help="Request rate ceiling shared by all workers")
+    parser.add_argument('--max-requests', type=int, help="Stop once this many requests were made in total")
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_CONFIG['max_attempts'])
+    parser.add_argument('--output-dir', default=DEFAULT_CONFIG['output_dir'])
+    parser.add_argument('--retry-failed', action='store_true', help="Give failed jobs another set of attempts")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Crawl finished jobs again: re-verify every page, rewrite only lists that changed")
+    parser.add_argument('--full', action='store_true', help="Redownload every page instead of delta refreshes")
+    parser.add_argument('--status', action='store_true', help="Show queue progress and exit")
+    parser.add_argument('--worker', action='store_true', help="Only drain an existing queue in this process")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.queue)))
+        return
+
+    if args.status:
+        queue = CrawlQueue(args.queue)
+        print(f"{queue.counts()}, {queue.requests_used()} requests used")
+        for job in queue.jobs('failed'):
+            print(f"   ❌ {job['npsn']}/{job['option_type']}: {job['error']}")
+        queue.close()
+        return
+
+    npsns = list(args.npsn) + (read_npsn_file(args.npsn_file) if args.npsn_file else [])
+    option_types = [option_type.strip() for option_type in args.option_types.split(',') if option_type.strip()]
+    if not npsns and not os.path.exists(args.queue):
+        print("❌ Give --npsn or --npsn-file (or an existing --queue to resume)")
+        sys.exit(1)
+
+    report = crawl(npsns, option_types, args.queue, workers=args.workers, retry_failed=args.retry_failed,
+                   refresh=args.refresh, delta=not args.full, base_url=REGISTRATION_URL, output_dir=args.output_dir, requests_per_second=args.rps,
+                   max_requests=args.max_requests, page_workers=args.page_workers,
+                   max_attempts=args.max_attempts)
+    for npsn, option_type, error in report['failed_jobs']:
+        print(f"   ❌ {npsn}/{option_type}: {error}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Delta scraping: refresh a scraped result file and rewrite it only when it changed.
+
+Next to each output CSV a manifest (hasil_x.pages.json) keeps the scrape parameters,
+total_records and a content hash per page. A refresh fetches every page
+concurrently and compares the hashes in page order. When they all match, the CSV,
+its snapshot and the manifest are left untouched (mode 'unchanged'), so the poll
+daemon, registration indexes and watchlists see no change. Otherwise the result is
+rewritten and the first changed page is reported. Pass full=True, or --full on
+the command line, to ignore the manifest.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from snapshot_store import SNAPSHOT_COLUMNS, read_snapshot, to_snapshot_frame, write_snapshot
+
+def manifest_path(path: str) -> str:
+    """Page manifest stored next to a CSV file (hasil_x.csv -> hasil_x.pages.json)"""
+    return f"{os.path.splitext(path)[0]}.pages.json"
+
+def page_hash(items: List[Dict]) -> str:
+    return hashlib.sha1(json.dumps(items, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def load_manifest(path: str) -> Optional[Dict]:
+    try:
+        with open(manifest_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_manifest(path: str, manifest: Dict):
+    target = manifest_path(path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, target)
+
+def save_frame(df, path: str):
+    """Write the merged frame as CSV (atomically) plus its Parquet snapshot"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    write_snapshot(df, path, columns=SNAPSHOT_COLUMNS)
+
+def _fetch_pages(client, pages: List[int], limit_per_page: int, params: tuple,
+                 progress_bar=None) -> Dict[int, Optional[List[Dict]]]:
+    """Fetch pages concurrently with the client's workers; failed pages map to None"""
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+        futures = {executor.submit(client.fetch_page, page, limit_per_page, *params): page for page in pages}
+        for future in as_completed(futures):
+            data = future.result()
+            fetched[futures[future]] = None if data is None else data.get('result', {}).get('itemsList', [])
+            if progress_bar is not None:
+                progress_bar.progress(len(fetched) / len(pages))
+    return fetched
+
+def scrape_delta(client, path: str, progress_bar, status_text, limit_per_page: int = 100,
+                 npsn: str = '20227910', option_type: str = 'zonasi', orderby: str = 'distance_1',
+                 order: str = 'asc', major_id: str = None, full: bool = False) -> Optional[Dict]:
+    """Bring the result file at path up to date, writing it only if a page changed.
+
+    client is an SPMBClient. Falls back to a full scrape when there is no usable
+    manifest or snapshot, or when the parameters differ. Returns a summary
+    (mode 'full', 'delta' or 'unchanged', records, pages fetched, first changed
+    page) or None if a page could not be fetched; the file is then left untouched.
+    """
+    params = (npsn, option_type, orderby, order, major_id)
+    key = [*params, limit_per_page]
+    manifest = None if full else load_manifest(path)
+    if manifest is not None and (manifest.get('params') != key or not os.path.exists(path)):
+        manifest = None
+
+    status_text.text("Fetching page 1...")
+    first = client.fetch_page(1, limit_per_page, *params)
+    if first is None:
+        return None
+    result = first.get('result', {})
+    pagination = result.get('pagination', {})
+    total_records = pagination.get('total_records', 0)
+    total_pages = pagination.get('total_pages') or -(-total_records // limit_per_page)
+    pages = {1: result.get('itemsList', [])}
+    if not pages[1]:
+        total_records = total_pages = 0
+
+    hashes = manifest['hashes'] if manifest else []
+    if manifest is not None and len(read_snapshot(path, ['registration_number'])) != manifest['total_records']:
+        hashes, manifest = [], None
+
+    # Every page is fetched: a withdrawal and a later insert (or an edited distance)
+    # leave the count and the tail pages unchanged, so no subset of pages proves
+    # that the rest of the list is the same
+    missing = list(range(2, total_pages + 1))
+    status_text.text(f"Fetching pages 2-{total_pages} ({len(missing)} to download)...")
+    pages.update(_fetch_pages(client, missing, limit_per_page, params, progress_bar))
+    fresh = [pages[page] for page in range(1, total_pages + 1)]
+    if any(items is None for items in fresh):
+        return None
+
+    # Compare in page order; the first mismatch is where the list changed
+    fresh_hashes = [page_hash(items) for items in fresh]
+    first_changed = next((page for page, digest in enumerate(fresh_hashes, 1)
+                          if page > len(hashes) or digest != hashes[page - 1]), None)
+    if first_changed is None and manifest is not None and len(hashes) == total_pages \
+            and total_records == manifest['total_records']:
+        progress_bar.progress(1.0)
+        status_text.text(f"No changes ({total_records} records, {total_pages} pages verified)")
+        return {'mode': 'unchanged', 'records': total_records, 'total_pages': total_pages,
+                'first_changed': None, 'pages_fetched': len(pages), 'output': path}
+
+    df = to_snapshot_frame([record for items in fresh for record in items], SNAPSHOT_COLUMNS)
+    save_frame(df, path)
+    save_manifest(path, {'params': key, 'total_records': len(df), 'hashes': fresh_hashes})
+    progress_bar.progress(1.0)
+    mode = 'delta' if manifest is not None else 'full'
+    first_changed = first_changed or total_pages + 1
+    status_text.text(f"{len(df)} records ({mode}: first change on page {first_changed})")
+    return {'mode': mode, 'records': len(df), 'total_pages': total_pages, 'first_changed': first_changed,
+            'pages_fetched': len(pages), 'output': path}
+
+class ConsoleProgress:
+    """progress_bar/status_text that prints status lines"""
+
+    def progress(self, value: float):
+        pass
+
+    def text(self, message: str):
+        print(f"   {message}")
+
+def main():
+    from crawl_orchestrator import OPTION_ORDERING
+    from spmb_client import REGISTRATION_URL, SPMBClient
+
+    parser = argparse.ArgumentParser(description="Refresh a scraped result file: re-verify every page, rewrite only when the list changed")
+    parser.add_argument('--npsn', default='20227910')
+    parser.add_argument('--option-type', default='zonasi', choices=sorted(OPTION_ORDERING))
+    parser.add_argument('--major-id', help="Only this prestasi-rapor option")
+    parser.add_argument('--output', help="Result CSV (default hasil_<npsn>_<option_type>.csv)")
+    parser.add_argument('--limit', type=int, default=100, help="Records per page")
+    parser.add_argument('--rps', type=float, default=5.0, help="Requests per second")
+    parser.add_argument('--full', action='store_true', help="Ignore the manifest and redownload every page")
+    args = parser.parse_args()
+
+    output = args.output or f"hasil_{args.npsn}_{args.option_type}.csv"
+    orderby, order = OPTION_ORDERING[args.option_type]
+    client = SPMBClient(REGISTRATION_URL, requests_per_second=args.rps, use_cache=False)
+    progress = ConsoleProgress()
+    summary = scrape_delta(client, output, progress, progress, args.limit, args.npsn, args.option_type,
+                           orderby, order, args.major_id, full=args.full)
+    if summary is None:
+        print("❌ Refresh failed; the previous file was kept")
+        return
+    print(f"✓ {output}: {summary['records']} records, {summary['mode']}, "
+          f"{summary['pages_fetched']}/{summary['total_pages']} pages fetched")
+
+if __name__ == "__main__":
+    main()
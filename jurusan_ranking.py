@@ -0,0 +1,210 @@
+import heapq
+import math
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+def clean_jurusan_name(jurusan: str) -> str:
+    """Strip the school prefix and program suffix from a first_option_name"""
+    clean_name = str(jurusan).replace('SMKN 4 PADALARANG - ', '').replace('SMAN 2 PADALARANG - ', '')
+    return clean_name.replace(' - PRESTASI NILAI RAPOR', '')
+
+def prepare_scores(df: pd.DataFrame, sort_key: str = 'score') -> pd.DataFrame:
+    """Drop rows without a jurusan or a numeric sort key"""
+    df_clean = df.dropna(subset=['first_option_name', sort_key]).copy()
+    df_clean[sort_key] = pd.to_numeric(df_clean[sort_key], errors='coerce')
+    return df_clean.dropna(subset=[sort_key]).reset_index(drop=True)
+
+def _top_positions(codes: np.ndarray, keys: np.ndarray, n: int):
+    """Row positions and rankings of the n smallest keys per group code.
+
+    Rows are bucketed by group once, then each bucket is cut to its n best with
+    argpartition and only those are sorted. Ties keep the original row order.
+    """
+    by_group = np.argsort(codes, kind='stable')
+    sorted_codes = codes[by_group]
+    bounds = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1], True])
+
+    positions = []
+    rankings = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        rows = by_group[start:end]
+        block = keys[rows]
+        if len(block) > n:
+            # Keep everything tied with the n-th key so ties resolve by row order
+            threshold = block[np.argpartition(block, n - 1)[n - 1]]
+            rows = rows[block <= threshold]
+            block = keys[rows]
+        best = rows[np.lexsort((rows, block))][:n]
+        positions.append(best)
+        rankings.append(np.arange(1, len(best) + 1))
+
+    if not positions:
+        return np.array([], dtype=np.intp), np.array([], dtype=np.int64)
+    return np.concatenate(positions), np.concatenate(rankings)
+
+def top_n_per_jurusan(df: pd.DataFrame, n: int = 50, sort_key: str = 'score',
+                      ascending: bool = False) -> pd.DataFrame:
+    """Top n rows of every jurusan with a Ranking column, jurusan in order of first appearance.
+
+    Expects a frame from prepare_scores (no missing jurusan or sort key).
+    """
+    if len(df) == 0 or n <= 0:
+        return df.iloc[0:0].assign(Ranking=pd.Series(dtype='int64'))
+
+    codes, _ = pd.factorize(df['first_option_name'], sort=False)
+    keys = df[sort_key].to_numpy(dtype='float64')
+    positions, rankings = _top_positions(codes, keys if ascending else -keys, n)
+
+    top = df.iloc[positions].copy()
+    top['Ranking'] = rankings
+    return top
+
+def jurusan_stats(df: pd.DataFrame, sort_key: str = 'score') -> pd.DataFrame:
+    """Count, max, min, mean and median of the sort key per jurusan in one aggregation"""
+    return df.groupby('first_option_name', sort=False, observed=True)[sort_key].agg(
+        total_siswa='count',
+        score_tertinggi='max',
+        score_terendah='min',
+        rata_rata_score='mean',
+        median_score='median'
+    )
+
+def analyze_by_jurusan(df: pd.DataFrame, n: int = 50, sort_key: str = 'score',
+                       ascending: bool = False) -> Dict[str, Dict]:
+    """Top n and score statistics per jurusan, keyed by first_option_name"""
+    df_clean = prepare_scores(df, sort_key)
+    top = top_n_per_jurusan(df_clean, n, sort_key, ascending)
+    stats = jurusan_stats(df_clean, sort_key)
+
+    # top holds each jurusan's rows contiguously, in the same order as stats
+    starts = np.flatnonzero(top['Ranking'].to_numpy() == 1)
+    ends = np.r_[starts[1:], len(top)]
+
+    results = {}
+    for (jurusan, row), start, end in zip(stats.to_dict('index').items(), starts, ends):
+        results[str(jurusan)] = {'data': top.iloc[start:end], **row}
+        results[str(jurusan)]['total_siswa'] = int(row['total_siswa'])
+    return results
+
+def analyze_prestasi_by_jurusan(df: pd.DataFrame, n: int = 50, sort_key: str = 'score') -> Dict:
+    """Analyze prestasi-rapor data and create top n per jurusan"""
+    if df is None or len(df) == 0:
+        return {}
+
+    results = {}
+    for jurusan, analysis in analyze_by_jurusan(df, n, sort_key).items():
+        results[clean_jurusan_name(jurusan)] = analysis
+
+    return results
+
+def build_comparison_frame(jurusan_analysis: Dict) -> pd.DataFrame:
+    """One row of score statistics per jurusan, highest top score first"""
+    comparison_data = []
+    for jurusan, data in jurusan_analysis.items():
+        comparison_data.append({
+            'Jurusan': jurusan,
+            'Total_Siswa': data['total_siswa'],
+            'Score_Tertinggi': data['score_tertinggi'],
+            'Score_Terendah': data['score_terendah'],
+            'Rata_Rata': round(data['rata_rata_score'], 1),
+            'Median': round(data['median_score'], 1)
+        })
+
+    comparison_df = pd.DataFrame(comparison_data)
+    if len(comparison_df) > 0:
+        comparison_df = comparison_df.sort_values('Score_Tertinggi', ascending=False)
+    return comparison_df
+
+class StreamingTopK:
+    """Top k per jurusan maintained incrementally while pages arrive.
+
+    Keeps one bounded heap per first_option_name plus running count/max/min/sum, so
+    memory is O(k x jurusan) no matter how many records stream through. Ties keep
+    arrival order, matching analyze_by_jurusan on the same rows.
+    """
+
+    def __init__(self, k: int = 50, sort_key: str = 'score', ascending: bool = False):
+        self.k = k
+        self.sort_key = sort_key
+        self.ascending = ascending
+        self.heaps = {}
+        self.stats = {}
+        self.seen = 0
+        self.lock = threading.Lock()
+
+    def add(self, records: Iterable[Dict]) -> int:
+        """Consume a page of API records; returns how many were ranked"""
+        ranked = 0
+        with self.lock:
+            for record in records:
+                jurusan = record.get('first_option_name')
+                try:
+                    value = float(record.get(self.sort_key))
+                except (TypeError, ValueError):
+                    continue
+                if not jurusan or math.isnan(value):
+                    continue
+
+                self.seen += 1
+                ranked += 1
+                stats = self.stats.setdefault(jurusan, [0, value, value, 0.0])
+                stats[0] += 1
+                stats[1] = max(stats[1], value)
+                stats[2] = min(stats[2], value)
+                stats[3] += value
+
+                # The heap root is the current worst entry: lowest priority, latest arrival
+                priority = -value if self.ascending else value
+                entry = (priority, -self.seen, record)
+                heap = self.heaps.setdefault(jurusan, [])
+                if len(heap) < self.k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+        return ranked
+
+    def top(self, jurusan: str) -> List[Dict]:
+        with self.lock:
+            entries = list(self.heaps.get(jurusan, []))
+        return [entry[2] for entry in sorted(entries, key=lambda entry: entry[:2], reverse=True)]
+
+    def summary(self) -> List[Dict]:
+        """One row per jurusan with the current k-th best score (the cutoff so far)"""
+        rows = []
+        with self.lock:
+            for jurusan, (count, highest, lowest, total) in self.stats.items():
+                heap = self.heaps[jurusan]
+                cutoff = heap[0][0] if len(heap) >= self.k else np.nan
+                rows.append({
+                    'Jurusan': clean_jurusan_name(jurusan),
+                    'Total_Siswa': count,
+                    'Score_Tertinggi': highest,
+                    f'Score_Ke_{self.k}': -cutoff if self.ascending else cutoff,
+                    'Rata_Rata': round(total / count, 1)
+                })
+        return rows
+
+    def results(self) -> Dict[str, Dict]:
+        """Partial analysis in the analyze_by_jurusan shape (median is not tracked: NaN)"""
+        with self.lock:
+            jurusan_list = list(self.stats)
+            stats = {jurusan: list(values) for jurusan, values in self.stats.items()}
+
+        results = {}
+        for jurusan in jurusan_list:
+            count, highest, lowest, total = stats[jurusan]
+            data = pd.DataFrame(self.top(jurusan))
+            data[self.sort_key] = pd.to_numeric(data[self.sort_key], errors='coerce')
+            data['Ranking'] = range(1, len(data) + 1)
+            results[str(jurusan)] = {
+                'data': data,
+                'total_siswa': count,
+                'score_tertinggi': highest,
+                'score_terendah': lowest,
+                'rata_rata_score': total / count,
+                'median_score': np.nan
+            }
+        return results
@@ -1,68 +1,75 @@
+import argparse
 import csv
+import json
 import sys
+from typing import Dict, Iterable, List, Tuple
+
+from registration_index import get_index
+
+def calculate_acceptance_probability(position: int, quota: int = 139):
+    """Return (probability, status, color) for a zonasi position against the quota"""
+    if position <= quota:
+        if position <= quota * 0.3:  # Top 30% of quota
+            probability = 95.0
+            status = "SANGAT TINGGI"
+            color = "🟢"
+        elif position <= quota * 0.6:  # Top 60% of quota
+            probability = 85.0
+            status = "TINGGI"
+            color = "🟢"
+        elif position <= quota * 0.8:  # Top 80% of quota
+            probability = 75.0
+            status = "SEDANG-TINGGI"
+            color = "🟡"
+        else:  # Within quota but lower position
+            probability = 65.0
+            status = "SEDANG"
+            color = "🟡"
+    else:
+        # Beyond quota
+        excess = position - quota
+        if excess <= 20:
+            probability = 40.0
+            status = "RENDAH"
+            color = "🔴"
+        elif excess <= 50:
+            probability = 20.0
+            status = "SANGAT RENDAH"
+            color = "🔴"
+        else:
+            probability = 5.0
+            status = "SANGAT RENDAH"
+            color = "🔴"
+
+    return probability, status, color
 
 def find_registration_position(registration_number: str, csv_file: str = "hasil_zonasi_only.csv", quota: int = 139):
     """Find position and calculate acceptance probability for a registration number"""
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            data = list(reader)
-        
-        # Data is already filtered to zonasi only
-        zonasi_data = data
-
-        for i, record in enumerate(zonasi_data):
-            if record['registration_number'] == registration_number:
-                position = i + 1
-                
-                # Calculate acceptance probability based on quota of 139
-                if position <= quota:
-                    if position <= quota * 0.3:  # Top 30% of quota
-                        probability = 95.0
-                        status = "SANGAT TINGGI"
-                        color = "🟢"
-                    elif position <= quota * 0.6:  # Top 60% of quota
-                        probability = 85.0
-                        status = "TINGGI"
-                        color = "🟢"
-                    elif position <= quota * 0.8:  # Top 80% of quota
-                        probability = 75.0
-                        status = "SEDANG-TINGGI"
-                        color = "🟡"
-                    else:  # Within quota but lower position
-                        probability = 65.0
-                        status = "SEDANG"
-                        color = "🟡"
-                else:
-                    # Beyond quota
-                    excess = position - quota
-                    if excess <= 20:
-                        probability = 40.0
-                        status = "RENDAH"
-                        color = "🔴"
-                    elif excess <= 50:
-                        probability = 20.0
-                        status = "SANGAT RENDAH"
-                        color = "🔴"
-                    else:
-                        probability = 5.0
-                        status = "SANGAT RENDAH"
-                        color = "🔴"
-                
-                return {
-                    'found': True,
-                    'position': position,
-                    'total_zonasi': len(zonasi_data),
-                    'total_all': len(data),
-                    'quota': quota,
-                    'probability': probability,
-                    'status': status,
-                    'color': color,
-                    'student_data': record
-                }
-        
-        return {'found': False}
-        
+        # Data is already filtered to zonasi only; the index is rebuilt when the CSV changes
+        index = get_index(csv_file)
+        entry = index.lookup(registration_number)
+
+        if entry is None:
+            return {'found': False}
+
+        position, record = entry
+
+        # Calculate acceptance probability based on quota of 139
+        probability, status, color = calculate_acceptance_probability(position, quota)
+
+        return {
+            'found': True,
+            'position': position,
+            'total_zonasi': index.total,
+            'total_all': index.total,
+            'quota': quota,
+            'probability': probability,
+            'status': status,
+            'color': color,
+            'student_data': record
+        }
+
     except FileNotFoundError:
         print(f"File {csv_file} tidak ditemukan. Pastikan sudah menjalankan scraper terlebih dahulu.")
         return {'found': False}
@@ -102,7 +109,127 @@ def display_position_report(registration_number: str, quota: int = 139):
     print(f"📏 Jarak: {student.get('distance_1', 'N/A')} meter")
     print(f"{'='*60}\n")
 
+def read_batch_targets(lines: Iterable[str], default_quota: int = 139) -> List[Tuple[str, int]]:
+    """Parse "registration_number[,quota]" lines; blank lines, # comments and a header are skipped"""
+    targets = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        parts = [part.strip() for part in line.replace(';', ',').replace('\t', ',').split(',')]
+        if parts[0].lower() == 'registration_number':
+            continue
+
+        try:
+            quota = int(parts[1]) if len(parts) > 1 and parts[1] else default_quota
+        except ValueError:
+            quota = default_quota
+        targets.append((parts[0], quota))
+
+    return targets
+
+def find_registration_positions(targets: List[Tuple[str, int]], csv_file: str = "hasil_zonasi_only.csv") -> List[Dict]:
+    """Resolve many (registration_number, quota) pairs in a single pass over the CSV"""
+    wanted = {registration_number for registration_number, _ in targets}
+    found = {}
+    total = 0
+
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        reg_col = header.index('registration_number')
+        name_col = header.index('name') if 'name' in header else None
+        distance_col = header.index('distance_1') if 'distance_1' in header else None
+
+        for row in reader:
+            if not row:
+                continue
+            total += 1
+            registration_number = row[reg_col]
+            # First occurrence wins, like the single lookup
+            if registration_number in wanted and registration_number not in found:
+                found[registration_number] = (
+                    total,
+                    row[name_col] if name_col is not None else '',
+                    row[distance_col] if distance_col is not None else ''
+                )
+
+    report = []
+    for registration_number, quota in targets:
+        if registration_number not in found:
+            report.append({
+                'registration_number': registration_number, 'found': False, 'position': None,
+                'total_zonasi': total, 'quota': quota, 'in_quota': False, 'probability': None,
+                'status': None, 'distance_1': None, 'name': None
+            })
+            continue
+
+        position, name, distance = found[registration_number]
+        probability, status, _ = calculate_acceptance_probability(position, quota)
+        report.append({
+            'registration_number': registration_number, 'found': True, 'position': position,
+            'total_zonasi': total, 'quota': quota, 'in_quota': position <= quota,
+            'probability': probability, 'status': status, 'distance_1': distance, 'name': name
+        })
+
+    return report
+
+def write_batch_report(report: List[Dict], output, output_format: str = 'csv'):
+    """Write the batch report as CSV or JSON to an open text stream"""
+    if output_format == 'json':
+        json.dump(report, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+        return
+
+    fieldnames = ['registration_number', 'found', 'position', 'total_zonasi', 'quota',
+                  'in_quota', 'probability', 'status', 'distance_1', 'name']
+    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in report:
+        writer.writerow({key: '' if value is None else value for key, value in row.items()})
+
+def batch_main(argv: List[str]):
+    """Batch mode: python lookup_position.py --batch <file|-> [--quota N] [--output file] [--format csv|json]"""
+    parser = argparse.ArgumentParser(prog="lookup_position.py --batch",
+                                     description="Lookup many registration numbers in one pass")
+    parser.add_argument('input', help="File with one registration_number[,quota] per line, or - for stdin")
+    parser.add_argument('--quota', type=int, default=139, help="Default quota (default: 139)")
+    parser.add_argument('--csv-file', default="hasil_zonasi_only.csv", help="Zonasi result file")
+    parser.add_argument('--output', help="Report file (default: stdout)")
+    parser.add_argument('--format', choices=['csv', 'json'], help="Report format (default: from --output extension, else csv)")
+    args = parser.parse_args(argv)
+
+    if args.input == '-':
+        targets = read_batch_targets(sys.stdin, args.quota)
+    else:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            targets = read_batch_targets(f, args.quota)
+
+    output_format = args.format or ('json' if args.output and args.output.endswith('.json') else 'csv')
+
+    try:
+        report = find_registration_positions(targets, args.csv_file)
+    except FileNotFoundError:
+        print(f"File {args.csv_file} tidak ditemukan. Pastikan sudah menjalankan scraper terlebih dahulu.", file=sys.stderr)
+        return
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            write_batch_report(report, f, output_format)
+    else:
+        write_batch_report(report, sys.stdout, output_format)
+
+    found = sum(1 for row in report if row['found'])
+    in_quota = sum(1 for row in report if row['in_quota'])
+    print(f"✅ {found}/{len(report)} nomor ditemukan, {in_quota} dalam kuota", file=sys.stderr)
+
 def main():
+    # Batch mode writes a machine-readable report, so skip the banner
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        batch_main(sys.argv[2:])
+        return
+
     print("🔍 PENCARIAN POSISI PENERIMAAN SISWA")
     print("Data berdasarkan hasil scraping terbaru (sudah diurutkan berdasarkan jarak)")
     print("="*80)
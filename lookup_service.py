@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Local JSON lookup service for positions, neighbors and top-N per jurusan.
+
+Loads the latest snapshots once, answers from memory with an LRU cache of rendered
+responses, and hot-swaps to new snapshots when the scrapers rewrite them.
+
+    python lookup_service.py --port 8765
+    curl localhost:8765/position/20227910-16-1-00369?quota=139
+    curl localhost:8765/neighbors/20227910-16-1-00369?k=5
+    curl "localhost:8765/top?jurusan=PEMASARAN&n=50"
+"""
+
+import argparse
+import json
+import math
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from jurusan_ranking import clean_jurusan_name
+from lookup_position import calculate_acceptance_probability
+from show_neighbors import NeighborEngine
+from snapshot_store import ANALYSIS_COLUMNS, read_snapshot, source_signature
+
+class LRUCache:
+    """Thread-safe LRU cache of rendered responses"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+def to_json_value(value):
+    """Convert numpy/pandas scalars to JSON-safe values (NaN -> None)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def count_param(query: Dict[str, str], name: str, default: int) -> int:
+    """Non-negative integer query parameter; ValueError (-> 400) otherwise"""
+    value = int(query.get(name, default))
+    if value < 0:
+        raise ValueError(f"{name} must be >= 0, got {value}")
+    return value
+
+class SnapshotState:
+    """Everything loaded from one generation of snapshots; replaced as a whole on reload"""
+
+    def __init__(self, generation: int, zonasi_file: str, prestasi_file: str):
+        self.generation = generation
+        self.signatures = {}
+        self.zonasi = None
+        self.prestasi = {}
+
+        try:
+            self.signatures['zonasi'] = source_signature(zonasi_file)
+            self.zonasi = NeighborEngine.from_file(zonasi_file)
+        except FileNotFoundError:
+            pass
+
+        try:
+            self.signatures['prestasi'] = source_signature(prestasi_file)
+            self.prestasi = self.load_prestasi(prestasi_file)
+        except FileNotFoundError:
+            pass
+
+    def load_prestasi(self, prestasi_file: str) -> Dict[str, pd.DataFrame]:
+        """Group prestasi-rapor rows by jurusan, each sorted by score descending"""
+        df = read_snapshot(prestasi_file, columns=ANALYSIS_COLUMNS)
+        df = df.dropna(subset=['first_option_name', 'score'])
+        df = df.sort_values('score', ascending=False, kind='stable')
+        return {str(jurusan): group for jurusan, group in df.groupby('first_option_name', observed=True, sort=False)}
+
+class LookupService:
+    def __init__(self, zonasi_file: str = "hasil_zonasi_only.csv",
+                 prestasi_file: str = "hasil_all_prestasi_rapor.csv",
+                 cache_size: int = 10000, reload_interval: float = 2.0):
+        self.zonasi_file = zonasi_file
+        self.prestasi_file = prestasi_file
+        self.reload_interval = reload_interval
+        self.cache = LRUCache(cache_size)
+        self.reload_lock = threading.Lock()
+        self.state = SnapshotState(1, zonasi_file, prestasi_file)
+        self.stop_event = threading.Event()
+
+    def current_signatures(self) -> Dict[str, str]:
+        signatures = {}
+        for name, path in (('zonasi', self.zonasi_file), ('prestasi', self.prestasi_file)):
+            try:
+                signatures[name] = source_signature(path)
+            except FileNotFoundError:
+                pass
+        return signatures
+
+    def reload_if_changed(self) -> bool:
+        """Load changed snapshots off to the side, then swap them in with one assignment"""
+        with self.reload_lock:
+            if self.current_signatures() == self.state.signatures:
+                return False
+            new_state = SnapshotState(self.state.generation + 1, self.zonasi_file, self.prestasi_file)
+            self.state = new_state
+            self.cache.clear()
+            print(f"🔄 Snapshot generation {new_state.generation} loaded")
+            return True
+
+    def watch(self):
+        while not self.stop_event.wait(self.reload_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                # Keep serving the previous generation if a half-written file fails to load
+                print(f"⚠️ Reload failed, keeping generation {self.state.generation}: {e}")
+
+    def start_watcher(self) -> threading.Thread:
+        thread = threading.Thread(target=self.watch, name="snapshot-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def handle(self, path: str, query: Dict[str, str]) -> Tuple[int, bytes]:
+        """Route a request and return (status, JSON body), serving repeats from the LRU cache"""
+        state = self.state
+        key = (state.generation, path, tuple(sorted(query.items())))
+        cacheable = path.strip('/') != 'health'
+        cached = self.cache.get(key) if cacheable else None
+        if cached is not None:
+            return cached
+
+        try:
+            status, payload = self.route(state, path, query)
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+
+        response = (status, json.dumps(payload, ensure_ascii=False).encode('utf-8'))
+        if cacheable and status in (200, 404):
+            self.cache.put(key, response)
+        return response
+
+    def route(self, state: SnapshotState, path: str, query: Dict[str, str]) -> Tuple[int, Dict]:
+        parts = [unquote(part) for part in path.strip('/').split('/') if part]
+
+        if len(parts) == 2 and parts[0] == 'position':
+            return self.render_position(state, parts[1], count_param(query, 'quota', 139))
+        if len(parts) == 2 and parts[0] == 'neighbors':
+            return self.render_neighbors(state, parts[1], count_param(query, 'k', 5), count_param(query, 'quota', 139))
+        if parts == ['top']:
+            return self.render_top(state, query.get('jurusan'), count_param(query, 'n', 50))
+        if parts == ['health']:
+            return 200, {'generation': state.generation, 'signatures': state.signatures,
+                         'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses}
+        return 404, {'error': f"Unknown endpoint: {path}"}
+
+    def render_position(self, state: SnapshotState, registration_number: str, quota: int) -> Tuple[int, Dict]:
+        if state.zonasi is None:
+            return 503, {'error': f"{self.zonasi_file} not loaded"}
+
+        i = state.zonasi.rows.get(registration_number)
+        if i is None:
+            return 404, {'error': f"Registration {registration_number} not found", 'found': False}
+
+        position = i + 1
+        probability, status, _ = calculate_acceptance_probability(position, quota)
+        return 200, {
+            'found': True,
+            'registration_number': registration_number,
+            'position': position,
+            'total_zonasi': state.zonasi.total,
+            'quota': quota,
+            'in_quota': position <= quota,
+            'probability': probability,
+            'status': status,
+            'name': state.zonasi.columns['name'][i],
+            'distance_1': to_json_value(state.zonasi.distances[i])
+        }
+
+    def render_neighbors(self, state: SnapshotState, registration_number: str, k: int, quota: int) -> Tuple[int, Dict]:
+        if state.zonasi is None:
+            return 503, {'error': f"{self.zonasi_file} not loaded"}
+
+        result = state.zonasi.query(registration_number, k, quota)
+        if result is None:
+            return 404, {'error': f"Registration {registration_number} not found", 'found': False}
+
+        window = result.pop('window')
+        rows = []
+        for j, distance in enumerate(result['distances']):
+            row = {col: to_json_value(values[j]) for col, values in window.items()}
+            row['position'] = result['start_position'] + j
+            row['distance_1'] = to_json_value(distance)
+            row['gap_to_next'] = to_json_value(result['gaps'][j]) if j < len(result['gaps']) else None
+            rows.append(row)
+
+        payload = {key: to_json_value(value) for key, value in result.items() if key not in ('distances', 'gaps')}
+        payload['found'] = True
+        payload['window'] = rows
+        return 200, payload
+
+    def render_top(self, state: SnapshotState, jurusan: Optional[str], n: int) -> Tuple[int, Dict]:
+        if not state.prestasi:
+            return 503, {'error': f"{self.prestasi_file} not loaded"}
+
+        if not jurusan:
+            return 200, {'jurusan': [{'name': clean_jurusan_name(name), 'first_option_name': name,
+                                      'total_siswa': len(group)} for name, group in state.prestasi.items()]}
+
+        wanted = jurusan.strip().upper()
+        matches = [name for name in state.prestasi
+                   if name.upper() == wanted or clean_jurusan_name(name).upper() == wanted]
+        if not matches:
+            return 404, {'error': f"Jurusan {jurusan} not found"}
+
+        group = state.prestasi[matches[0]]
+        top = group.head(n)
+        rows = []
+        for ranking, record in enumerate(top.to_dict('records'), 1):
+            row = {col: to_json_value(value) for col, value in record.items()}
+            row['Ranking'] = ranking
+            rows.append(row)
+
+        return 200, {'jurusan': clean_jurusan_name(matches[0]), 'first_option_name': matches[0],
+                     'total_siswa': len(group), 'n': len(rows), 'data': rows}
+
+class LookupRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in one buffered write with Nagle off; otherwise each
+    # keep-alive response waits on a delayed ACK (~40 ms)
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    service = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        status, body = self.service.handle(url.path, dict(parse_qsl(url.query)))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate the cost at thousands of requests/second
+        pass
+
+def create_server(service: LookupService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    handler = type('BoundLookupRequestHandler', (LookupRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Local JSON lookup service for admission positions")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--zonasi-file', default="hasil_zonasi_only.csv")
+    parser.add_argument('--prestasi-file', default="hasil_all_prestasi_rapor.csv")
+    parser.add_argument('--cache-size', type=int, default=10000, help="Rendered responses kept in the LRU cache")
+    parser.add_argument('--reload-interval', type=float, default=2.0, help="Seconds between snapshot change checks")
+    args = parser.parse_args()
+
+    service = LookupService(args.zonasi_file, args.prestasi_file, args.cache_size, args.reload_interval)
+    service.start_watcher()
+    server = create_server(service, args.host, args.port)
+
+    print("="*80)
+    print("🌐 LOOKUP SERVICE")
+    print("="*80)
+    print(f"Listening on http://{args.host}:{server.server_address[1]}")
+    print(f"Zonasi: {args.zonasi_file} ({service.state.zonasi.total if service.state.zonasi else 'not loaded'})")
+    print(f"Prestasi: {args.prestasi_file} ({len(service.state.prestasi)} jurusan)")
+    print("Endpoints: /position/<reg>?quota=  /neighbors/<reg>?k=&quota=  /top?jurusan=&n=  /health")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        service.stop_event.set()
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the SPMB Jabar public API, backed by synthetic data.
+
+Serves /api/public/registration, /api/public/registration/<number> and
+/api/public/school/<npsn>?populate=options with configurable latency, jitter,
+error and 403 rates, so scrapers can be tested and benchmarked offline:
+
+    python mock_spmb_server.py --port 8765 --records 5000 --latency 0.05
+    SPMB_API_BASE=http://127.0.0.1:8765/api/public python scrape_smkn4_multiple_jurusan.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+# Digit used in registration numbers (<npsn>-16-<digit>-<seq>) per option type
+OPTION_TYPES = {'zonasi': 1, 'prestasi-rapor': 2, 'ketm': 3, 'perpindahan-tugas-ortu': 4}
+
+DEFAULT_SCHOOLS = [
+    {'npsn': '20227910', 'name': 'SMAN 2 PADALARANG', 'address': 'Jl. Raya Padalarang', 'majors': []},
+    {'npsn': '20206224', 'name': 'SMKN 4 PADALARANG', 'address': 'Jl. Raya Padalarang No. 451',
+     'majors': ['TEKNIK KOMPUTER DAN JARINGAN', 'AKUNTANSI DAN KEUANGAN LEMBAGA',
+                'MANAJEMEN PERKANTORAN', 'TEKNIK KENDARAAN RINGAN', 'DESAIN KOMUNIKASI VISUAL']},
+]
+
+FIRST_NAMES = ['ADITYA', 'AISYAH', 'BAYU', 'DEWI', 'FAJAR', 'GILANG', 'INTAN', 'NADIA', 'RIZKY', 'SITI']
+LAST_NAMES = ['PRATAMA', 'LESTARI', 'NUGRAHA', 'RAHAYU', 'SAPUTRA', 'HIDAYAT', 'PERMANA', 'KURNIA']
+
+class SyntheticDataset:
+    """Deterministic registrations and school options for a set of schools.
+
+    Each school gets registrations_per_school records spread over its options;
+    records are generated on first access and sorted views are cached.
+    """
+
+    def __init__(self, registrations_per_school: int = 2000, schools: Optional[List[Dict]] = None,
+                 extra_schools: int = 0, seed: int = 0):
+        self.registrations_per_school = registrations_per_school
+        self.seed = seed
+        self.schools = {school['npsn']: school for school in (schools or DEFAULT_SCHOOLS)}
+        for i in range(extra_schools):
+            npsn = str(20300000 + i)
+            self.schools[npsn] = {'npsn': npsn, 'name': f"SMAN {i + 1} JABAR", 'address': 'Jawa Barat',
+                                  'majors': []}
+        self.lock = threading.Lock()
+        self.records = {}
+        self.sequences = {}
+        self.by_number = {}
+        self.views = {}
+
+    def options(self, npsn: str) -> List[Dict]:
+        """Options offered by a school: zonasi/ketm for SMA, one prestasi option per SMK major"""
+        school = self.schools[npsn]
+        if not school['majors']:
+            return [
+                {'id': int(npsn) * 10 + i, 'type': option_type, 'quota': 139 if option_type == 'zonasi' else 40,
+                 'name': f"{school['name']} - {option_type.upper()}"}
+                for i, option_type in enumerate(['zonasi', 'ketm'])
+            ]
+        return [
+            {'id': int(npsn) * 10 + i, 'type': 'prestasi-rapor', 'quota': 36,
+             'name': f"{school['name']} - {major} - PRESTASI NILAI RAPOR"}
+            for i, major in enumerate(school['majors'])
+        ]
+
+    def school(self, npsn: str, populate_options: bool = False) -> Optional[Dict]:
+        school = self.schools.get(npsn)
+        if school is None:
+            return None
+        info = {'npsn': npsn, 'name': school['name'], 'address': school['address']}
+        if populate_options:
+            info['options'] = self.options(npsn)
+        return info
+
+    def _make_record(self, rng: random.Random, npsn: str, options: List[Dict], index: int) -> Dict:
+        option = options[rng.randrange(len(options))]
+        option_type = option['type']
+        counters = self.sequences.setdefault(npsn, {})
+        sequence = counters.get(option_type, 0)
+        counters[option_type] = sequence + 1
+        started = datetime(2025, 6, 10, 8, 0, 0)
+        return {
+            'registration_number': f"{npsn}-16-{OPTION_TYPES[option_type]}-{sequence:05d}",
+            'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}",
+            'school_name': f"SMP NEGERI {rng.randint(1, 9)} PADALARANG",
+            'option_type': option_type,
+            'first_option_id': option['id'],
+            'first_option_name': option['name'],
+            'distance_1': round(rng.uniform(50, 8000), 1) if option_type != 'prestasi-rapor' else None,
+            'score': round(rng.uniform(300, 400), 2) if option_type == 'prestasi-rapor' else None,
+            'created_at': (started + timedelta(seconds=rng.randint(0, 5 * 86400))).strftime('%Y-%m-%d %H:%M:%S'),
+            'address_city': 'KAB. BANDUNG BARAT',
+        }
+
+    def _generate(self, npsn: str) -> List[Dict]:
+        rng = random.Random(f"{self.seed}-{npsn}")
+        options = self.options(npsn)
+        return [self._make_record(rng, npsn, options, i) for i in range(self.registrations_per_school)]
+
+    def records_for(self, npsn: str) -> List[Dict]:
+        with self.lock:
+            if npsn not in self.records:
+                records = self._generate(npsn) if npsn in self.schools else []
+                self.records[npsn] = records
+                self.by_number.update((record['registration_number'], record) for record in records)
+            return self.records[npsn]
+
+    def add_registrations(self, npsn: str, count: int, seed: int = 0) -> List[Dict]:
+        """Register count more students at a school, as happens during the registration window"""
+        records = self.records_for(npsn)
+        rng = random.Random(f"{self.seed}-{npsn}-add-{seed}-{len(records)}")
+        options = self.options(npsn)
+        with self.lock:
+            added = [self._make_record(rng, npsn, options, len(records) + i) for i in range(count)]
+            self.records[npsn] = records + added
+            self.by_number.update((record['registration_number'], record) for record in added)
+            self.views = {key: view for key, view in self.views.items() if key[0] != npsn}
+        return added
+
+    def withdraw(self, registration_numbers: List[str]):
+        """Remove registrations (withdrawn or moved to another school)"""
+        numbers = set(registration_numbers)
+        for npsn in {number.split('-')[0] for number in numbers}:
+            records = self.records_for(npsn)
+            with self.lock:
+                self.records[npsn] = [record for record in records if record['registration_number'] not in numbers]
+                self.views = {key: view for key, view in self.views.items() if key[0] != npsn}
+        with self.lock:
+            for number in numbers:
+                self.by_number.pop(number, None)
+
+    def registration(self, registration_number: str) -> Optional[Dict]:
+        self.records_for(registration_number.split('-')[0])
+        return self.by_number.get(registration_number)
+
+    def query(self, npsn: str, option_type: Optional[str] = None, major_id: Optional[str] = None,
+              orderby: Optional[str] = None, order: str = 'asc') -> List[Dict]:
+        """Filtered records sorted by orderby (missing values last), as the list endpoint returns them"""
+        key = (npsn, option_type, major_id, orderby, order)
+        with self.lock:
+            if key in self.views:
+                return self.views[key]
+
+        rows = [
+            record for record in self.records_for(npsn)
+            if (not option_type or record['option_type'] == option_type)
+            and (not major_id or str(record['first_option_id']) == str(major_id))
+        ]
+        if orderby:
+            present = [record for record in rows if record.get(orderby) is not None]
+            missing = [record for record in rows if record.get(orderby) is None]
+            present.sort(key=lambda record: record[orderby], reverse=(order == 'desc'))
+            rows = present + missing
+
+        with self.lock:
+            self.views[key] = rows
+        return rows
+
+class MockSPMBServer:
+    """Threaded HTTP server serving a SyntheticDataset like the public SPMB API.
+
+    Every response waits latency +/- jitter seconds. error_rate and forbidden_rate
+    are the chances of answering 500 or 403 instead; the decision is a hash of the
+    seed, the request and how many times it was seen, so a run is reproducible no
+    matter how concurrent requests interleave, and retries can succeed.
+    """
+
+    def __init__(self, dataset: Optional[SyntheticDataset] = None, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 forbidden_rate: float = 0.0, seed: int = 0):
+        self.dataset = dataset or SyntheticDataset(seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.forbidden_rate = forbidden_rate
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.seen = {}
+        self.counters = {'requests': 0, 'errors': 0, 'forbidden': 0}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/public"
+
+    @property
+    def registration_url(self) -> str:
+        return f"{self.base_url}/registration"
+
+    def start(self) -> 'MockSPMBServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'MockSPMBServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return dict(self.counters)
+
+    def _draw(self, request_key: str) -> Tuple[float, float]:
+        """Two uniform numbers in [0, 1) for this request: (fault, jitter)"""
+        with self.lock:
+            attempt = self.seen.get(request_key, 0)
+            self.seen[request_key] = attempt + 1
+        digest = hashlib.sha256(f"{self.seed}|{request_key}|{attempt}".encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big') / 2 ** 64, int.from_bytes(digest[8:16], 'big') / 2 ** 64
+
+    def respond(self, path: str, query: str) -> Tuple[int, Dict]:
+        """Status code and JSON body for a GET, including injected delay and faults"""
+        params = dict(parse_qsl(query))
+        fault, jitter = self._draw(f"{path}?{'&'.join(sorted(f'{k}={v}' for k, v in params.items()))}")
+        delay = self.latency + (2 * jitter - 1) * self.jitter
+        if delay > 0:
+            time.sleep(delay)
+
+        with self.lock:
+            self.counters['requests'] += 1
+            if fault < self.forbidden_rate:
+                self.counters['forbidden'] += 1
+                return 403, {'code': 403, 'status': 'Forbidden', 'message': 'Forbidden'}
+            if fault < self.forbidden_rate + self.error_rate:
+                self.counters['errors'] += 1
+                return 500, {'code': 500, 'status': 'Error', 'message': 'Internal Server Error'}
+
+        parts = [part for part in path.split('/') if part]
+        if parts[:2] != ['api', 'public'] or len(parts) not in (3, 4):
+            return 404, {'code': 404, 'status': 'Not Found', 'message': f"Unknown endpoint {path}"}
+        endpoint = parts[2]
+
+        if endpoint == 'registration' and len(parts) == 3:
+            return 200, self._registration_list(params)
+        if endpoint == 'registration':
+            record = self.dataset.registration(parts[3])
+            if record is None:
+                return 200, {'code': 404, 'status': 'Data tidak ditemukan', 'message': 'Data tidak ditemukan'}
+            return 200, {'code': 200, 'status': 'Data ditemukan', 'message': 'OK', 'result': record}
+        if endpoint == 'school' and len(parts) == 4:
+            school = self.dataset.school(parts[3], populate_options=params.get('populate') == 'options')
+            if school is None:
+                return 404, {'code': 404, 'status': 'Data tidak ditemukan', 'message': 'Sekolah tidak ditemukan'}
+            return 200, {'code': 200, 'status': 'Data ditemukan', 'message': 'OK', 'result': school}
+        return 404, {'code': 404, 'status': 'Not Found', 'message': f"Unknown endpoint {path}"}
+
+    def _registration_list(self, params: Dict[str, str]) -> Dict:
+        filters = {}
+        for name, value in params.items():
+            if name.startswith('filters[') and name.endswith('][key]'):
+                filters[value] = params.get(name[:-len('[key]')] + '[value]')
+
+        rows = self.dataset.query(params.get('npsn', ''), option_type=filters.get('option_type'),
+                                  major_id=params.get('major_id'), orderby=params.get('orderby'),
+                                  order=params.get('order', 'asc'))
+        page = max(1, int(params.get('page', 1)))
+        limit = max(1, int(params.get('limit', 10)))
+        return {
+            'code': 200,
+            'status': 'Data ditemukan',
+            'message': 'OK',
+            'result': {
+                'itemsList': rows[(page - 1) * limit:page * limit],
+                'pagination': {
+                    'current_page': page,
+                    'total_pages': -(-len(rows) // limit),
+                    'total_records': len(rows),
+                }
+            }
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                status, body = server.respond(url.path.rstrip('/'), url.query)
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline mock of the SPMB Jabar public API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--records', type=int, default=2000, help="Registrations per school")
+    parser.add_argument('--extra-schools', type=int, default=0, help="Additional synthetic SMA schools")
+    parser.add_argument('--latency', type=float, default=0.0, help="Base response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Uniform +/- delay in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 500 responses")
+    parser.add_argument('--forbidden-rate', type=float, default=0.0, help="Fraction of 403 responses")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(args.records, extra_schools=args.extra_schools, seed=args.seed)
+    server = MockSPMBServer(dataset, args.host, args.port, latency=args.latency, jitter=args.jitter,
+                            error_rate=args.error_rate, forbidden_rate=args.forbidden_rate, seed=args.seed)
+    print(f"🧪 Mock SPMB API on {server.base_url} ({len(dataset.schools)} schools, "
+          f"{args.records} registrations each)")
+    print(f"   export SPMB_API_BASE={server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Polling daemon: rescrape configured schools on a schedule and keep their history.
+
+Each poll refreshes a working copy with delta scraping (the file is only rewritten
+when a page changed) and, when the list changed, stores it as a new immutable snapshot in
+SnapshotHistory and moves the series' latest pointer. Polls get more frequent as
+a school's deadline approaches. Config (JSON):
+
+    {
+      "interval": 3600, "min_interval": 300, "tighten": 0.1,
+      "schools": [
+        {"npsn": "20227910", "option_types": ["zonasi"], "deadline": "2025-06-14T15:00:00+07:00",
+         "outputs": {"zonasi": "hasil_zonasi_only.csv"}},
+        {"npsn": "20206224", "option_types": ["prestasi-rapor"], "major_id": "202062242",
+         "interval": 1800, "watchlist": "watchlist_20206224.txt"}
+      ],
+      "outbox": "watchlist_alerts.jsonl"
+    }
+
+"outputs" optionally keeps a plain result file per option type up to date for the
+existing tools; interval, min_interval and tighten can be set per school. A school's
+"watchlist" (see watchlist.py) is checked after every poll of its lists and
+alerts go to "outbox". Prestasi quotas are per jurusan, so a prestasi-rapor
+watchlist needs the school's "major_id"; without it the watchlist is ignored.
+"""
+
+import argparse
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from crawl_orchestrator import OPTION_ORDERING
+from delta_scrape import scrape_delta
+from snapshot_history import SnapshotHistory, format_timestamp, parse_timestamp, series_name
+from snapshot_store import SNAPSHOT_COLUMNS, read_snapshot
+from spmb_client import REGISTRATION_URL, SPMBClient
+from watchlist import WatchlistMonitor, format_alert, watchable
+
+DEFAULTS = {'interval': 3600.0, 'min_interval': 300.0, 'tighten': 0.1, 'limit_per_page': 100}
+
+def parse_deadline(value: Optional[str]) -> Optional[datetime]:
+    """ISO date/time; without a UTC offset it is taken as local time"""
+    if not value:
+        return None
+    deadline = datetime.fromisoformat(value)
+    return deadline.astimezone(timezone.utc)
+
+def poll_interval(target: Dict, now: datetime) -> float:
+    """Seconds until the next poll: tighten x the time left before the deadline,
+    kept between min_interval and interval"""
+    deadline = target['deadline']
+    if deadline is None or now >= deadline:
+        return target['interval']
+    remaining = (deadline - now).total_seconds()
+    return max(target['min_interval'], min(target['interval'], remaining * target['tighten']))
+
+def expand_targets(config: Dict) -> List[Dict]:
+    """One poll target per school x option type, with per-school settings applied"""
+    targets = []
+    for school in config.get('schools', []):
+        settings = {key: float(school.get(key, config.get(key, default))) for key, default in DEFAULTS.items()}
+        settings['limit_per_page'] = int(settings['limit_per_page'])
+        outputs = school.get('outputs', {})
+        for option_type in school.get('option_types', ['zonasi']):
+            watchlist = school.get('watchlist')
+            if watchlist and not watchable(option_type, school.get('major_id')):
+                print(f"⚠️  {school['npsn']} {option_type}: quotas are per jurusan, set major_id to use "
+                      f"watchlist {watchlist}; ignoring it")
+                watchlist = None
+            targets.append(dict(
+                settings,
+                npsn=str(school['npsn']),
+                option_type=option_type,
+                major_id=school.get('major_id'),
+                deadline=parse_deadline(school.get('deadline')),
+                series=series_name(str(school['npsn']), option_type, school.get('major_id')),
+                output=outputs.get(option_type),
+                watchlist=watchlist,
+            ))
+    return targets
+
+class PollDaemon:
+    """Poll targets whenever they are due; call stop() from another thread to end run()"""
+
+    def __init__(self, config: Dict, history: Optional[SnapshotHistory] = None,
+                 client: Optional[SPMBClient] = None):
+        self.targets = expand_targets(config)
+        self.history = history or SnapshotHistory(config.get('history', 'snapshot_history'))
+        self.client = client or SPMBClient(config.get('base_url', REGISTRATION_URL), use_cache=False,
+                                           requests_per_second=config.get('requests_per_second', 5.0))
+        self.outbox = config.get('outbox', 'watchlist_alerts.jsonl')
+        self.monitors = {}
+        self.retry_at = {}
+        self.stop_event = threading.Event()
+
+    def working_path(self, target: Dict) -> str:
+        return target['output'] or os.path.join(self.history.series_dir(target['series']), 'working.csv')
+
+    def next_due(self, target: Dict) -> datetime:
+        """Last check plus the interval at that time, capped at the deadline so the
+        closing list is always captured; right away for a new series"""
+        if target['series'] in self.retry_at:
+            return self.retry_at[target['series']]
+        pointer = self.history.latest(target['series'])
+        if pointer is None:
+            return datetime.now(timezone.utc)
+        checked_at = parse_timestamp(pointer['checked_at'])
+        due = checked_at + timedelta(seconds=poll_interval(target, checked_at))
+        if target['deadline'] is not None and checked_at < target['deadline']:
+            due = min(due, target['deadline'])
+        return due
+
+    def poll(self, target: Dict, now: Optional[datetime] = None) -> Optional[Dict]:
+        """Refresh one target and record a snapshot if it changed; None if the scrape failed"""
+        now = now or datetime.now(timezone.utc)
+        orderby, order = OPTION_ORDERING.get(target['option_type'], ('distance_1', 'asc'))
+        path = self.working_path(target)
+        status = StatusLog()
+        summary = scrape_delta(self.client, path, status, status, target['limit_per_page'], target['npsn'],
+                               target['option_type'], orderby, order, target['major_id'])
+        if summary is None:
+            # Try again soon instead of waiting a whole interval
+            self.retry_at[target['series']] = now + timedelta(seconds=target['min_interval'])
+            print(f"❌ {target['series']}: poll failed, retrying in {target['min_interval']:.0f}s")
+            return None
+
+        self.retry_at.pop(target['series'], None)
+        pointer = self.history.latest(target['series'])
+        if summary['mode'] == 'unchanged' and pointer is not None:
+            self.history.touch(target['series'], now)
+            snapshot = None
+        else:
+            df = read_snapshot(path, SNAPSHOT_COLUMNS)
+            snapshot = self.history.record(target['series'], df, taken_at=now, meta={
+                'npsn': target['npsn'], 'option_type': target['option_type'], 'major_id': target['major_id'],
+            })
+
+        summary = dict(summary, series=target['series'], snapshot=snapshot)
+        print(f"{'📸' if snapshot else '✓'} {target['series']}: {summary['records']} records, "
+              f"{summary['pages_fetched']}/{summary['total_pages']} pages fetched, "
+              f"{'new snapshot ' + os.path.basename(snapshot) if snapshot else 'no change'}")
+        summary['alerts'] = self.check_watchlist(target, path)
+        return summary
+
+    def check_watchlist(self, target: Dict, path: str) -> List[Dict]:
+        """Alerts raised by the target's watchlist; a list that did not change costs no lookups"""
+        if not target['watchlist']:
+            return []
+        if target['watchlist'] not in self.monitors:
+            self.monitors[target['watchlist']] = WatchlistMonitor(target['watchlist'], self.outbox)
+        pointer = self.history.latest(target['series'])
+        checked = self.monitors[target['watchlist']].check(path, source=target['series'],
+                                                           snapshot=pointer['snapshot'] if pointer else None)
+        if checked is None:
+            return []
+        for alert in checked['alerts']:
+            print(f"   {format_alert(alert)}")
+        return checked['alerts']
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self, max_polls: Optional[int] = None) -> int:
+        """Poll due targets until stopped (or max_polls polls were made); returns the poll count"""
+        polls = 0
+        while not self.stop_event.is_set() and self.targets and (max_polls is None or polls < max_polls):
+            due, target = min(((self.next_due(target), target) for target in self.targets),
+                              key=lambda item: item[0])
+            wait = (due - datetime.now(timezone.utc)).total_seconds()
+            if wait > 0:
+                # Wake up at least once a minute so edited schedules and clock jumps are noticed
+                if self.stop_event.wait(min(wait, 60.0)):
+                    break
+                continue
+            self.poll(target)
+            polls += 1
+        return polls
+
+class StatusLog:
+    """progress_bar/status_text that discards progress and keeps the last message"""
+
+    def __init__(self):
+        self.message = ""
+
+    def progress(self, value: float):
+        pass
+
+    def text(self, message: str):
+        self.message = message
+
+def show_history(history: SnapshotHistory):
+    for series in history.list_series():
+        pointer = history.latest(series)
+        snapshots = history.snapshots(series)
+        print(f"{series:<40} {len(snapshots):>4} snapshots, latest {pointer['taken_at']} "
+              f"({pointer['records']} records), checked {pointer['checked_at']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll schools on a schedule and keep a snapshot history")
+    parser.add_argument('--config', default='polling.json', help="Schedule config (JSON)")
+    parser.add_argument('--history', help="History directory (default: config 'history' or snapshot_history)")
+    parser.add_argument('--once', action='store_true', help="Poll every target once and exit")
+    parser.add_argument('--show', action='store_true', help="List the stored history and exit")
+    args = parser.parse_args()
+
+    if args.show:
+        show_history(SnapshotHistory(args.history or 'snapshot_history'))
+        return
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if args.history:
+        config['history'] = args.history
+    daemon = PollDaemon(config)
+
+    if args.once:
+        for target in daemon.targets:
+            daemon.poll(target)
+        return
+
+    print(f"⏱️  Polling {len(daemon.targets)} targets into {daemon.history.root} (Ctrl+C to stop)")
+    for target in daemon.targets:
+        due = daemon.next_due(target)
+        print(f"   {target['series']}: next poll {format_timestamp(due)}")
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+if __name__ == "__main__":
+    main()
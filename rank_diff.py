@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Rank diff between two ranked snapshots of the same list, keyed on registration_number.
+
+Row order is the ranking. The join is one hash lookup of every old key in the new
+key set (Arrow's index_in, or a pandas hash index without pyarrow); everything
+after that is numpy array arithmetic, so two 1M-row snapshots diff in well under
+a second.
+
+    python rank_diff.py hasil_kemarin.csv hasil_zonasi_only.csv --quota 139 --feed perubahan.jsonl
+    python rank_diff.py --series 20227910_zonasi --since 2025-06-10T08:00 --registration 20227910-16-1-00369
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FEED_COLUMNS = ['event', 'registration_number', 'rank_before', 'rank_after', 'delta', 'count']
+
+def _key_positions(before: 'pd.Series', after: 'pd.Series'):
+    """For every key in before, its row in after (-1 if absent); duplicate keys match their first row"""
+    import numpy as np
+    import pandas as pd
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        keys, value_set = pa.array(before.array), pa.array(after.array)
+        if pa.types.is_dictionary(keys.type):
+            keys = keys.dictionary_decode()
+        if pa.types.is_dictionary(value_set.type):
+            value_set = value_set.dictionary_decode()
+        return pc.index_in(keys, value_set=value_set).fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int64)
+
+    firsts = after.drop_duplicates(keep='first')
+    positions = pd.Index(firsts).get_indexer(before)
+    return np.where(positions >= 0, firsts.index.to_numpy()[positions], -1)
+
+def diff_rankings(before: 'pd.DataFrame', after: 'pd.DataFrame', quota: Optional[int] = None,
+                  key: str = 'registration_number') -> Dict:
+    """Compare two rankings and return their differences as frames plus a summary.
+
+    Ranks are 1-based row positions; delta = rank_before - rank_after, so a positive
+    delta means the student moved up. Returned keys: moved (rank changed), new,
+    withdrawn, crossed_in / crossed_out (students in both snapshots who passed the
+    quota boundary), summary (counts), and the key column and row positions that
+    student_change uses.
+    """
+    import numpy as np
+    import pandas as pd
+
+    old_keys = before[key].reset_index(drop=True)
+    new_keys = after[key].reset_index(drop=True)
+    positions = _key_positions(old_keys, new_keys)
+
+    present = positions >= 0
+    old_rows = np.flatnonzero(present)
+    rank_before = old_rows + 1
+    rank_after = positions[present] + 1
+    delta = rank_before - rank_after
+
+    matched = np.zeros(len(new_keys), dtype=bool)
+    matched[positions[present]] = True
+    new_rows = np.flatnonzero(~matched)
+    withdrawn_rows = np.flatnonzero(~present)
+
+    moved_mask = delta != 0
+    moved = pd.DataFrame({
+        key: old_keys.array.take(old_rows[moved_mask]),
+        'rank_before': rank_before[moved_mask],
+        'rank_after': rank_after[moved_mask],
+        'delta': delta[moved_mask],
+    }).sort_values('rank_after', ignore_index=True)
+    new = pd.DataFrame({key: new_keys.array.take(new_rows), 'rank_after': new_rows + 1})
+    withdrawn = pd.DataFrame({key: old_keys.array.take(withdrawn_rows), 'rank_before': withdrawn_rows + 1})
+
+    result = {'moved': moved, 'new': new, 'withdrawn': withdrawn, 'quota': quota,
+              'keys_before': old_keys, 'keys_after': new_keys, 'positions': positions}
+    if quota is not None:
+        result['crossed_in'] = moved[(moved['rank_before'] > quota) & (moved['rank_after'] <= quota)] \
+            .reset_index(drop=True)
+        result['crossed_out'] = moved[(moved['rank_before'] <= quota) & (moved['rank_after'] > quota)] \
+            .reset_index(drop=True)
+
+    result['summary'] = {
+        'total_before': len(old_keys),
+        'total_after': len(new_keys),
+        'unchanged': int(len(rank_before) - moved_mask.sum()),
+        'moved_up': int((delta > 0).sum()),
+        'moved_down': int((delta < 0).sum()),
+        'new': len(new),
+        'withdrawn': len(withdrawn),
+        'crossed_in': len(result['crossed_in']) if quota is not None else 0,
+        'crossed_out': len(result['crossed_out']) if quota is not None else 0,
+        'new_in_quota': int((new['rank_after'] <= quota).sum()) if quota is not None else 0,
+        'withdrawn_in_quota': int((withdrawn['rank_before'] <= quota).sum()) if quota is not None else 0,
+    }
+    return result
+
+def change_feed(diff: Dict, key: str = 'registration_number') -> 'pd.DataFrame':
+    """Compact event list for a diff.
+
+    One row per new entry, withdrawal and quota crossing, plus one 'shift' row per
+    run of consecutive ranks that moved by the same delta (rank_before/rank_after
+    are the run's first student, count its length; registration_number is only set
+    for runs of one). A single insertion near the top is one 'new' and one 'shift'
+    row instead of a row for every student below it.
+    """
+    import numpy as np
+    import pandas as pd
+
+    moved = diff['moved']
+    ranks = moved['rank_after'].to_numpy()
+    deltas = moved['delta'].to_numpy()
+    starts = np.ones(len(moved), dtype=bool)
+    starts[1:] = (np.diff(ranks) != 1) | (np.diff(deltas) != 0)
+    start_rows = np.flatnonzero(starts)
+    counts = np.diff(np.append(start_rows, len(moved)))
+
+    shifts = pd.DataFrame({
+        'event': 'shift',
+        key: np.where(counts == 1, moved[key].to_numpy()[start_rows], None),
+        'rank_before': moved['rank_before'].to_numpy()[start_rows],
+        'rank_after': ranks[start_rows],
+        'delta': deltas[start_rows],
+        'count': counts,
+    })
+    parts = [diff['new'].assign(event='new', count=1), diff['withdrawn'].assign(event='withdrawn', count=1), shifts]
+    for event in ('crossed_in', 'crossed_out'):
+        if event in diff:
+            parts.append(diff[event].assign(event=event, count=1))
+
+    parts = [part for part in parts if len(part)]
+    feed = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=FEED_COLUMNS)
+    feed = feed.reindex(columns=FEED_COLUMNS)
+    for col in ('rank_before', 'rank_after', 'delta', 'count'):
+        feed[col] = feed[col].astype('Int64')
+    return feed
+
+def write_change_feed(feed: 'pd.DataFrame', path: str):
+    """Write the feed as JSON lines"""
+    feed.to_json(path, orient='records', lines=True, force_ascii=False)
+
+def student_change(diff: Dict, registration_number: str) -> Dict:
+    """One student's ranks before and after, with status moved, unchanged, new, withdrawn or not_found"""
+    import numpy as np
+
+    quota = diff['quota']
+    old_rows = np.flatnonzero((diff['keys_before'] == registration_number).to_numpy())
+    if len(old_rows):
+        position = diff['positions'][old_rows[0]]
+        rank_before = int(old_rows[0]) + 1
+        rank_after = int(position) + 1 if position >= 0 else None
+    else:
+        new_rows = np.flatnonzero((diff['keys_after'] == registration_number).to_numpy())
+        rank_before = None
+        rank_after = int(new_rows[0]) + 1 if len(new_rows) else None
+
+    if rank_before is None:
+        status = 'new' if rank_after is not None else 'not_found'
+    elif rank_after is None:
+        status = 'withdrawn'
+    else:
+        status = 'moved' if rank_after != rank_before else 'unchanged'
+
+    change = {'registration_number': registration_number, 'status': status,
+              'rank_before': rank_before, 'rank_after': rank_after,
+              'delta': rank_before - rank_after if status in ('moved', 'unchanged') else None}
+    if quota is not None:
+        change['in_quota_before'] = rank_before is not None and rank_before <= quota
+        change['in_quota_after'] = rank_after is not None and rank_after <= quota
+    return change
+
+def main():
+    from snapshot_store import read_snapshot
+
+    parser = argparse.ArgumentParser(description="Diff two ranked snapshots by registration_number")
+    parser.add_argument('before', nargs='?', help="Older result file (CSV, read from its Parquet snapshot if current)")
+    parser.add_argument('after', nargs='?', help="Newer result file")
+    parser.add_argument('--series', help="Compare snapshots of a SnapshotHistory series instead of two files")
+    parser.add_argument('--since', help="With --series: compare the snapshot current at this time (default: the "
+                                        "previous snapshot) with the latest")
+    parser.add_argument('--history', default='snapshot_history')
+    parser.add_argument('--quota', type=int, default=139)
+    parser.add_argument('--feed', help="Write the change feed as JSON lines")
+    parser.add_argument('--registration', help="Show one student's change")
+    args = parser.parse_args()
+
+    columns = ['registration_number']
+    if args.series:
+        from snapshot_history import SnapshotHistory
+
+        history = SnapshotHistory(args.history)
+        if args.since:
+            before = history.read(args.series, datetime.fromisoformat(args.since), columns)
+        else:
+            snapshots = history.snapshots(args.series)
+            before = history.read(args.series, snapshots[-2][0], columns) if len(snapshots) > 1 else None
+        after = history.read(args.series, columns=columns)
+        if before is None or after is None:
+            print(f"❌ Not enough snapshots in {args.series} to compare")
+            return
+    elif args.before and args.after:
+        before = read_snapshot(args.before, columns)
+        after = read_snapshot(args.after, columns)
+    else:
+        parser.error("give two result files or --series")
+
+    started = time.perf_counter()
+    diff = diff_rankings(before, after, args.quota)
+    feed = change_feed(diff)
+    elapsed = time.perf_counter() - started
+
+    summary = diff['summary']
+    print(f"📊 {summary['total_before']:,} -> {summary['total_after']:,} registrations ({elapsed * 1000:.0f} ms)")
+    print(f"   ⬆️  {summary['moved_up']:,} up, ⬇️  {summary['moved_down']:,} down, {summary['unchanged']:,} unchanged")
+    print(f"   🆕 {summary['new']:,} new ({summary['new_in_quota']} inside the quota), "
+          f"🚪 {summary['withdrawn']:,} withdrawn ({summary['withdrawn_in_quota']} from inside the quota)")
+    print(f"   🎯 Quota {args.quota}: {summary['crossed_in']} crossed in, {summary['crossed_out']} crossed out")
+    print(f"   📰 {len(feed):,} feed events")
+
+    if args.feed:
+        write_change_feed(feed, args.feed)
+        print(f"📁 Change feed saved to {args.feed}")
+
+    if args.registration:
+        change = student_change(diff, args.registration)
+        print(f"\n🎯 {args.registration}: {change['status']}, "
+              f"#{change['rank_before'] or '-'} -> #{change['rank_after'] or '-'}")
+
+if __name__ == "__main__":
+    main()
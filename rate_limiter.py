@@ -0,0 +1,171 @@
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows: state is shared between threads only
+    fcntl = None
+
+# Responses that mean "slow down"; None stands for a timeout
+BACKOFF_STATUSES = (403, 429, 500, 502, 503, 504)
+
+class AdaptiveRateLimiter:
+    """AIMD request pacing shared by threads and, through a locked state file, processes.
+
+    Healthy responses raise the rate additively (about `increase` requests/second per
+    second) up to max_rate. A 403/429/5xx or timeout halves it and pauses
+    everyone for an exponentially growing backoff; latency drifting above
+    latency_factor times its baseline cuts it gently. Requests are spaced by a shared
+    next-slot time, so all processes using the same state_file stay inside one budget.
+    """
+
+    def __init__(self, max_rate: Optional[float], min_rate: float = 0.2, initial_rate: Optional[float] = None,
+                 increase: float = 0.5, decrease: float = 0.5, latency_factor: float = 2.0,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0, state_file: Optional[str] = None,
+                 stale_after: float = 300.0):
+        # max_rate <= 0 or None disables limiting entirely
+        self.max_rate = max_rate if max_rate and max_rate > 0 else None
+        self.min_rate = min(min_rate, self.max_rate or min_rate)
+        self.initial_rate = min(initial_rate or (self.max_rate or 1.0) / 2, self.max_rate or float('inf'))
+        self.initial_rate = max(self.initial_rate, self.min_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state_file = state_file
+        self.stale_after = stale_after
+        self.lock = threading.Lock()
+        self.local_state = self._fresh_state()
+        self.counters = {'requests': 0, 'healthy': 0, 'backoffs': 0, 'slowdowns': 0, 'waited': 0.0}
+
+    def _fresh_state(self) -> Dict:
+        return {'rate': self.initial_rate, 'next_slot': 0.0, 'blocked_until': 0.0, 'streak': 0,
+                'latency': None, 'baseline': None, 'last_slowdown': 0.0, 'updated': time.time()}
+
+    @contextmanager
+    def _state(self):
+        """Exclusive access to the shared state; changes are written back on exit"""
+        with self.lock:
+            if self.state_file is None or fcntl is None:
+                yield self.local_state
+                return
+
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                try:
+                    state = json.loads(os.read(fd, 65536) or b'{}')
+                except ValueError:
+                    state = {}
+                if not state or time.time() - state.get('updated', 0) > self.stale_after:
+                    state = self._fresh_state()
+                yield state
+                state['updated'] = time.time()
+                data = json.dumps(state).encode('utf-8')
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def _clamp(self, rate: float) -> float:
+        return min(max(rate, self.min_rate), self.max_rate)
+
+    def acquire(self):
+        """Block until this caller's slot in the shared schedule arrives"""
+        if self.max_rate is None:
+            return
+
+        with self._state() as state:
+            now = time.time()
+            slot = max(now, state['next_slot'], state['blocked_until'])
+            state['next_slot'] = slot + 1.0 / self._clamp(state['rate'])
+            wait_time = slot - now
+            self.counters['requests'] += 1
+            self.counters['waited'] += max(wait_time, 0.0)
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    def record(self, status: Optional[int], latency: float) -> Optional[float]:
+        """Feed back one response: HTTP status (None for a timeout) and its latency.
+
+        Returns how long the next acquire() is held back (0.0 for a healthy response),
+        or None when limiting is disabled and nothing is paced.
+        """
+        if self.max_rate is None:
+            return None
+
+        with self._state() as state:
+            now = time.time()
+            rate = self._clamp(state['rate'])
+
+            if status is None or status in BACKOFF_STATUSES:
+                # Requests already in flight when the first failure arrived don't pile on
+                if now >= state['blocked_until']:
+                    backoff = min(self.max_backoff, self.base_backoff * 2 ** state['streak'])
+                    state['streak'] += 1
+                    state['blocked_until'] = now + backoff
+                    state['rate'] = self._clamp(rate * self.decrease)
+                    self.counters['backoffs'] += 1
+                return state['blocked_until'] - now
+
+            state['streak'] = 0
+            self.counters['healthy'] += 1
+            ewma = latency if state['latency'] is None else 0.8 * state['latency'] + 0.2 * latency
+            baseline = ewma if state['baseline'] is None else min(ewma, state['baseline'] + 0.01 * (ewma - state['baseline']))
+            state['latency'], state['baseline'] = ewma, baseline
+
+            if ewma > baseline * self.latency_factor and now - state['last_slowdown'] >= 1.0:
+                state['rate'] = self._clamp(rate * 0.8)
+                state['last_slowdown'] = now
+                self.counters['slowdowns'] += 1
+            else:
+                state['rate'] = self._clamp(rate + self.increase / rate)
+        return 0.0
+
+    @property
+    def rate(self) -> Optional[float]:
+        if self.max_rate is None:
+            return None
+        with self._state() as state:
+            return self._clamp(state['rate'])
+
+    def stats(self) -> Dict:
+        if self.max_rate is None:
+            return dict(self.counters, rate=None, blocked_for=0.0)
+        with self._state() as state:
+            return dict(self.counters, rate=round(self._clamp(state['rate']), 3),
+                        blocked_for=round(max(0.0, state['blocked_until'] - time.time()), 3))
+
+def rate_state_path(url: str) -> str:
+    """Per-API-host state file; SPMB_RATE_DIR overrides the temp directory"""
+    host = urlparse(url).netloc or 'local'
+    directory = os.environ.get('SPMB_RATE_DIR', tempfile.gettempdir())
+    return os.path.join(directory, f"spmb_rate_{re.sub(r'[^A-Za-z0-9]+', '_', host)}.json")
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(url: str, max_rate: Optional[float]) -> AdaptiveRateLimiter:
+    """Process-wide limiter per API host and budget, coordinated with other processes.
+
+    Set SPMB_RATE_SHARED=off to keep the state in this process only.
+    """
+    if not max_rate or max_rate <= 0:
+        return AdaptiveRateLimiter(None)
+
+    shared = os.environ.get('SPMB_RATE_SHARED', '').lower() not in ('0', 'off', 'false', 'no')
+    key = (urlparse(url).netloc, max_rate, shared)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = AdaptiveRateLimiter(max_rate, state_file=rate_state_path(url) if shared else None)
+        return _limiters[key]
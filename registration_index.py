@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+from typing import Dict, Iterator, List, Optional, Tuple
+
+class RegistrationIndex:
+    """Persistent registration_number -> (rank, byte offset) index for a ranked result CSV.
+
+    The index lives in a SQLite file next to the CSV and records the CSV's mtime and
+    size; it is rebuilt automatically when the CSV changes. Lookups read a single row
+    at its byte offset instead of parsing the whole file.
+    """
+
+    def __init__(self, csv_file: str, index_file: Optional[str] = None):
+        self.csv_file = csv_file
+        self.index_file = index_file or f"{os.path.splitext(csv_file)[0]}.index.sqlite"
+        self.conn = None
+        self.signature = None
+        self.header = []
+        self.total = 0
+
+    def _source_signature(self) -> str:
+        stat = os.stat(self.csv_file)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def ensure_current(self):
+        """Open the index, rebuilding it if the CSV changed since it was built"""
+        signature = self._source_signature()
+        if self.conn is not None and signature == self.signature:
+            return
+
+        self.close()
+        if not self._open_existing(signature):
+            self.build(signature)
+            if not self._open_existing(signature):
+                raise RuntimeError(f"Could not open index {self.index_file}")
+
+    def _open_existing(self, signature: str) -> bool:
+        if not os.path.exists(self.index_file):
+            return False
+
+        conn = sqlite3.connect(self.index_file, check_same_thread=False)
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.Error:
+            conn.close()
+            return False
+
+        if meta.get('signature') != signature:
+            conn.close()
+            return False
+
+        self.conn = conn
+        self.signature = signature
+        self.header = json.loads(meta['header'])
+        self.total = int(meta['total'])
+        return True
+
+    def _read_record(self, f) -> Optional[bytes]:
+        """Read one CSV record, following quoted fields that span several lines"""
+        record = f.readline()
+        if not record:
+            return None
+        while record.count(b'"') % 2:
+            more = f.readline()
+            if not more:
+                break
+            record += more
+        return record
+
+    def _parse(self, record: bytes) -> List[str]:
+        return next(csv.reader(io.StringIO(record.decode('utf-8'))), [])
+
+    def _scan(self) -> Tuple[List[str], Iterator[Tuple[str, int, int]]]:
+        f = open(self.csv_file, 'rb')
+        header = next(csv.reader(io.StringIO(f.readline().decode('utf-8-sig'))), [])
+        reg_col = header.index('registration_number')
+
+        def rows():
+            with f:
+                rank = 0
+                while True:
+                    offset = f.tell()
+                    record = self._read_record(f)
+                    if record is None:
+                        break
+                    if not record.strip():
+                        continue
+                    rank += 1
+                    yield self._parse(record)[reg_col], rank, offset
+
+        return header, rows()
+
+    def build(self, signature: Optional[str] = None):
+        """Scan the CSV once and write a fresh index, replacing the old one atomically"""
+        signature = signature or self._source_signature()
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+        header, rows = self._scan()
+        conn = sqlite3.connect(tmp_file)
+        try:
+            conn.execute("CREATE TABLE positions (registration_number TEXT PRIMARY KEY, rank INTEGER, offset INTEGER)")
+            conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+
+            total = 0
+            batch = []
+            for row in rows:
+                batch.append(row)
+                total = row[1]
+                if len(batch) >= 10000:
+                    # First occurrence wins, like a linear scan
+                    conn.executemany("INSERT OR IGNORE INTO positions VALUES (?, ?, ?)", batch)
+                    batch = []
+            conn.executemany("INSERT OR IGNORE INTO positions VALUES (?, ?, ?)", batch)
+
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ('signature', signature),
+                ('header', json.dumps(header)),
+                ('total', str(total))
+            ])
+            conn.commit()
+        finally:
+            conn.close()
+
+        os.replace(tmp_file, self.index_file)
+
+    def lookup_rank(self, registration_number: str) -> Optional[Tuple[int, int]]:
+        """Return (rank, byte offset) for a registration number, or None"""
+        self.ensure_current()
+        return self.conn.execute(
+            "SELECT rank, offset FROM positions WHERE registration_number = ?",
+            (registration_number,)
+        ).fetchone()
+
+    def lookup_ranks(self, registration_numbers: List[str]) -> Dict[str, int]:
+        """Return registration_number -> rank for the numbers present in the CSV"""
+        self.ensure_current()
+        ranks = {}
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(registration_numbers), 500):
+            chunk = registration_numbers[start:start + 500]
+            ranks.update(self.conn.execute(
+                f"SELECT registration_number, rank FROM positions WHERE registration_number IN "
+                f"({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return ranks
+
+    def read_row(self, offset: int) -> Dict:
+        """Parse the CSV row starting at a byte offset into a dict"""
+        with open(self.csv_file, 'rb') as f:
+            f.seek(offset)
+            values = self._parse(self._read_record(f) or b'')
+        return dict(zip(self.header, values))
+
+    def lookup(self, registration_number: str) -> Optional[Tuple[int, Dict]]:
+        """Return (rank, row) for a registration number, or None if it is not in the CSV"""
+        entry = self.lookup_rank(registration_number)
+        if entry is None:
+            return None
+        rank, offset = entry
+        return rank, self.read_row(offset)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+        self.conn = None
+        self.signature = None
+
+_indexes = {}
+
+def get_index(csv_file: str) -> RegistrationIndex:
+    """Reuse one index object per CSV file within a process"""
+    path = os.path.abspath(csv_file)
+    if path not in _indexes:
+        _indexes[path] = RegistrationIndex(csv_file)
+    return _indexes[path]
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:  # requests is only needed by callers that pass a session
+    import requests
+
+# (path regex, seconds) checked in order against the URL path; first match wins
+DEFAULT_TTLS = [
+    (r'/registration/[^/]+$', 3600),   # single registration detail
+    (r'/registration$', 900),          # paginated registration list
+    (r'/school/', 86400),              # school info and options
+]
+
+class ResponseCache:
+    """Content-addressed on-disk cache for SPMB API JSON responses.
+
+    Entries are keyed by URL plus sorted query params, expire per endpoint TTL, and the
+    directory is kept under max_bytes by evicting the least recently used files.
+    """
+
+    def __init__(self, cache_dir: str = ".spmb_cache", max_bytes: int = 200 * 1024 * 1024,
+                 ttls: Optional[List[Tuple[str, int]]] = None, default_ttl: int = 600):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), seconds) for pattern, seconds in (ttls or DEFAULT_TTLS)]
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.total_bytes = None
+        self.counters = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    def make_key(self, url: str, params: Optional[Dict] = None) -> str:
+        """Hash the URL and sorted params into a stable cache key"""
+        items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        return hashlib.sha256(json.dumps([url, items]).encode('utf-8')).hexdigest()
+
+    def ttl_for(self, url: str) -> int:
+        path = urlparse(url).path.rstrip('/')
+        for pattern, seconds in self.ttls:
+            if pattern.search(path):
+                return seconds
+        return self.default_ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _count(self, counter: str):
+        with self.lock:
+            self.counters[counter] += 1
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Return the cached body if present and fresh, otherwise None"""
+        path = self._path(self.make_key(url, params))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._count('misses')
+            return None
+
+        if time.time() - entry.get('stored_at', 0) > self.ttl_for(url):
+            self._remove(path)
+            self._count('misses')
+            return None
+
+        # Touch the file so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count('hits')
+        return entry['body']
+
+    def put(self, url: str, params: Optional[Dict], body: Dict):
+        """Store a response body, evicting old entries if the cache grows too large"""
+        path = self._path(self.make_key(url, params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        payload = json.dumps({'url': url, 'params': params, 'stored_at': time.time(), 'body': body},
+                             ensure_ascii=False)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.counters['stores'] += 1
+            if self.total_bytes is None:
+                self.total_bytes = self._scan_size()
+            else:
+                self.total_bytes += len(payload.encode('utf-8'))
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _remove(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self.lock:
+            if self.total_bytes is not None:
+                self.total_bytes -= size
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is at 90% of max_bytes (lock held)"""
+        entries = sorted(self._entries())
+        self.total_bytes = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+            self.counters['evictions'] += 1
+
+    def clear(self):
+        for _, _, path in self._entries():
+            self._remove(path)
+        with self.lock:
+            self.total_bytes = 0
+
+    def stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 1) if lookups else 0.0
+        return stats
+
+    def fetch_json(self, session: 'requests.Session', url: str, params: Optional[Dict] = None,
+                   timeout: float = 15, throttle: Optional[Callable[[], None]] = None,
+                   feedback: Optional[Callable[[Optional[int], float], Optional[float]]] = None, retries: int = 0) -> Dict:
+        """Serve from cache or GET the URL; only successful (code 200) bodies are stored.
+
+        throttle and feedback are called only when the network is actually hit, so
+        cache hits never spend rate-limit budget.
+        """
+        body = self.get(url, params)
+        if body is not None:
+            return body
+
+        body = _get_json_retrying(session, url, params, timeout, throttle, feedback, retries)
+        if isinstance(body, dict) and body.get('code') == 200:
+            self.put(url, params, body)
+        return body
+
+# Worth retrying: the limiter has backed off (or the server recovered) by the next attempt
+RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+
+def _get_json(session: 'requests.Session', url: str, params: Optional[Dict], timeout: float,
+              throttle: Optional[Callable[[], None]],
+              feedback: Optional[Callable[[Optional[int], float], Optional[float]]] = None) -> Dict:
+    if throttle:
+        throttle()
+    import requests
+
+    started = time.monotonic()
+    try:
+        response = session.get(url, params=params, timeout=timeout)
+    except requests.exceptions.Timeout:
+        # A timeout is a sign of overload; refused or unresolvable connections are not
+        if feedback:
+            feedback(None, time.monotonic() - started)
+        raise
+    if feedback:
+        feedback(response.status_code, time.monotonic() - started)
+    response.raise_for_status()
+    return response.json()
+
+def _is_retryable(error: Exception) -> bool:
+    import requests
+
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    response = getattr(error, 'response', None)
+    return isinstance(error, requests.exceptions.HTTPError) and response is not None \
+        and response.status_code in RETRY_STATUSES
+
+def _get_json_retrying(session: 'requests.Session', url: str, params: Optional[Dict], timeout: float,
+                       throttle: Optional[Callable[[], None]],
+                       feedback: Optional[Callable[[Optional[int], float], Optional[float]]], retries: int) -> Dict:
+    # feedback returns the backoff the limiter applied; None or 0 means nothing holds the retry back
+    applied = []
+
+    def report(status: Optional[int], latency: float):
+        applied.append(feedback(status, latency))
+
+    for attempt in range(retries + 1):
+        applied.clear()
+        try:
+            return _get_json(session, url, params, timeout, throttle, report if feedback else None)
+        except Exception as e:
+            if attempt == retries or not _is_retryable(e):
+                raise
+            # Unless the limiter already pauses the next request, back off here
+            if not (applied and applied[-1]):
+                time.sleep(min(0.5 * 2 ** attempt, 8.0))
+
+def fetch_json(session: 'requests.Session', url: str, params: Optional[Dict] = None, timeout: float = 15,
+               cache: Optional[ResponseCache] = None, throttle: Optional[Callable[[], None]] = None,
+               feedback: Optional[Callable[[Optional[int], float], Optional[float]]] = None, retries: int = 0) -> Dict:
+    """GET a JSON API response, going through the cache when one is given.
+
+    feedback(status, latency) is told about every response (status None for a timeout)
+    and may return the backoff it applied; retries re-issues requests that timed out
+    or failed with a retryable status, sleeping first unless feedback reported a backoff.
+    """
+    if cache is not None:
+        return cache.fetch_json(session, url, params, timeout, throttle, feedback, retries)
+    return _get_json_retrying(session, url, params, timeout, throttle, feedback, retries)
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def default_cache() -> Optional[ResponseCache]:
+    """Process-wide cache shared by all scrapers.
+
+    Configured with SPMB_CACHE_DIR and SPMB_CACHE_MAX_MB; set SPMB_CACHE=off to disable.
+    """
+    global _default_cache
+    if os.environ.get('SPMB_CACHE', '').lower() in ('0', 'off', 'false', 'no'):
+        return None
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache(
+                cache_dir=os.environ.get('SPMB_CACHE_DIR', '.spmb_cache'),
+                max_bytes=int(float(os.environ.get('SPMB_CACHE_MAX_MB', '200')) * 1024 * 1024)
+            )
+        return _default_cache
@@ -2,45 +2,126 @@ import requests
 import csv
 import time
 import json
-from typing import Dict, Optional, List
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, List, Tuple
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import get_rate_limiter
+from response_cache import default_cache, fetch_json
+from snapshot_store import write_snapshot
+from spmb_client import REGISTRATION_URL
+
+# Returned by fetch_registration_data when the lookup failed (network error, 403/429/5xx
+# after retries, unreadable body), as opposed to None for a registration that does not exist
+PROBE_FAILED = object()
+
+class ProbeJournal:
+    """Append-only JSON-lines log of probed registration numbers, one record per line"""
+
+    def __init__(self, journal_file: str):
+        self.journal_file = journal_file
+
+    def load(self) -> Dict[str, Optional[Dict]]:
+        """Return registration_number -> result (None for misses) for everything already probed"""
+        probed = {}
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A run killed mid-write can leave a truncated last line
+                        continue
+                    probed[entry['registration_number']] = entry.get('data')
+        except FileNotFoundError:
+            pass
+        return probed
+
+    def reset(self):
+        """Start a fresh journal"""
+        open(self.journal_file, 'w', encoding='utf-8').close()
+
+    def append(self, results: List[Tuple[str, Optional[Dict]]]):
+        """Append one batch of probe results and flush it to disk"""
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            for registration_number, data in results:
+                f.write(json.dumps({'registration_number': registration_number, 'data': data},
+                                   ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def valid_records(self) -> List[Dict]:
+        """Return all records that were found, in registration-number order"""
+        probed = self.load()
+        return [probed[number] for number in sorted(probed) if probed[number]]
 
 class RegistrationScraper:
-    def __init__(self, base_url: str, output_file: str = "hasil_valid.csv"):
+    def __init__(self, base_url: str, output_file: str = "hasil_valid.csv",
+                 max_workers: int = 1, requests_per_second: float = 0,
+                 registration_prefix: str = "20227910-16-1-", journal_file: str = None,
+                 use_cache: bool = True, max_retries: int = 3):
         self.base_url = base_url
+        self.cache = default_cache() if use_cache else None
         self.output_file = output_file
+        self.journal = ProbeJournal(journal_file or f"{os.path.splitext(output_file)[0]}.journal.jsonl")
+        self.registration_prefix = registration_prefix
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = get_rate_limiter(base_url, requests_per_second)
+        self.max_retries = max_retries
+        self.stats = {}
+        self.failed = set()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
 
+        # Pool one keep-alive connection per worker for the API host
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def format_registration_number(self, number: int) -> str:
+        """Format a sequence number with the configured <npsn>-<code>-<n>- prefix"""
+        return f"{self.registration_prefix}{str(number).zfill(5)}"
+
     def generate_registration_numbers(self, start: int = 0, end: int = 999) -> List[str]:
         """Generate registration numbers from start to end"""
-        base_number = "20227910-16-1-"
-        return [f"{base_number}{str(i).zfill(5)}" for i in range(start, end + 1)]
+        return [self.format_registration_number(i) for i in range(start, end + 1)]
 
-    def fetch_registration_data(self, registration_number: str) -> Optional[Dict]:
-        """Fetch data for a single registration number"""
+    def fetch_registration_data(self, registration_number: str):
+        """Fetch data for a single registration number.
+
+        Returns the record, None if the API says the number does not exist, or
+        PROBE_FAILED if the lookup failed and the number should be probed again.
+        """
         url = f"{self.base_url}/{registration_number}"
 
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
+            data = fetch_json(self.session, url, timeout=10, cache=self.cache,
+                              throttle=self.rate_limiter.acquire, feedback=self.rate_limiter.record,
+                              retries=self.max_retries)
 
             # Check if the response indicates data was found
             if data.get('code') == 200 and data.get('status') == 'Data ditemukan':
                 return data.get('result')
-            else:
+            if data.get('code') == 404:
                 print(f"No data found for {registration_number}: {data.get('message', 'Unknown error')}")
                 return None
+            print(f"Unexpected response for {registration_number}: {data.get('code')} {data.get('message', '')}")
+            return PROBE_FAILED
 
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching {registration_number}: {e}")
-            return None
         except json.JSONDecodeError as e:
             print(f"Error parsing JSON for {registration_number}: {e}")
-            return None
+            return PROBE_FAILED
+        except requests.exceptions.RequestException as e:
+            response = getattr(e, 'response', None)
+            if response is not None and response.status_code == 404:
+                print(f"No data found for {registration_number}: HTTP 404")
+                return None
+            print(f"Error fetching {registration_number}: {e}")
+            return PROBE_FAILED
 
     def save_to_csv(self, data_list: List[Dict]):
         """Save the collected data to CSV file, sorted by distance_1 ascending"""
@@ -80,35 +161,196 @@ class RegistrationScraper:
                 row = {header: data.get(header, '') for header in headers}
                 writer.writerow(row)
 
+        write_snapshot(sorted_data, self.output_file, columns=headers)
         print(f"Saved {len(sorted_data)} records to {self.output_file} (sorted by distance_1 ascending)")
 
-    def scrape_all_registrations(self, start: int = 0, end: int = 999, delay: float = 0):
+    def probe_registration(self, registration_number: str):
+        """Probe one registration number; network requests take a token from the shared rate limiter"""
+        return self.fetch_registration_data(registration_number)
+
+    def open_journal(self, resume: bool) -> Dict[str, Optional[Dict]]:
+        """Load results from a previous run when resuming, otherwise start a fresh journal"""
+        self.failed = set()
+        if not resume:
+            self.journal.reset()
+            return {}
+
+        probed = self.journal.load()
+        found = sum(1 for data in probed.values() if data)
+        print(f"Resuming from {self.journal.journal_file}: {len(probed)} numbers already probed, {found} valid")
+        return probed
+
+    def probe_batch(self, executor: ThreadPoolExecutor, reg_numbers: List[str],
+                    probed: Dict[str, Optional[Dict]], delay: float = 0) -> Tuple[List[Optional[Dict]], int, int]:
+        """Probe the numbers not yet in the journal and journal the new results.
+
+        Failed probes are not journaled, so a resumed run probes them again; they count
+        as misses in the returned results. Returns the results for the whole batch in
+        input order, the number of new probes and how many of them found a registration.
+        """
+        pending = [number for number in reg_numbers if number not in probed]
+
+        if self.max_workers > 1:
+            new_results = list(executor.map(self.probe_registration, pending))
+        else:
+            new_results = []
+            for reg_number in pending:
+                print(f"Checking {reg_number}")
+                new_results.append(self.probe_registration(reg_number))
+                # Rate limiting to be respectful to the server
+                time.sleep(delay)
+
+        answered = [(number, data) for number, data in zip(pending, new_results) if data is not PROBE_FAILED]
+        if answered:
+            self.journal.append(answered)
+            probed.update(answered)
+        self.failed.difference_update(number for number, _ in answered)
+        self.failed.update(number for number, data in zip(pending, new_results) if data is PROBE_FAILED)
+
+        hits = sum(1 for _, data in answered if data)
+        return [probed.get(number) for number in reg_numbers], len(pending), hits
+
+    def build_csv_from_journal(self) -> List[Dict]:
+        """Build the sorted CSV from every valid record in the journal"""
+        valid_data = self.journal.valid_records()
+        self.save_to_csv(valid_data)
+        return valid_data
+
+    def scrape_all_registrations(self, start: int = 0, end: int = 999, delay: float = 0,
+                                 checkpoint_every: int = 100, resume: bool = False):
         """Scrape all registration numbers from start to end"""
         registration_numbers = self.generate_registration_numbers(start, end)
+        probed = self.open_journal(resume)
         valid_data = []
+        probes = hits = 0
 
         print(f"Starting to scrape {len(registration_numbers)} registration numbers...")
         print(f"Range: {registration_numbers[0]} to {registration_numbers[-1]}")
+        print(f"Workers: {self.max_workers}")
+
+        started = time.monotonic()
 
-        for i, reg_number in enumerate(registration_numbers):
-            print(f"Progress: {i+1}/{len(registration_numbers)} - Checking {reg_number}")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch_start in range(0, len(registration_numbers), checkpoint_every):
+                batch = registration_numbers[batch_start:batch_start + checkpoint_every]
+                results, new_probes, new_hits = self.probe_batch(executor, batch, probed, delay)
+                probes += new_probes
+                hits += new_hits
 
-            data = self.fetch_registration_data(reg_number)
-            if data:
-                valid_data.append(data)
-                print(f"✓ Found valid data for {reg_number} - {data.get('name', 'Unknown')}")
+                for reg_number, data in zip(batch, results):
+                    if data:
+                        valid_data.append(data)
+                        print(f"✓ Found valid data for {reg_number} - {data.get('name', 'Unknown')}")
 
-            # Rate limiting to be respectful to the server
-            time.sleep(delay)
+                print(f"Progress: {batch_start + len(batch)}/{len(registration_numbers)} - "
+                      f"{len(valid_data)} valid records journaled")
 
-            # Save progress every 100 requests
-            if (i + 1) % 100 == 0:
-                print(f"Checkpoint: Saving {len(valid_data)} valid records so far...")
-                self.save_to_csv(valid_data)
+        elapsed = time.monotonic() - started
 
-        # Final save
+        # Sorted CSV is built once, at the end
         self.save_to_csv(valid_data)
         print(f"Scraping completed! Found {len(valid_data)} valid registrations out of {len(registration_numbers)} checked.")
+        self.record_probe_stats(probes, hits, elapsed)
+
+        return valid_data
+
+    def record_probe_stats(self, probes: int, hits: int, elapsed: float) -> Dict:
+        """Store and print throughput and hit rate for the probes made by the last scrape"""
+        self.stats = {
+            'probes': probes,
+            'hits': hits,
+            'elapsed_seconds': round(elapsed, 2),
+            'probes_per_second': round(probes / elapsed, 2) if elapsed > 0 else 0.0,
+            'hit_rate': round(hits / probes * 100, 1) if probes else 0.0,
+            'failed': len(self.failed)
+        }
+        print(f"Probe stats: {self.stats['probes_per_second']} probes/sec, "
+              f"hit rate {self.stats['hit_rate']}% ({self.stats['hits']}/{self.stats['probes']}) "
+              f"in {self.stats['elapsed_seconds']}s")
+        if self.failed:
+            print(f"⚠️  {len(self.failed)} numbers could not be probed (not journaled); "
+                  f"run 'python run.py resume' to probe them again")
+        return self.stats
+
+    def adaptive_miss_tolerance(self, start: int, last_hit: Optional[int], hits: int,
+                                miss_tolerance: int) -> int:
+        """Misses allowed after the last hit: at least miss_tolerance, or five mean gaps between hits"""
+        if last_hit is None or hits < 2:
+            return miss_tolerance
+        mean_gap = (last_hit - start + 1) / hits
+        return max(miss_tolerance, int(math.ceil(mean_gap * 5)))
+
+    def scrape_adaptive(self, start: int = 0, max_number: int = 99999, miss_tolerance: int = 50,
+                        gallop_steps: int = 4, batch_size: int = 20, resume: bool = False):
+        """Probe upward from start until the occupied range of registration numbers ends.
+
+        Numbers are probed linearly in small batches. Once the run of misses after the
+        last hit exceeds the adaptive tolerance, galloping probes at doubling distances
+        past the last hit look for a distant cluster. If they all miss, the tail is
+        treated as empty and scraping stops; otherwise the linear scan resumes.
+        """
+        probed = self.open_journal(resume)
+        valid_data = []
+        probes = hits = 0
+        last_hit = None
+        next_number = start
+
+        print(f"Starting adaptive scrape for prefix {self.registration_prefix} from {str(start).zfill(5)}...")
+        print(f"Workers: {self.max_workers}, miss tolerance: {miss_tolerance}")
+
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while next_number <= max_number:
+                batch = list(range(next_number, min(next_number + batch_size, max_number + 1)))
+                reg_numbers = [self.format_registration_number(n) for n in batch]
+                results, new_probes, new_hits = self.probe_batch(executor, reg_numbers, probed)
+                probes += new_probes
+                hits += new_hits
+
+                for number, reg_number, data in zip(batch, reg_numbers, results):
+                    if data:
+                        valid_data.append(data)
+                        last_hit = number
+                        print(f"✓ Found valid data for {reg_number} - {data.get('name', 'Unknown')}")
+
+                next_number = batch[-1] + 1
+
+                tolerance = self.adaptive_miss_tolerance(start, last_hit, len(valid_data), miss_tolerance)
+                reference = last_hit if last_hit is not None else start - 1
+                if (next_number - 1) - reference < tolerance:
+                    continue
+
+                # Tail looks empty: gallop past the last hit to look for a distant cluster
+                gallop_hit = None
+                distance = tolerance
+                for _ in range(gallop_steps):
+                    distance *= 2
+                    candidate = reference + distance
+                    if candidate > max_number:
+                        break
+                    results, new_probes, new_hits = self.probe_batch(executor, [self.format_registration_number(candidate)],
+                                                                     probed)
+                    probes += new_probes
+                    hits += new_hits
+                    if results[0]:
+                        gallop_hit = candidate
+                        break
+
+                if gallop_hit is None:
+                    print(f"No registrations within {tolerance} numbers after the last hit "
+                          f"or at {gallop_steps} galloping probes. Stopping at {self.format_registration_number(next_number - 1)}.")
+                    break
+
+                # The linear scan picks the hit up from the journal, covering the gap before it too
+                print(f"Galloping probe found {self.format_registration_number(gallop_hit)}, resuming linear scan")
+                last_hit = gallop_hit
+
+        elapsed = time.monotonic() - started
+
+        self.save_to_csv(valid_data)
+        print(f"Adaptive scraping completed! Found {len(valid_data)} valid registrations with {probes} new probes.")
+        self.record_probe_stats(probes, hits, elapsed)
 
         return valid_data
 
@@ -258,30 +500,30 @@ class RegistrationScraper:
         print(f"KESIMPULAN: {status_indicator}")
         print(f"{'='*70}\n")
 
-def main():
+def main(resume: bool = False):
     # API base URL
-    base_url = "https://spmb.jabarprov.go.id/api/public/registration"
+    base_url = REGISTRATION_URL
 
-    # Initialize scraper
-    scraper = RegistrationScraper(base_url)
+    # Initialize scraper with a small worker pool sharing a 10 requests/second budget
+    scraper = RegistrationScraper(base_url, max_workers=8, requests_per_second=10)
 
     # Ask user for confirmation before starting full scrape
-    print("This script will scrape 1000 registration numbers (00000 to 00999).")
-    print("This may take approximately 8-10 minutes with 0.5 second delays between requests.")
+    print("This script will probe registration numbers upward from 00000 until the occupied range ends.")
+    print("Probing stops once the tail is empty, usually well before 1000 requests.")
 
     # Test with a known working registration number first
     print("\nTesting with known registration number: 20227910-16-1-00369")
     test_data = scraper.fetch_registration_data("20227910-16-1-00369")
-    if test_data:
+    if test_data and test_data is not PROBE_FAILED:
         print(f"✓ Test successful! Found: {test_data.get('name', 'Unknown')}")
         print("API is working correctly.\n")
     else:
         print("✗ Test failed. Please check the API endpoint.")
         return
 
-    # Start scraping from 00000 to 00999
+    # Start scraping upward from 00000
     try:
-        valid_data = scraper.scrape_all_registrations(start=0, end=999, delay=0.5)
+        valid_data = scraper.scrape_adaptive(start=0, resume=resume)
         print(f"\nScraping Summary:")
         print(f"Total valid registrations found: {len(valid_data)}")
         print(f"Data saved to: {scraper.output_file}")
@@ -307,13 +549,14 @@ def main():
                 print("Please enter a valid registration number or 'quit' to exit.")
 
     except KeyboardInterrupt:
-        print("\nScraping interrupted by user. Partial data may have been saved.")
+        print("\nScraping interrupted by user. Probed numbers are kept in the journal.")
+        print("Run 'python run.py resume' to continue or 'python run.py csv' to build the CSV now.")
     except Exception as e:
         print(f"An error occurred: {e}")
 
 def lookup_only():
     """Function to only lookup positions without running the scraper"""
-    scraper = RegistrationScraper("https://spmb.jabarprov.go.id/api/public/registration")
+    scraper = RegistrationScraper(REGISTRATION_URL)
 
     print("="*70)
     print("PENCARIAN POSISI DAN KEMUNGKINAN DITERIMA")
@@ -346,5 +589,10 @@ if __name__ == "__main__":
     # Check if user wants to run lookup only
     if len(sys.argv) > 1 and sys.argv[1].lower() in ['lookup', 'position', 'find']:
         lookup_only()
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'csv':
+        # Build the sorted CSV on demand from the probe journal
+        RegistrationScraper(REGISTRATION_URL).build_csv_from_journal()
+    elif len(sys.argv) > 1 and sys.argv[1].lower() == 'resume':
+        main(resume=True)
     else:
         main()
\ No newline at end of file
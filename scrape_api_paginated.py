@@ -4,6 +4,8 @@ import json
 import time
 from typing import Dict, List, Optional
 
+from spmb_client import REGISTRATION_URL
+
 class PaginatedScraper:
     def __init__(self, base_url: str, output_file: str = "hasil_paginated_sorted.csv"):
         self.base_url = base_url
@@ -171,7 +173,7 @@ class PaginatedScraper:
 
 def main():
     # API URL for paginated results
-    api_url = "https://spmb.jabarprov.go.id/api/public/registration"
+    api_url = REGISTRATION_URL
     
     # Initialize scraper
     scraper = PaginatedScraper(api_url)
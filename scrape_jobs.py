@@ -0,0 +1,106 @@
+import itertools
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class ScrapeJob:
+    """A scrape running in a background thread.
+
+    The job doubles as the progress_bar/status_text pair the scrapers expect, so
+    progress() and text() calls from the worker update fields any rerun can read.
+    """
+
+    def __init__(self, job_id: int, key: Tuple, description: str = ""):
+        self.job_id = job_id
+        self.key = key
+        self.description = description
+        self.status = 'running'
+        self.fraction = 0.0
+        self.message = "Starting..."
+        self.result = None
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.context = {}
+
+    # progress_bar / status_text interface used by the scrapers
+    def progress(self, value: float):
+        self.fraction = max(0.0, min(float(value), 1.0))
+
+    def text(self, message: str):
+        self.message = message
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def running(self) -> bool:
+        return self.status == 'running'
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    def finish(self, status: str, result: Any = None, error: Optional[str] = None):
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.status = status
+
+class JobRegistry:
+    """Process-wide registry of scrape jobs, one running job per key.
+
+    Submitting a key that already has a running job returns that job instead of
+    starting another, so every session watching the dashboard shares it.
+    """
+
+    def __init__(self, max_finished: int = 20):
+        self.max_finished = max_finished
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+
+    def submit(self, key: Tuple, target: Callable[..., Any], *args, description: str = "", **kwargs) -> ScrapeJob:
+        """Start target(job, *args, **kwargs) in a daemon thread, or return the running job for key"""
+        with self.lock:
+            running = self.latest(key)
+            if running is not None and running.running:
+                return running
+
+            job = ScrapeJob(next(self.ids), key, description)
+            self.jobs[job.job_id] = job
+            self._prune()
+
+        job.thread = threading.Thread(target=self._run, args=(job, target, args, kwargs),
+                                      name=f"scrape-job-{job.job_id}", daemon=True)
+        job.thread.start()
+        return job
+
+    def _run(self, job: ScrapeJob, target: Callable[..., Any], args: Tuple, kwargs: Dict):
+        try:
+            result = target(job, *args, **kwargs)
+        except Exception as e:
+            job.text(f"Failed: {e}")
+            job.finish('failed', error=traceback.format_exc())
+            return
+        job.finish('cancelled' if job.cancel_event.is_set() else 'done', result=result)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_finished (lock held)"""
+        finished = [job_id for job_id, job in self.jobs.items() if not job.running]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: int) -> Optional[ScrapeJob]:
+        return self.jobs.get(job_id)
+
+    def latest(self, key: Tuple) -> Optional[ScrapeJob]:
+        """Most recently started job for key, running or finished"""
+        matches = [job for job in list(self.jobs.values()) if job.key == key]
+        return matches[-1] if matches else None
+
+    def running_jobs(self) -> List[ScrapeJob]:
+        return [job for job in list(self.jobs.values()) if job.running]
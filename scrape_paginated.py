@@ -4,11 +4,22 @@ import json
 import time
 from typing import Dict, List, Optional
 
+from rate_limiter import get_rate_limiter
+from response_cache import default_cache, fetch_json
+from snapshot_store import SNAPSHOT_COLUMNS, write_snapshot
+from spmb_client import REGISTRATION_URL
+
 class PaginatedScraper:
-    def __init__(self, base_url: str, output_file: str = "hasil_paginated_sorted.csv", zonasi_only_file: str = "hasil_zonasi_only.csv"):
+    def __init__(self, base_url: str, output_file: str = "hasil_paginated_sorted.csv", zonasi_only_file: str = "hasil_zonasi_only.csv",
+                 use_cache: bool = True, requests_per_second: float = 1.0, max_retries: int = 3,
+                 npsn: str = '20227910'):
         self.base_url = base_url
+        self.npsn = npsn
         self.output_file = output_file
         self.zonasi_only_file = zonasi_only_file
+        self.cache = default_cache() if use_cache else None
+        self.rate_limiter = get_rate_limiter(base_url, requests_per_second)
+        self.max_retries = max_retries
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -24,15 +35,14 @@ class PaginatedScraper:
             'limit': limit,
             'orderby': 'distance_1',
             'order': 'asc',
-            'npsn': '20227910'
+            'npsn': self.npsn
         }
         
         try:
             print(f"Fetching page {page}...")
-            response = self.session.get(self.base_url, params=params, timeout=15)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = fetch_json(self.session, self.base_url, params, timeout=15, cache=self.cache,
+                              throttle=self.rate_limiter.acquire, feedback=self.rate_limiter.record,
+                              retries=self.max_retries)
             
             if data.get('code') == 200:
                 return data
@@ -47,15 +57,15 @@ class PaginatedScraper:
             print(f"Error parsing JSON for page {page}: {e}")
             return None
     
-    def scrape_all_pages(self, limit_per_page: int = 100, delay: float = 1.0) -> List[Dict]:
-        """Scrape all pages of data"""
+    def scrape_all_pages(self, limit_per_page: int = 100, delay: float = 0) -> List[Dict]:
+        """Scrape all pages of data; pacing comes from the rate limiter, delay adds a fixed pause"""
         all_data = []
         page = 1
         total_pages = None
         
         print("Starting paginated scraping...")
         print(f"API URL: {self.base_url}")
-        print(f"Parameters: NPSN=20227910, option_type=zonasi, sorted by distance_1 ascending")
+        print(f"Parameters: NPSN={self.npsn}, option_type=zonasi, sorted by distance_1 ascending")
         
         while True:
             # Fetch current page
@@ -92,8 +102,8 @@ class PaginatedScraper:
             # Move to next page
             page += 1
             
-            # Rate limiting
-            time.sleep(delay)
+            if delay:
+                time.sleep(delay)
         
         print(f"\nScraping completed! Total records collected: {len(all_data)}")
         return all_data
@@ -124,6 +134,7 @@ class PaginatedScraper:
                 row = {header: data.get(header, '') for header in headers}
                 writer.writerow(row)
 
+        write_snapshot(data_list, self.output_file, columns=SNAPSHOT_COLUMNS)
         print(f"✓ Saved {len(data_list)} records to {self.output_file}")
 
         # Filter and save only zonasi data
@@ -139,6 +150,7 @@ class PaginatedScraper:
                     row = {header: data.get(header, '') for header in headers}
                     writer.writerow(row)
 
+            write_snapshot(zonasi_data, self.zonasi_only_file, columns=SNAPSHOT_COLUMNS)
             print(f"✓ Saved {len(zonasi_data)} ZONASI records to {self.zonasi_only_file}")
             print(f"✓ Data is already sorted by distance_1 (ascending)")
 
@@ -289,14 +301,14 @@ class PaginatedScraper:
 
 def main():
     # API URL for paginated results
-    api_url = "https://spmb.jabarprov.go.id/api/public/registration"
+    api_url = REGISTRATION_URL
     
     # Initialize scraper
     scraper = PaginatedScraper(api_url)
     
     try:
         # Scrape all pages
-        all_data = scraper.scrape_all_pages(limit_per_page=100, delay=1.0)
+        all_data = scraper.scrape_all_pages(limit_per_page=100)
         
         if all_data:
             # Save to CSV
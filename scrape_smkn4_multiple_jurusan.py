@@ -8,7 +8,8 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from streamlit_app import StreamlitScraper
+from spmb_client import REGISTRATION_URL, SPMBClient
+from snapshot_store import write_snapshot
 import pandas as pd
 
 def scrape_smkn4_data():
@@ -18,7 +19,7 @@ def scrape_smkn4_data():
     print("="*80)
     
     # Initialize scraper
-    scraper = StreamlitScraper("https://spmb.jabarprov.go.id/api/public/registration")
+    scraper = SPMBClient(REGISTRATION_URL)
     
     # NPSN untuk SMKN 4 PADALARANG
     npsn = "20206224"
@@ -56,6 +57,7 @@ def scrape_smkn4_data():
             
             # Save raw data
             df.to_csv('smkn4_prestasi_rapor_raw.csv', index=False)
+            write_snapshot(df, 'smkn4_prestasi_rapor_raw.csv')
             print(f"💾 Raw data saved to: smkn4_prestasi_rapor_raw.csv")
             
             # Show jurusan info
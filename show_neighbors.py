@@ -1,126 +1,235 @@
-import csv
+import argparse
+import os
 import sys
+from typing import Dict, List, Optional
 
-def show_student_neighbors(target_registration: str, csv_file: str = "hasil_zonasi_only.csv", neighbors: int = 5):
+import numpy as np
+
+from snapshot_store import LOOKUP_COLUMNS, read_snapshot, source_signature
+
+class NeighborEngine:
+    """Rank-ordered column arrays for O(1) neighbor-window queries.
+
+    The zonasi file is parsed once into numpy arrays plus a registration_number -> row
+    dict; each query is a dict lookup and array slices, with distance gaps computed
+    for the whole window at once.
+    """
+
+    def __init__(self, df):
+        self.total = len(df)
+        self.distances = df['distance_1'].to_numpy(dtype='float64', na_value=np.nan)
+        self.columns = {}
+        for col in LOOKUP_COLUMNS:
+            if col == 'distance_1':
+                continue
+            if col in df.columns:
+                values = df[col].astype(object)
+                self.columns[col] = values.where(values.notna(), '').to_numpy()
+            else:
+                self.columns[col] = np.full(self.total, '', dtype=object)
+
+        # First occurrence wins, like a linear scan
+        self.rows = {}
+        for i, registration_number in enumerate(self.columns['registration_number']):
+            self.rows.setdefault(registration_number, i)
+
+    @classmethod
+    def from_file(cls, csv_file: str) -> 'NeighborEngine':
+        return cls(read_snapshot(csv_file, columns=LOOKUP_COLUMNS))
+
+    def query(self, registration_number: str, k: int = 5, quota: int = 139) -> Optional[Dict]:
+        """Return the ±k window around a registration number, or None if it is not ranked"""
+        i = self.rows.get(registration_number)
+        if i is None:
+            return None
+
+        start = max(0, i - k)
+        end = min(self.total, i + k + 1)
+        window_distances = self.distances[start:end]
+        target_distance = self.distances[i]
+
+        # Distance of the last student inside the quota (the cutoff)
+        cutoff_distance = self.distances[quota - 1] if 0 < quota <= self.total else np.nan
+
+        return {
+            'registration_number': registration_number,
+            'position': i + 1,
+            'total': self.total,
+            'start_position': start + 1,
+            'window': {col: values[start:end] for col, values in self.columns.items()},
+            'distances': window_distances,
+            # gaps[j] is the distance from window row j to row j + 1
+            'gaps': np.diff(window_distances),
+            'gap_above': target_distance - self.distances[i - 1] if i > 0 else np.nan,
+            'gap_below': self.distances[i + 1] - target_distance if i < self.total - 1 else np.nan,
+            'quota': quota,
+            'in_quota': i + 1 <= quota,
+            'quota_margin': quota - (i + 1),
+            'quota_cutoff_distance': cutoff_distance,
+            'distance_to_cutoff': target_distance - cutoff_distance
+        }
+
+    def query_batch(self, registration_numbers: List[str], k: int = 5, quota: int = 139) -> List[Optional[Dict]]:
+        return [self.query(registration_number, k, quota) for registration_number in registration_numbers]
+
+_engines = {}
+
+def get_engine(csv_file: str) -> NeighborEngine:
+    """Reuse the parsed engine for a file until its snapshot changes"""
+    path = os.path.abspath(csv_file)
+    signature = source_signature(csv_file)
+    cached = _engines.get(path)
+    if cached is None or cached[0] != signature:
+        _engines[path] = (signature, NeighborEngine.from_file(csv_file))
+    return _engines[path][1]
+
+def show_student_neighbors(target_registration: str, csv_file: str = "hasil_zonasi_only.csv", neighbors: int = 5,
+                           quota: int = 139):
     """Show students positioned around a target registration number"""
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            zonasi_data = list(reader)
-        
-        # Find the target registration number
-        target_position = None
-        target_record = None
-        
-        for i, record in enumerate(zonasi_data):
-            if record['registration_number'] == target_registration:
-                target_position = i
-                target_record = record
-                break
-        
-        if target_position is None:
+        result = get_engine(csv_file).query(target_registration, neighbors, quota)
+
+        if result is None:
             print(f"❌ Registration {target_registration} not found in zonasi data")
             return
-        
-        # Calculate range
-        start_idx = max(0, target_position - neighbors)
-        end_idx = min(len(zonasi_data), target_position + neighbors + 1)
-        
+
+        window = result['window']
+        target_offset = result['position'] - result['start_position']
+
         print(f"\n{'='*130}")
         print(f"🎯 STUDENTS AROUND REGISTRATION: {target_registration}")
         print(f"{'='*130}")
-        print(f"📍 Target Position: #{target_position + 1} out of {len(zonasi_data)} zonasi students")
-        print(f"👤 Target Student: {target_record.get('name', 'Unknown')}")
-        print(f"📏 Target Distance: {target_record.get('distance_1', 'N/A')}m")
-        print(f"🏫 Target School: {target_record.get('school_name', 'Unknown')}")
-        
+        print(f"📍 Target Position: #{result['position']} out of {result['total']} zonasi students")
+        print(f"👤 Target Student: {window['name'][target_offset] or 'Unknown'}")
+        print(f"📏 Target Distance: {result['distances'][target_offset]}m")
+        print(f"🏫 Target School: {window['school_name'][target_offset] or 'Unknown'}")
+
         print(f"\n{'='*130}")
         print(f"📊 RANKING TABLE (Showing {neighbors} above and {neighbors} below)")
         print(f"{'='*130}")
-        
+
         # Header
         print(f"{'Pos':<4} {'Registration':<20} {'Name':<25} {'Distance':<10} {'School':<30} {'First Choice':<25}")
         print(f"{'-'*130}")
-        
+
         # Show students in range
-        for i in range(start_idx, end_idx):
-            record = zonasi_data[i]
-            position = i + 1
-            reg_num = record.get('registration_number', '')
-            name = record.get('name', '')[:24]  # Truncate long names
-            distance = record.get('distance_1', '')
-            school = record.get('school_name', '')[:29]  # Truncate long school names
-            first_choice = record.get('first_option_name', '')[:24]
-            
+        for j in range(len(result['distances'])):
+            position = result['start_position'] + j
+            reg_num = window['registration_number'][j]
+            name = str(window['name'][j])[:24]  # Truncate long names
+            distance = result['distances'][j]
+            school = str(window['school_name'][j])[:29]  # Truncate long school names
+            first_choice = str(window['first_option_name'][j])[:24]
+
             # Highlight the target registration
-            if record['registration_number'] == target_registration:
+            if j == target_offset:
                 print(f"🎯 {position:<3} {reg_num:<20} {name:<25} {distance:<10} {school:<30} {first_choice:<25}")
             else:
                 # Show position relative to target
-                diff = position - (target_position + 1)
+                diff = j - target_offset
                 if diff < 0:
                     indicator = f"↑{abs(diff)}"
-                elif diff > 0:
-                    indicator = f"↓{diff}"
                 else:
-                    indicator = "🎯"
-                
+                    indicator = f"↓{diff}"
+
                 print(f"{indicator:<3} {position:<3} {reg_num:<20} {name:<25} {distance:<10} {school:<30} {first_choice:<25}")
-        
+
         print(f"{'-'*130}")
-        
+
         # Analysis
         print(f"\n📈 POSITION ANALYSIS:")
-        quota = 139
-        if target_position + 1 <= quota:
+        if result['in_quota']:
             status = "✅ DALAM KUOTA"
-            remaining_slots = quota - (target_position + 1)
             print(f"   Status: {status}")
-            print(f"   Margin: {remaining_slots} slots remaining before quota limit")
+            print(f"   Margin: {result['quota_margin']} slots remaining before quota limit")
         else:
             status = "⚠️ DI LUAR KUOTA"
-            excess = (target_position + 1) - quota
             print(f"   Status: {status}")
-            print(f"   Gap: {excess} positions beyond quota limit")
-        
+            print(f"   Gap: {-result['quota_margin']} positions beyond quota limit")
+
         # Distance comparison
-        if target_position > 0:
-            prev_distance = float(zonasi_data[target_position - 1].get('distance_1', 0))
-            curr_distance = float(target_record.get('distance_1', 0))
-            distance_gap = curr_distance - prev_distance
-            print(f"   Distance gap from student above: +{distance_gap:.3f}m")
-        
-        if target_position < len(zonasi_data) - 1:
-            next_distance = float(zonasi_data[target_position + 1].get('distance_1', 0))
-            curr_distance = float(target_record.get('distance_1', 0))
-            distance_gap = next_distance - curr_distance
-            print(f"   Distance gap to student below: +{distance_gap:.3f}m")
-        
+        if not np.isnan(result['gap_above']):
+            print(f"   Distance gap from student above: +{result['gap_above']:.3f}m")
+
+        if not np.isnan(result['gap_below']):
+            print(f"   Distance gap to student below: +{result['gap_below']:.3f}m")
+
+        if not np.isnan(result['distance_to_cutoff']):
+            print(f"   Distance to quota cutoff (#{quota}, {result['quota_cutoff_distance']:.3f}m): "
+                  f"{result['distance_to_cutoff']:+.3f}m")
+
         print(f"\n{'='*130}")
-        
+
     except FileNotFoundError:
         print(f"❌ File {csv_file} not found. Please run the scraper first.")
     except Exception as e:
         print(f"❌ Error: {e}")
 
+def show_neighbors_batch(targets: List[str], csv_file: str = "hasil_zonasi_only.csv", neighbors: int = 5,
+                         quota: int = 139):
+    """Print a one-line neighbor summary for each target registration number"""
+    try:
+        engine = get_engine(csv_file)
+    except FileNotFoundError:
+        print(f"❌ File {csv_file} not found. Please run the scraper first.")
+        return
+
+    print(f"{'Registration':<20} {'Pos':>6} {'Total':>6} {'Gap Above':>11} {'Gap Below':>11} "
+          f"{'To Cutoff':>11} {'Window Span':>12} Status")
+    print(f"{'-'*100}")
+
+    for registration_number, result in zip(targets, engine.query_batch(targets, neighbors, quota)):
+        if result is None:
+            print(f"{registration_number:<20} {'-':>6} {engine.total:>6} not found")
+            continue
+
+        span = result['distances'][-1] - result['distances'][0]
+        status = "DALAM KUOTA" if result['in_quota'] else f"DI LUAR KUOTA (+{-result['quota_margin']})"
+        print(f"{registration_number:<20} {result['position']:>6} {result['total']:>6} "
+              f"{result['gap_above']:>11.3f} {result['gap_below']:>11.3f} "
+              f"{result['distance_to_cutoff']:>+11.3f} {span:>12.3f} {status}")
+
+def batch_main(argv: List[str]):
+    """Batch mode: python show_neighbors.py --batch <file|-> [-k N] [--quota N]"""
+    parser = argparse.ArgumentParser(prog="show_neighbors.py --batch",
+                                     description="Neighbor summary for many registration numbers")
+    parser.add_argument('input', help="File with one registration number per line, or - for stdin")
+    parser.add_argument('-k', '--neighbors', type=int, default=5, help="Window size on each side (default: 5)")
+    parser.add_argument('--quota', type=int, default=139, help="Quota (default: 139)")
+    parser.add_argument('--csv-file', default="hasil_zonasi_only.csv", help="Zonasi result file")
+    args = parser.parse_args(argv)
+
+    lines = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+    with lines:
+        targets = [line.split(',')[0].strip() for line in lines
+                   if line.strip() and not line.startswith('#')]
+    targets = [target for target in targets if target != 'registration_number']
+
+    show_neighbors_batch(targets, args.csv_file, args.neighbors, args.quota)
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        batch_main(sys.argv[2:])
+        return
+
     if len(sys.argv) < 2:
         print("🔍 STUDENT NEIGHBOR VIEWER")
         print("Usage: python show_neighbors.py <registration_number> [neighbors_count]")
+        print("       python show_neighbors.py --batch <file|-> [-k neighbors_count]")
         print("Example: python show_neighbors.py 20227910-16-1-00369 5")
         print("\nOr run interactively:")
-        
+
         while True:
             reg_num = input("\nEnter registration number (or 'quit' to exit): ").strip()
             if reg_num.lower() in ['quit', 'exit', 'q']:
                 break
-            
+
             neighbors_input = input("Number of neighbors to show (default 5): ").strip()
             try:
                 neighbors = int(neighbors_input) if neighbors_input else 5
             except ValueError:
                 neighbors = 5
-            
+
             if reg_num:
                 show_student_neighbors(reg_num, neighbors=neighbors)
     else:
@@ -0,0 +1,83 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class Flight:
+    """One in-flight call; also records progress that waiting callers can mirror"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+        self.fraction = 0.0
+        self.message = ""
+
+    def progress(self, value: float):
+        self.fraction = value
+
+    def text(self, message: str):
+        self.message = message
+
+class SingleFlight:
+    """Collapse concurrent identical calls into one execution.
+
+    The first caller for a key runs fn(flight, ...); callers arriving while it is in
+    flight wait and receive the same result (or exception). Nothing is cached once
+    the call finishes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+        self.counters = {'leaders': 0, 'shared': 0}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args,
+           on_wait: Optional[Callable[[Flight], None]] = None, poll_interval: float = 0.25,
+           **kwargs) -> Tuple[Any, bool]:
+        """Return (result, shared); shared is True if another caller did the work.
+
+        on_wait(flight) is called every poll_interval while waiting; it may raise to
+        stop waiting without affecting the call in flight.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Flight()
+                self.flights[key] = flight
+                self.counters['leaders'] += 1
+            else:
+                flight.waiters += 1
+                self.counters['shared'] += 1
+
+        if not leader:
+            try:
+                while not flight.done.wait(poll_interval):
+                    if on_wait:
+                        on_wait(flight)
+            finally:
+                with self.lock:
+                    flight.waiters -= 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn(flight, *args, **kwargs)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def in_flight(self) -> Dict[Hashable, int]:
+        """Keys currently in flight with their number of waiting callers"""
+        with self.lock:
+            return {key: flight.waiters for key, flight in self.flights.items()}
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return dict(self.counters)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from snapshot_store import _parquet, to_snapshot_frame
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 20250610T080000.000000Z - sorts chronologically as a string
+TIMESTAMP_FORMAT = '%Y%m%dT%H%M%S.%fZ'
+SNAPSHOT_NAME = re.compile(r'^(\d{8}T\d{6}\.\d{6}Z)\.(parquet|csv\.gz)$')
+
+def format_timestamp(when: datetime) -> str:
+    return when.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+def parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+
+def series_name(npsn: str, option_type: str, major_id: Optional[str] = None) -> str:
+    return f"{npsn}_{option_type}" + (f"_{major_id}" if major_id else "")
+
+def frame_hash(df: 'pd.DataFrame') -> str:
+    """Content hash of a result frame (values and row order)"""
+    import pandas as pd
+
+    digest = hashlib.sha1(','.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df.astype(str), index=False).values.tobytes())
+    return digest.hexdigest()
+
+class SnapshotHistory:
+    """Versioned, append-only history of scrape results.
+
+    Every series (one school x option type) is a directory of immutable snapshots
+    named by their UTC timestamp: zstd Parquet, or gzip CSV without pyarrow. A
+    latest.json pointer names the current one and is replaced atomically, so readers
+    either see the old or the new snapshot, never a half-written file.
+    """
+
+    def __init__(self, root: str = 'snapshot_history'):
+        self.root = root
+
+    def series_dir(self, series: str) -> str:
+        return os.path.join(self.root, series)
+
+    def list_series(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.exists(os.path.join(self.root, name, 'latest.json')))
+
+    def snapshots(self, series: str) -> List[Tuple[datetime, str]]:
+        """(taken_at, path) for every snapshot of a series, oldest first"""
+        directory = self.series_dir(series)
+        if not os.path.isdir(directory):
+            return []
+        found = []
+        for name in sorted(os.listdir(directory)):
+            match = SNAPSHOT_NAME.match(name)
+            if match:
+                found.append((parse_timestamp(match.group(1)), os.path.join(directory, name)))
+        return found
+
+    def latest(self, series: str) -> Optional[Dict]:
+        """The latest.json pointer (snapshot, taken_at, records, content_hash, checked_at) or None"""
+        try:
+            with open(os.path.join(self.series_dir(series), 'latest.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_pointer(self, series: str, pointer: Dict):
+        target = os.path.join(self.series_dir(series), 'latest.json')
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(pointer, f, indent=2)
+        os.replace(tmp_path, target)
+
+    def touch(self, series: str, checked_at: datetime):
+        """Note that the latest snapshot was confirmed unchanged at checked_at"""
+        pointer = self.latest(series)
+        if pointer is not None:
+            self._write_pointer(series, dict(pointer, checked_at=format_timestamp(checked_at)))
+
+    def record(self, series: str, df: 'pd.DataFrame', taken_at: Optional[datetime] = None,
+               meta: Optional[Dict] = None) -> Optional[str]:
+        """Store df as a new snapshot unless it equals the latest one; returns the new path or None.
+
+        Either way the pointer's checked_at is updated to taken_at.
+        """
+        taken_at = taken_at or datetime.now(timezone.utc)
+        content_hash = frame_hash(df)
+        pointer = self.latest(series)
+        if pointer is not None and pointer['content_hash'] == content_hash:
+            self.touch(series, taken_at)
+            return None
+
+        directory = self.series_dir(series)
+        os.makedirs(directory, exist_ok=True)
+        stamp = format_timestamp(taken_at)
+        extension = 'parquet' if _parquet() is not None else 'csv.gz'
+        target = os.path.join(directory, f"{stamp}.{extension}")
+        if os.path.exists(target):
+            raise FileExistsError(f"Snapshot {target} already exists")
+
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        if extension == 'parquet':
+            to_snapshot_frame(df).to_parquet(tmp_path, index=False, compression='zstd')
+        else:
+            df.to_csv(tmp_path, index=False, compression='gzip')
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, target)
+
+        self._write_pointer(series, dict(meta or {}, snapshot=os.path.basename(target), taken_at=stamp,
+                                         checked_at=stamp, records=len(df), content_hash=content_hash))
+        return target
+
+    def path_at(self, series: str, when: Optional[datetime] = None) -> Optional[str]:
+        """Snapshot that was current at `when` (the latest one if None)"""
+        if when is None:
+            pointer = self.latest(series)
+            return os.path.join(self.series_dir(series), pointer['snapshot']) if pointer else None
+
+        snapshots = self.snapshots(series)
+        index = bisect_right([taken_at for taken_at, _ in snapshots], when.astimezone(timezone.utc))
+        return snapshots[index - 1][1] if index else None
+
+    def read(self, series: str, when: Optional[datetime] = None,
+             columns: Optional[List[str]] = None) -> Optional['pd.DataFrame']:
+        """Load a series as of `when` (default: latest) with optional column projection"""
+        import pandas as pd
+
+        path = self.path_at(series, when)
+        if path is None:
+            return None
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path, columns=columns)
+        return to_snapshot_frame(pd.read_csv(path, usecols=columns, compression='gzip'))
@@ -0,0 +1,129 @@
+import json
+import math
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas and pyarrow are imported on first use so importing the column lists and path
+# helpers stays cheap for CLI tools
+_pq = None
+
+def _parquet():
+    """pyarrow.parquet, or None if pyarrow is not installed (snapshots are then skipped)"""
+    global _pq
+    if _pq is None:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            pq = False
+        _pq = pq
+    return _pq or None
+
+# Same column order the scrapers use for their CSV files
+SNAPSHOT_COLUMNS = [
+    'registration_number', 'name', 'school_name', 'option_type',
+    'first_option_name', 'second_option_name', 'third_option_name',
+    'distance_1', 'distance_2', 'distance_3',
+    'score', 'score_a1', 'score_a2', 'score_a3',
+    'score_kejuaraan', 'score_ujikom', 'created_at',
+    'address_city', 'address_district', 'address_subdistrict'
+]
+
+CATEGORY_COLUMNS = [
+    'school_name', 'option_type', 'first_option_name', 'second_option_name', 'third_option_name',
+    'address_city', 'address_district', 'address_subdistrict'
+]
+
+FLOAT_COLUMNS = [
+    'distance_1', 'distance_2', 'distance_3',
+    'score', 'score_a1', 'score_a2', 'score_a3', 'score_kejuaraan', 'score_ujikom'
+]
+
+# Column projections used by the readers
+LOOKUP_COLUMNS = ['registration_number', 'name', 'school_name', 'first_option_name', 'distance_1']
+ANALYSIS_COLUMNS = ['registration_number', 'name', 'school_name', 'first_option_name', 'score', 'created_at']
+
+def snapshot_path(path: str) -> str:
+    """Parquet snapshot stored next to a CSV file (hasil_x.csv -> hasil_x.parquet)"""
+    return f"{os.path.splitext(path)[0]}.parquet"
+
+def _to_text(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+def to_snapshot_frame(data: Union['pd.DataFrame', List[Dict]], columns: Optional[List[str]] = None) -> 'pd.DataFrame':
+    """Build a typed frame: categoricals for names/addresses, floats for distances and scores.
+
+    Row order is preserved because it is the ranking.
+    """
+    import pandas as pd
+
+    df = data.copy() if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    if columns is not None:
+        df = df.reindex(columns=columns)
+
+    for col in df.columns:
+        if col in FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        elif col in CATEGORY_COLUMNS:
+            df[col] = df[col].map(_to_text).astype('category')
+        elif df[col].dtype == object:
+            df[col] = df[col].map(_to_text)
+
+    return df.reset_index(drop=True)
+
+def write_snapshot(data: Union['pd.DataFrame', List[Dict]], path: str,
+                   columns: Optional[List[str]] = None) -> Optional[str]:
+    """Write the typed Parquet snapshot for a CSV output file; returns the snapshot path"""
+    if _parquet() is None:
+        print(f"⚠️ pyarrow not installed, skipping snapshot for {path}")
+        return None
+
+    target = snapshot_path(path)
+    tmp_path = f"{target}.tmp"
+    to_snapshot_frame(data, columns).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, target)
+    return target
+
+def snapshot_is_current(path: str) -> bool:
+    """True if the Parquet snapshot exists and is not older than the CSV it mirrors"""
+    target = snapshot_path(path)
+    if not os.path.exists(target) or _parquet() is None:
+        return False
+    return not os.path.exists(path) or os.path.getmtime(target) >= os.path.getmtime(path)
+
+def source_signature(path: str) -> str:
+    """Identify the file read_snapshot would load (path, mtime and size) to validate caches.
+
+    Raises FileNotFoundError if neither the snapshot nor the CSV exists.
+    """
+    source = snapshot_path(path) if snapshot_is_current(path) else path
+    stat = os.stat(source)
+    return f"{source}:{stat.st_mtime_ns}:{stat.st_size}"
+
+def read_snapshot(path: str, columns: Optional[List[str]] = None) -> 'pd.DataFrame':
+    """Load a result file with column projection, preferring the Parquet snapshot.
+
+    Falls back to parsing the CSV when no current snapshot exists. Requested columns
+    missing from the file are ignored. Raises FileNotFoundError if neither exists.
+    """
+    import pandas as pd
+
+    if snapshot_is_current(path):
+        target = snapshot_path(path)
+        if columns is not None:
+            available = set(_parquet().read_schema(target).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(target, columns=columns)
+
+    if columns is not None:
+        wanted = set(columns)
+        df = pd.read_csv(path, usecols=lambda col: col in wanted)
+    else:
+        df = pd.read_csv(path)
+    return to_snapshot_frame(df)
@@ -0,0 +1,304 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rate_limiter import get_rate_limiter
+from response_cache import default_cache, fetch_json
+from single_flight import SingleFlight
+
+# Public API root; point SPMB_API_BASE at mock_spmb_server.py to run offline
+API_BASE = os.environ.get('SPMB_API_BASE', 'https://spmb.jabarprov.go.id/api/public').rstrip('/')
+REGISTRATION_URL = f"{API_BASE}/registration"
+
+# Identical scrapes from every caller in this process share one fetch
+scrape_flights = SingleFlight()
+
+class ScrapeCancelled(Exception):
+    pass
+
+class ProgressTee:
+    """Forward progress()/text() calls to several progress targets"""
+
+    def __init__(self, *targets):
+        self.targets = targets
+
+    def progress(self, value: float):
+        for target in self.targets:
+            target.progress(value)
+
+    def text(self, message: str):
+        for target in self.targets:
+            target.text(message)
+
+class SPMBClient:
+    """Paginated client for the SPMB registration API, independent of any UI.
+
+    progress_bar/status_text arguments only need progress(value) and text(message).
+    """
+
+    def __init__(self, base_url: str, max_workers: int = 4, requests_per_second: float = 5.0,
+                 use_cache: bool = True, on_error: Optional[Callable[[str], None]] = None,
+                 max_retries: int = 3):
+        # requests is imported here rather than at module level to keep imports cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url
+        self.max_workers = max(1, max_workers)
+        self.on_error = on_error or (lambda message: print(f"❌ {message}"))
+        # Paces all clients of this API host (in every process) and backs off on 403/429/5xx
+        self.rate_limiter = get_rate_limiter(base_url, requests_per_second)
+        self.max_retries = max_retries
+        self.cache = default_cache() if use_cache else None
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'application/json, text/plain, */*',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': 'https://spmb.jabarprov.go.id/'
+        })
+
+        # Keep one pooled connection per worker so concurrent pages reuse sockets
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def fetch_page(self, page: int = 1, limit: int = 100, npsn: str = '20227910',
+                   option_type: str = 'zonasi', orderby: str = 'distance_1',
+                   order: str = 'asc', major_id: str = None) -> Optional[Dict]:
+        """Fetch a single page of data from the API with flexible parameters"""
+        params = {
+            'page': page,
+            'limit': limit,
+            'orderby': orderby,
+            'order': order,
+            'pagination': 'true',
+            'columns[0][key]': 'name',
+            'columns[0][searchable]': 'false',
+            'columns[1][key]': 'registration_number',
+            'columns[1][searchable]': 'true',
+            'npsn': npsn,
+            'filters[1][key]': 'option_type',
+            'filters[1][value]': option_type
+        }
+
+        # Add major_id if provided (for prestasi-rapor)
+        if major_id and option_type == 'prestasi-rapor':
+            params['major_id'] = major_id
+
+        import requests
+
+        try:
+            data = fetch_json(self.session, self.base_url, params, timeout=15,
+                              cache=self.cache, throttle=self.rate_limiter.acquire,
+                              feedback=self.rate_limiter.record, retries=self.max_retries)
+
+            if data.get('code') == 200:
+                return data
+            else:
+                self.on_error(f"API returned error code: {data.get('code')} - {data.get('message', 'Unknown error')}")
+                return None
+
+        except requests.exceptions.RequestException as e:
+            self.on_error(f"Error fetching page {page}: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            self.on_error(f"Error parsing JSON for page {page}: {e}")
+            return None
+    
+    def scrape_all_pages(self, progress_bar, status_text, limit_per_page: int = 100,
+                        npsn: str = '20227910', option_type: str = 'zonasi',
+                        orderby: str = 'distance_1', order: str = 'asc',
+                        major_id: str = None, concurrent: bool = False,
+                        on_page: Optional[Callable[[List[Dict]], None]] = None,
+                        cancel_event: Optional[threading.Event] = None) -> List[Dict]:
+        """Scrape all pages, sharing the work with identical scrapes already running.
+
+        Concurrent calls with the same (npsn, option_type, orderby, order, major_id)
+        anywhere in this process run one fetch; the others mirror its progress and
+        get the same records (on_page then sees them in one call). A waiter whose
+        cancel_event is set stops waiting; if the shared scrape itself was cancelled,
+        waiters start over instead of taking its partial result.
+        """
+        key = (npsn, option_type, orderby, order, major_id)
+
+        def mirror_progress(flight):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ScrapeCancelled()
+            progress_bar.progress(min(flight.fraction, 1.0))
+            status_text.text(f"{flight.message} (shared with another session)")
+
+        while True:
+            try:
+                (all_data, cancelled), shared = scrape_flights.do(
+                    key, self._fetch_all_pages_shared, progress_bar, status_text, limit_per_page,
+                    npsn, option_type, orderby, order, major_id, concurrent, on_page, cancel_event,
+                    on_wait=mirror_progress
+                )
+            except ScrapeCancelled:
+                status_text.text("Cancelled while waiting for a shared scrape")
+                return []
+
+            if not shared:
+                return all_data
+            if not cancelled:
+                if on_page and all_data:
+                    on_page(all_data)
+                progress_bar.progress(1.0)
+                return list(all_data)
+
+    def _fetch_all_pages_shared(self, flight, progress_bar, status_text, limit_per_page, npsn,
+                                option_type, orderby, order, major_id, concurrent, on_page,
+                                cancel_event) -> Tuple[List[Dict], bool]:
+        """Leader side of scrape_all_pages: fetch while publishing progress to waiters"""
+        all_data = self.fetch_all_pages(ProgressTee(progress_bar, flight), ProgressTee(status_text, flight),
+                                        limit_per_page, npsn, option_type, orderby, order, major_id,
+                                        concurrent, on_page, cancel_event)
+        return all_data, cancel_event is not None and cancel_event.is_set()
+
+    def fetch_all_pages(self, progress_bar, status_text, limit_per_page: int = 100,
+                        npsn: str = '20227910', option_type: str = 'zonasi',
+                        orderby: str = 'distance_1', order: str = 'asc',
+                        major_id: str = None, concurrent: bool = False,
+                        on_page: Optional[Callable[[List[Dict]], None]] = None,
+                        cancel_event: Optional[threading.Event] = None) -> List[Dict]:
+        """Fetch all pages of data with progress tracking and flexible parameters.
+
+        on_page is called with each page's items as soon as the page arrives. Setting
+        cancel_event stops the scrape before the next page is requested.
+        """
+        if concurrent:
+            return self.scrape_all_pages_concurrent(progress_bar, status_text, limit_per_page,
+                                                    npsn, option_type, orderby, order, major_id,
+                                                    on_page, cancel_event)
+
+        all_data = []
+        page = 1
+
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                status_text.text(f"Cancelled after {len(all_data)} records")
+                break
+
+            status_text.text(f"Fetching page {page}...")
+            page_data = self.fetch_page(page, limit_per_page, npsn, option_type, orderby, order, major_id)
+
+            if page_data is None:
+                break
+
+            result = page_data.get('result', {})
+            data_items = result.get('itemsList', [])
+
+            if data_items:
+                all_data.extend(data_items)
+                if on_page:
+                    on_page(data_items)
+
+                # Get pagination info for better progress tracking
+                pagination = result.get('pagination', {})
+                total_records = pagination.get('total_records', len(all_data))
+
+                if total_records > 0:
+                    progress_bar.progress(min(len(all_data) / total_records, 1.0))
+                else:
+                    progress_bar.progress(min(len(all_data) / 200, 1.0))  # Fallback estimate
+
+                status_text.text(f"Page {page}: Found {len(data_items)} records (Total: {len(all_data)})")
+
+                # Check if we've reached the last page using pagination info
+                current_page = pagination.get('current_page', page)
+                total_pages = pagination.get('total_pages', 0)
+
+                if current_page >= total_pages and total_pages > 0:
+                    break
+                elif len(data_items) < limit_per_page:
+                    break
+            else:
+                break
+
+            page += 1
+
+        return all_data
+
+    def scrape_all_pages_concurrent(self, progress_bar, status_text, limit_per_page: int = 100,
+                                    npsn: str = '20227910', option_type: str = 'zonasi',
+                                    orderby: str = 'distance_1', order: str = 'asc',
+                                    major_id: str = None,
+                                    on_page: Optional[Callable[[List[Dict]], None]] = None,
+                                    cancel_event: Optional[threading.Event] = None) -> List[Dict]:
+        """Fetch page 1, read total_pages, then fetch the remaining pages concurrently.
+
+        Pages are reassembled in page order, and only the contiguous run of pages
+        starting at page 1 is returned so the ranking never has gaps. on_page sees
+        pages in arrival order, including any after a gap.
+        """
+        status_text.text("Fetching page 1...")
+        first_page = self.fetch_page(1, limit_per_page, npsn, option_type, orderby, order, major_id)
+
+        if first_page is None:
+            return []
+
+        result = first_page.get('result', {})
+        first_items = result.get('itemsList', [])
+        if not first_items:
+            return []
+        if on_page:
+            on_page(first_items)
+
+        pagination = result.get('pagination', {})
+        total_pages = pagination.get('total_pages', 0)
+        total_records = pagination.get('total_records', 0)
+
+        if total_records > 0:
+            progress_bar.progress(min(len(first_items) / total_records, 1.0))
+        status_text.text(f"Page 1: Found {len(first_items)} records (Total pages: {total_pages})")
+
+        if total_pages <= 1 or len(first_items) < limit_per_page:
+            return first_items
+
+        pages = {1: first_items}
+        collected = len(first_items)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.fetch_page, page, limit_per_page, npsn,
+                                option_type, orderby, order, major_id): page
+                for page in range(2, total_pages + 1)
+            }
+
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    # Drop queued pages; only requests already in flight finish
+                    for pending in futures:
+                        pending.cancel()
+                    status_text.text(f"Cancelled after {len(pages)}/{total_pages} pages")
+                    break
+
+                page = futures[future]
+                page_data = future.result()
+                if page_data is None:
+                    continue
+
+                data_items = page_data.get('result', {}).get('itemsList', [])
+                pages[page] = data_items
+                collected += len(data_items)
+                if on_page:
+                    on_page(data_items)
+
+                if total_records > 0:
+                    progress_bar.progress(min(collected / total_records, 1.0))
+                status_text.text(f"Page {page}: Found {len(data_items)} records "
+                                 f"({len(pages)}/{total_pages} pages, Total: {collected})")
+
+        # Reassemble in page order, stopping at the first missing or empty page
+        all_data = []
+        for page in range(1, total_pages + 1):
+            data_items = pages.get(page)
+            if not data_items:
+                status_text.text(f"Page {page} could not be fetched; keeping pages 1-{page - 1}")
+                break
+            all_data.extend(data_items)
+
+        return all_data
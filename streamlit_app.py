@@ -1,13 +1,17 @@
 import streamlit as st
 import pandas as pd
-import requests
 import csv
-import json
-import time
-from typing import Dict, List, Optional
+import os
+from typing import Callable, Dict, List, Optional
 import plotly.express as px
 import plotly.graph_objects as go
 
+from jurusan_ranking import StreamingTopK, analyze_prestasi_by_jurusan, build_comparison_frame
+from scrape_jobs import JobRegistry, ScrapeJob
+from spmb_client import REGISTRATION_URL, SPMBClient
+from table_view import TableView
+from snapshot_store import ANALYSIS_COLUMNS, read_snapshot, source_signature, write_snapshot
+
 # Set page config
 st.set_page_config(
     page_title="School Admission Analysis",
@@ -16,118 +20,68 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-class StreamlitScraper:
-    def __init__(self, base_url: str):
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://spmb.jabarprov.go.id/'
-        })
-
-
-    
-    def fetch_page(self, page: int = 1, limit: int = 100, npsn: str = '20227910',
-                   option_type: str = 'zonasi', orderby: str = 'distance_1',
-                   order: str = 'asc', major_id: str = None) -> Optional[Dict]:
-        """Fetch a single page of data from the API with flexible parameters"""
-        params = {
-            'page': page,
-            'limit': limit,
-            'orderby': orderby,
-            'order': order,
-            'pagination': 'true',
-            'columns[0][key]': 'name',
-            'columns[0][searchable]': 'false',
-            'columns[1][key]': 'registration_number',
-            'columns[1][searchable]': 'true',
-            'npsn': npsn,
-            'filters[1][key]': 'option_type',
-            'filters[1][value]': option_type
-        }
-
-        # Add major_id if provided (for prestasi-rapor)
-        if major_id and option_type == 'prestasi-rapor':
-            params['major_id'] = major_id
-
-        try:
-            response = self.session.get(self.base_url, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-
-            if data.get('code') == 200:
-                return data
-            else:
-                st.error(f"API returned error code: {data.get('code')} - {data.get('message', 'Unknown error')}")
-                return None
-
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error fetching page {page}: {e}")
-            return None
-        except json.JSONDecodeError as e:
-            st.error(f"Error parsing JSON for page {page}: {e}")
-            return None
-    
-    def scrape_all_pages(self, progress_bar, status_text, limit_per_page: int = 100,
-                        npsn: str = '20227910', option_type: str = 'zonasi',
-                        orderby: str = 'distance_1', order: str = 'asc',
-                        major_id: str = None) -> List[Dict]:
-        """Scrape all pages of data with progress tracking and flexible parameters"""
-        all_data = []
-        page = 1
-
-        while True:
-            status_text.text(f"Fetching page {page}...")
-            page_data = self.fetch_page(page, limit_per_page, npsn, option_type, orderby, order, major_id)
-
-            if page_data is None:
-                break
-
-            result = page_data.get('result', {})
-            data_items = result.get('itemsList', [])
+class StreamlitScraper(SPMBClient):
+    """SPMB API client that reports fetch errors on the Streamlit page by default"""
 
-            if data_items:
-                all_data.extend(data_items)
+    def __init__(self, base_url: str, max_workers: int = 4, requests_per_second: float = 5.0,
+                 use_cache: bool = True, on_error: Optional[Callable[[str], None]] = None):
+        # Background jobs have no page to draw on and pass their own error sink
+        super().__init__(base_url, max_workers, requests_per_second, use_cache, on_error or st.error)
 
-                # Get pagination info for better progress tracking
-                pagination = result.get('pagination', {})
-                total_records = pagination.get('total_records', len(all_data))
-
-                if total_records > 0:
-                    progress_bar.progress(min(len(all_data) / total_records, 1.0))
-                else:
-                    progress_bar.progress(min(len(all_data) / 200, 1.0))  # Fallback estimate
+def load_data_from_csv(file_path: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Load data from the typed snapshot of a CSV file (or the CSV itself) with column projection"""
+    try:
+        df = read_snapshot(file_path, columns=columns)
+        return df
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return None
 
-                status_text.text(f"Page {page}: Found {len(data_items)} records (Total: {len(all_data)})")
+class PrestasiDataset:
+    """Parsed prestasi-rapor snapshot with its analysis, built once per file version.
 
-                # Check if we've reached the last page using pagination info
-                current_page = pagination.get('current_page', page)
-                total_pages = pagination.get('total_pages', 0)
+    Download payloads are serialized on first request and reused afterwards.
+    """
 
-                if current_page >= total_pages and total_pages > 0:
-                    break
-                elif len(data_items) < limit_per_page:
-                    break
-            else:
-                break
+    def __init__(self, file_path: str, signature: str):
+        self.file_path = file_path
+        self.signature = signature
+        self.df = read_snapshot(file_path, columns=ANALYSIS_COLUMNS)
+        self.analysis = analyze_prestasi_by_jurusan(self.df)
+        self.comparison = build_comparison_frame(self.analysis)
+        self.downloads = {}
 
-            page += 1
-            time.sleep(0.5)  # Rate limiting
+    def download(self, name: str, build: Callable[[], pd.DataFrame]) -> str:
+        if name not in self.downloads:
+            self.downloads[name] = build().to_csv(index=False)
+        return self.downloads[name]
 
-        return all_data
+@st.cache_resource(show_spinner=False)
+def _prestasi_datasets() -> Dict[str, PrestasiDataset]:
+    # Lives across reruns and sessions; one entry per file, replaced when the file changes
+    return {}
 
-def load_data_from_csv(file_path: str) -> Optional[pd.DataFrame]:
-    """Load data from CSV file"""
+def load_prestasi_dataset(file_path: str) -> Optional[PrestasiDataset]:
+    """Reuse the analyzed dataset until the snapshot's mtime/size signature changes"""
     try:
-        df = pd.read_csv(file_path)
-        return df
+        signature = source_signature(file_path)
     except FileNotFoundError:
         return None
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        return None
+
+    datasets = _prestasi_datasets()
+    path = os.path.abspath(file_path)
+    cached = datasets.get(path)
+    if cached is None or cached.signature != signature:
+        try:
+            datasets[path] = PrestasiDataset(file_path, signature)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            st.error(f"Error loading data: {e}")
+            return None
+    return datasets[path]
 
 def calculate_acceptance_probability(position: int, total_zonasi: int, quota: int = 139) -> Dict:
     """Calculate acceptance probability"""
@@ -160,48 +114,174 @@ def calculate_acceptance_probability(position: int, total_zonasi: int, quota: in
         'in_quota': position <= quota
     }
 
-def analyze_prestasi_by_jurusan(df: pd.DataFrame) -> Dict:
-    """Analyze prestasi-rapor data and create top 50 per jurusan"""
-    if df is None or len(df) == 0:
-        return {}
-
-    # Clean data
-    df_clean = df.dropna(subset=['first_option_name', 'score']).copy()
-    df_clean['score'] = pd.to_numeric(df_clean['score'], errors='coerce')
-    df_clean = df_clean.dropna(subset=['score'])
-
-    # Get unique jurusan
-    jurusan_list = df_clean['first_option_name'].unique()
-
-    results = {}
-
-    for jurusan in jurusan_list:
-        # Filter data untuk jurusan ini
-        jurusan_df = df_clean[df_clean['first_option_name'] == jurusan].copy()
-
-        # Sort berdasarkan score (descending)
-        jurusan_df = jurusan_df.sort_values('score', ascending=False)
-
-        # Ambil top 50 (atau semua jika kurang dari 50)
-        top_50 = jurusan_df.head(50).copy()
-
-        # Tambahkan ranking
-        top_50['Ranking'] = range(1, len(top_50) + 1)
-
-        # Clean jurusan name
-        clean_name = jurusan.replace('SMKN 4 PADALARANG - ', '').replace('SMAN 2 PADALARANG - ', '')
-        clean_name = clean_name.replace(' - PRESTASI NILAI RAPOR', '')
-
-        results[clean_name] = {
-            'data': top_50,
-            'total_siswa': len(jurusan_df),
-            'score_tertinggi': jurusan_df['score'].max(),
-            'score_terendah': jurusan_df['score'].min(),
-            'rata_rata_score': jurusan_df['score'].mean(),
-            'median_score': jurusan_df['score'].median()
-        }
-
-    return results
+def render_live_ranking(placeholder, live_topk: StreamingTopK):
+    """Show partial top-k standings per jurusan while a scrape is still running"""
+    summary = live_topk.summary()
+    if summary:
+        placeholder.dataframe(pd.DataFrame(summary), use_container_width=True)
+
+BASE_URL = REGISTRATION_URL
+
+@st.cache_resource(show_spinner=False)
+def get_job_registry() -> JobRegistry:
+    # Shared by every session, so reruns and other viewers attach to the same jobs
+    return JobRegistry()
+
+def run_prestasi_scrape_job(job: ScrapeJob, npsn: str, max_workers: int, requests_per_second: float,
+                            use_cache: bool, concurrent: bool) -> Dict:
+    """Background job: scrape all prestasi-rapor pages and save the CSV and snapshot"""
+    scraper = StreamlitScraper(BASE_URL, max_workers=max_workers, requests_per_second=requests_per_second,
+                               use_cache=use_cache, on_error=job.text)
+    live_topk = StreamingTopK(k=50)
+    job.context['live_topk'] = live_topk
+
+    all_prestasi_data = scraper.scrape_all_pages(
+        job, job,
+        npsn=npsn, option_type='prestasi-rapor',
+        orderby='score', order='desc',
+        # No major_id parameter = get all majors
+        concurrent=concurrent,
+        on_page=live_topk.add,
+        cancel_event=job.cancel_event
+    )
+
+    result = {'records': len(all_prestasi_data), 'df': None,
+              'cache_stats': scraper.cache.stats() if scraper.cache is not None else None}
+    if job.cancel_event.is_set() or not all_prestasi_data:
+        return result
+
+    # Convert to DataFrame
+    df_all_prestasi = pd.DataFrame(all_prestasi_data)
+
+    # Save to CSV
+    df_all_prestasi.to_csv('hasil_all_prestasi_rapor.csv', index=False)
+    write_snapshot(df_all_prestasi, 'hasil_all_prestasi_rapor.csv')
+    job.text(f"Saved {len(df_all_prestasi)} records")
+
+    result['df'] = df_all_prestasi
+    return result
+
+@st.fragment(run_every=1.0)
+def show_job_progress(job: ScrapeJob):
+    """Poll a running job once a second; reruns the page when it finishes"""
+    if not job.running:
+        st.rerun()
+
+    st.progress(job.fraction)
+    st.text(f"{job.message} ({job.elapsed:.0f}s)")
+
+    live_topk = job.context.get('live_topk')
+    if live_topk is not None:
+        st.caption("🏆 Live Top 50 per Jurusan (partial, updates as pages arrive)")
+        render_live_ranking(st.empty(), live_topk)
+
+    if st.button("⏹️ Cancel Scraping", key=f"cancel_job_{job.job_id}"):
+        job.cancel()
+        st.toast("Cancelling after the pages in flight...")
+
+def show_scrape_result(job: ScrapeJob, npsn: str):
+    """Show the outcome of a finished prestasi-rapor scrape job"""
+    if job.status == 'failed':
+        st.error(f"❌ Error during ALL prestasi-rapor scraping: {job.message}")
+        with st.expander("Traceback"):
+            st.code(job.error)
+        return
+    if job.status == 'cancelled':
+        st.warning(f"⏹️ Scraping cancelled after {job.result['records']} records; existing files were kept")
+        return
+
+    result = job.result
+    df_all_prestasi = result['df']
+    st.write(f"🔍 Raw data result: {result['records']} items")
+
+    if df_all_prestasi is None:
+        st.error("❌ No prestasi-rapor data was collected")
+        st.write("🔍 This might indicate no prestasi-rapor registrations exist for this school")
+        st.caption(f"Last status: {job.message}")
+        return
+
+    st.success(f"✅ ALL Prestasi-rapor scraping completed in {job.elapsed:.1f}s!")
+    st.info(f"📊 Total prestasi-rapor records: {len(df_all_prestasi)}")
+    cache_stats = result['cache_stats']
+    if cache_stats is not None:
+        st.caption(f"🗄️ Response cache: {cache_stats['hits']} hits, "
+                   f"{cache_stats['misses']} misses ({cache_stats['hit_rate']}% hit rate)")
+
+    # Show statistics by major/option
+    if 'first_option_name' in df_all_prestasi.columns:
+        st.subheader("📊 Records by Major")
+        major_counts = df_all_prestasi['first_option_name'].value_counts()
+        st.bar_chart(major_counts)
+        st.write("**Major Distribution:**")
+        for major, count in major_counts.head(10).items():
+            st.write(f"- {major}: {count} students")
+
+    # Show all records in a paginated table; only the visible page is sent to the browser
+    st.subheader(f"📋 All {len(df_all_prestasi)} Prestasi-Rapor Records")
+    if len(df_all_prestasi) > 0:
+        if 'view' not in result:
+            # Add ranking column
+            df_display = df_all_prestasi.copy()
+            df_display.insert(0, 'Rank', range(1, len(df_display) + 1))
+            result['view'] = TableView(df_display,
+                                       sortable=['Rank', 'score', 'name', 'registration_number', 'created_at'],
+                                       searchable=['name', 'registration_number'])
+
+        display_cols = ['Rank', 'registration_number', 'name', 'score', 'first_option_name', 'school_name', 'created_at']
+        render_paginated_table(result['view'], f"prestasi_{job.job_id}", display_cols)
+
+        # CSV is only serialized when asked for, then kept with the job
+        lazy_download_button(
+            "📥 Download All Records as CSV",
+            lambda: df_all_prestasi.to_csv(index=False),
+            file_name=f"all_prestasi_rapor_{npsn}.csv",
+            key=f"all_prestasi_{job.job_id}",
+            payloads=result.setdefault('downloads', {})
+        )
+
+def render_paginated_table(view: TableView, key: str, columns: List[str], page_size: int = 100,
+                           filter_column: str = 'first_option_name'):
+    """Show one page of a TableView; search, filter and sort run server-side"""
+    col_search, col_filter, col_sort, col_order = st.columns([3, 3, 2, 1])
+
+    search = col_search.text_input("🔎 Cari nama / nomor pendaftaran:", key=f"{key}_search")
+    filters = {}
+    if filter_column in view.df.columns:
+        filters[filter_column] = col_filter.multiselect("Filter jurusan:", view.distinct(filter_column),
+                                                        key=f"{key}_filter")
+    sort_by = col_sort.selectbox("Urutkan:", ['(ranking)'] + view.sortable, key=f"{key}_sort")
+    ascending = col_order.radio("Urutan:", ['↑', '↓'], key=f"{key}_order") == '↑'
+
+    rows = view.rows(None if sort_by == '(ranking)' else sort_by, ascending, search, filters)
+    total_pages = max(1, -(-len(rows) // page_size))
+
+    # Start from page 1 whenever the query changes, and never past the last page
+    page_key = f"{key}_page"
+    query = (search, tuple(filters.get(filter_column, [])), sort_by, ascending)
+    if st.session_state.get(f"{key}_query") != query:
+        st.session_state[f"{key}_query"] = query
+        st.session_state[page_key] = 1
+    elif st.session_state.get(page_key, 1) > total_pages:
+        st.session_state[page_key] = total_pages
+    page = st.number_input(f"Halaman (1-{total_pages}):", min_value=1, max_value=total_pages, key=page_key)
+
+    frame, _ = view.page(rows, int(page), page_size, columns)
+    first = (int(page) - 1) * page_size + 1 if len(rows) else 0
+    st.caption(f"Menampilkan {first}-{first + len(frame) - 1 if len(frame) else 0} "
+               f"dari {len(rows)} baris (total {len(view)})")
+    st.dataframe(frame, use_container_width=True, hide_index=True)
+
+def lazy_download_button(label: str, build: Callable[[], str], file_name: str, key: str,
+                         payloads: Dict[str, str], mime: str = "text/csv"):
+    """Serialize a download only after the user asks for it; payloads keeps it for later reruns"""
+    if key not in payloads:
+        if not st.button(f"⚙️ Prepare: {label}", key=f"prepare_{key}"):
+            return
+        with st.spinner("Preparing download..."):
+            payloads[key] = build()
+
+    st.download_button(label=label, data=payloads[key], file_name=file_name, mime=mime,
+                       key=f"download_{key}")
 
 def main():
     st.title("🎓 School Admission Analysis System")
@@ -214,6 +294,15 @@ def main():
     st.sidebar.subheader("🏫 School Configuration")
     npsn = st.sidebar.text_input("NPSN:", value="20206224", help="School NPSN code")
 
+    st.sidebar.subheader("⚡ Scraping Speed")
+    use_cache = st.sidebar.checkbox("Use cached API responses", value=True,
+                                    help="Serve repeated requests from the local response cache")
+    concurrent_scrape = st.sidebar.checkbox("Concurrent page fetching", value=True,
+                                            help="Read total pages from page 1, then fetch the rest in parallel")
+    max_workers = st.sidebar.number_input("Workers:", min_value=1, max_value=16, value=4)
+    requests_per_second = st.sidebar.number_input("Max requests/second:", min_value=0.5, max_value=20.0,
+                                                  value=5.0, step=0.5)
+
     # Main tabs
     tab1, tab2 = st.tabs(["🎯 Prestasi Scraping", "🏆 Top 50 per Jurusan"])
     
@@ -221,9 +310,6 @@ def main():
         st.header("🎯 Prestasi-Rapor Data Scraping")
         st.markdown("Scrape prestasi-rapor data with major selection")
 
-        # First, get school options
-        scraper = StreamlitScraper("https://spmb.jabarprov.go.id/api/public/registration")
-
         col1, col2 = st.columns([2, 1])
 
         with col1:
@@ -241,80 +327,27 @@ def main():
             # Add scraping option
             st.subheader("🎯 Scraping")
 
-            if st.button("🚀 Scrape ALL Prestasi-Rapor Data", type="primary", key="scrape_all_prestasi"):
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-
-                    st.info(f"🔍 Scraping ALL prestasi-rapor data (no major filter)")
-                    st.write(f"- NPSN: {npsn}")
-                    st.write(f"- Option Type: prestasi-rapor")
-                    st.write(f"- Order By: score (descending)")
-                    st.write(f"- Major ID: None (all majors)")
-
-                    try:
-                        with st.spinner("Scraping ALL prestasi-rapor data..."):
-                            all_prestasi_data = scraper.scrape_all_pages(
-                                progress_bar, status_text,
-                                npsn=npsn, option_type='prestasi-rapor',
-                                orderby='score', order='desc'
-                                # No major_id parameter = get all majors
-                            )
-
-                        st.write(f"🔍 Raw data result: {type(all_prestasi_data)} with {len(all_prestasi_data) if all_prestasi_data else 0} items")
-
-                        if all_prestasi_data:
-                            # Convert to DataFrame
-                            df_all_prestasi = pd.DataFrame(all_prestasi_data)
-
-                            # Save to CSV
-                            df_all_prestasi.to_csv('hasil_all_prestasi_rapor.csv', index=False)
-
-                            st.success(f"✅ ALL Prestasi-rapor scraping completed!")
-                            st.info(f"📊 Total prestasi-rapor records: {len(df_all_prestasi)}")
-
-                            # Show statistics by major/option
-                            if 'first_option_name' in df_all_prestasi.columns:
-                                st.subheader("📊 Records by Major")
-                                major_counts = df_all_prestasi['first_option_name'].value_counts()
-                                st.bar_chart(major_counts)
-                                st.write("**Major Distribution:**")
-                                for major, count in major_counts.head(10).items():
-                                    st.write(f"- {major}: {count} students")
-
-                            # Show all records in a table
-                            st.subheader(f"📋 All {len(df_all_prestasi)} Prestasi-Rapor Records")
-                            if len(df_all_prestasi) > 0:
-                                # Add ranking column
-                                df_display = df_all_prestasi.copy()
-                                df_display.insert(0, 'Rank', range(1, len(df_display) + 1))
-
-                                display_cols = ['Rank', 'registration_number', 'name', 'score', 'first_option_name', 'school_name', 'created_at']
-                                available_cols = [col for col in display_cols if col in df_display.columns]
-
-                                # Show all records with pagination-like display
-                                st.dataframe(
-                                    df_display[available_cols],
-                                    use_container_width=True,
-                                    height=600  # Set height to show more records
-                                )
-
-                                # Add download button for CSV
-                                csv_data = df_all_prestasi.to_csv(index=False)
-                                st.download_button(
-                                    label="📥 Download All Records as CSV",
-                                    data=csv_data,
-                                    file_name=f"all_prestasi_rapor_{npsn}.csv",
-                                    mime="text/csv"
-                                )
-                        else:
-                            st.error("❌ No prestasi-rapor data was collected")
-                            st.write("🔍 This might indicate no prestasi-rapor registrations exist for this school")
-
-                    except Exception as e:
-                        st.error(f"❌ Error during ALL prestasi-rapor scraping: {e}")
-                        st.exception(e)
+            job_key = ('prestasi-rapor', npsn)
+            job = get_job_registry().latest(job_key)
 
+            if st.button("🚀 Scrape ALL Prestasi-Rapor Data", type="primary", key="scrape_all_prestasi",
+                         disabled=job is not None and job.running):
+                job = get_job_registry().submit(
+                    job_key, run_prestasi_scrape_job, npsn, int(max_workers), requests_per_second,
+                    use_cache, concurrent_scrape, description=f"Prestasi-rapor NPSN {npsn}"
+                )
+
+            if job is not None:
+                st.info(f"🔍 Scraping ALL prestasi-rapor data (no major filter)")
+                st.write(f"- NPSN: {npsn}")
+                st.write(f"- Option Type: prestasi-rapor")
+                st.write(f"- Order By: score (descending)")
+                st.write(f"- Major ID: None (all majors)")
 
+                if job.running:
+                    show_job_progress(job)
+                else:
+                    show_scrape_result(job, npsn)
 
         with col2:
             st.info(f"**Data Source:**\nSPMB Jabar Official API\n\n**Parameters:**\n- NPSN: {npsn}\n- Type: Prestasi-Rapor (ALL majors)\n- Sorted by: score\n- Order: descending\n- Major Filter: None (scrapes all)")
@@ -327,12 +360,11 @@ def main():
         st.header("🏆 Top 50 per Jurusan")
         st.markdown("Analisis ranking top 50 siswa untuk setiap jurusan")
 
-        # Load prestasi-rapor data
-        prestasi_df = load_data_from_csv('hasil_all_prestasi_rapor.csv')
+        # Parsed frame, analysis and downloads are reused until the snapshot changes
+        dataset = load_prestasi_dataset('hasil_all_prestasi_rapor.csv')
 
-        if prestasi_df is not None:
-            # Analyze data by jurusan
-            jurusan_analysis = analyze_prestasi_by_jurusan(prestasi_df)
+        if dataset is not None:
+            jurusan_analysis = dataset.analysis
 
             if jurusan_analysis:
                 st.success(f"✅ Data berhasil dianalisis untuk {len(jurusan_analysis)} jurusan")
@@ -408,7 +440,7 @@ def main():
                     )
 
                     # Download button
-                    csv_data = top_50_data.to_csv(index=False)
+                    csv_data = dataset.download(f"top50:{selected_jurusan}", lambda: top_50_data)
                     st.download_button(
                         label=f"📥 Download Top {len(top_50_data)} {selected_jurusan} as CSV",
                         data=csv_data,
@@ -419,25 +451,12 @@ def main():
                 # Show all jurusan comparison
                 st.subheader("📊 Perbandingan Semua Jurusan")
 
-                # Create comparison dataframe
-                comparison_data = []
-                for jurusan, data in jurusan_analysis.items():
-                    comparison_data.append({
-                        'Jurusan': jurusan,
-                        'Total_Siswa': data['total_siswa'],
-                        'Score_Tertinggi': data['score_tertinggi'],
-                        'Score_Terendah': data['score_terendah'],
-                        'Rata_Rata': round(data['rata_rata_score'], 1),
-                        'Median': round(data['median_score'], 1)
-                    })
-
-                comparison_df = pd.DataFrame(comparison_data)
-                comparison_df = comparison_df.sort_values('Score_Tertinggi', ascending=False)
+                comparison_df = dataset.comparison
 
                 st.dataframe(comparison_df, use_container_width=True)
 
                 # Download all comparison
-                csv_comparison = comparison_df.to_csv(index=False)
+                csv_comparison = dataset.download("comparison", lambda: comparison_df)
                 st.download_button(
                     label="📥 Download Perbandingan Jurusan as CSV",
                     data=csv_comparison,
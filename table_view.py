@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+class TableView:
+    """Sort, filter and page a large frame without copying it.
+
+    Each sortable column gets a sort order (row positions) computed on first use and
+    kept as its index; search results are cached masks. Only the requested page is
+    ever materialized, so a rerun ships page_size rows instead of the whole table.
+    """
+
+    def __init__(self, df: pd.DataFrame, sortable: Optional[Sequence[str]] = None,
+                 searchable: Optional[Sequence[str]] = None, max_cached_masks: int = 16):
+        self.df = df.reset_index(drop=True)
+        self.sortable = [col for col in (sortable or df.columns) if col in self.df.columns]
+        self.searchable = [col for col in (searchable or []) if col in self.df.columns]
+        self.max_cached_masks = max_cached_masks
+        self.sort_orders = {}
+        self.masks = OrderedDict()
+        self.lowered = {}
+        self.distinct_values = {}
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def sort_order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Row positions ordered by a column (stable, missing values last)"""
+        if column not in self.sortable:
+            raise ValueError(f"Column {column} is not sortable")
+        key = (column, ascending)
+        if key not in self.sort_orders:
+            ordered = self.df[column].sort_values(ascending=ascending, kind='stable', na_position='last')
+            self.sort_orders[key] = ordered.index.to_numpy()
+        return self.sort_orders[key]
+
+    def distinct(self, column: str) -> List[str]:
+        """Sorted distinct values of a column, for filter widgets"""
+        if column not in self.distinct_values:
+            self.distinct_values[column] = sorted(self.df[column].dropna().astype(str).unique())
+        return self.distinct_values[column]
+
+    def _lowered(self, column: str) -> pd.Series:
+        if column not in self.lowered:
+            self.lowered[column] = self.df[column].astype(str).str.lower()
+        return self.lowered[column]
+
+    def mask(self, search: str = "", filters: Optional[Dict[str, List]] = None) -> Optional[np.ndarray]:
+        """Boolean row mask for a case-insensitive search plus exact-value filters; None means all rows"""
+        search = search.strip().lower()
+        filters = {col: values for col, values in (filters or {}).items() if values and col in self.df.columns}
+        if not search and not filters:
+            return None
+
+        key = (search, tuple(sorted((col, tuple(values)) for col, values in filters.items())))
+        if key in self.masks:
+            self.masks.move_to_end(key)
+            return self.masks[key]
+
+        mask = np.ones(len(self.df), dtype=bool)
+        for col, values in filters.items():
+            mask &= self.df[col].isin(values).to_numpy()
+        if search and self.searchable:
+            found = np.zeros(len(self.df), dtype=bool)
+            for col in self.searchable:
+                found |= self._lowered(col).str.contains(search, regex=False).to_numpy()
+            mask &= found
+
+        self.masks[key] = mask
+        while len(self.masks) > self.max_cached_masks:
+            self.masks.popitem(last=False)
+        return mask
+
+    def rows(self, sort_by: Optional[str] = None, ascending: bool = True, search: str = "",
+             filters: Optional[Dict[str, List]] = None) -> np.ndarray:
+        """Row positions matching the search/filters, in display order"""
+        order = self.sort_order(sort_by, ascending) if sort_by else np.arange(len(self.df))
+        mask = self.mask(search, filters)
+        return order if mask is None else order[mask[order]]
+
+    def page(self, rows: np.ndarray, page: int = 1, page_size: int = 100,
+             columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, int]:
+        """Materialize one page of rows; returns (frame, total pages)"""
+        total_pages = max(1, -(-len(rows) // page_size))
+        page = min(max(1, page), total_pages)
+        selected = rows[(page - 1) * page_size:page * page_size]
+        frame = self.df.iloc[selected]
+        if columns is not None:
+            frame = frame[[col for col in columns if col in frame.columns]]
+        return frame, total_pages
+
+    def to_csv(self, rows: Optional[np.ndarray] = None) -> str:
+        """CSV of the given rows (all rows by default); meant to be called only on demand"""
+        frame = self.df if rows is None else self.df.iloc[rows]
+        return frame.to_csv(index=False)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test batch mode lookup_position untuk banyak nomor registrasi sekaligus (offline)
+"""
+
+import io
+import json
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from lookup_position import (find_registration_position, find_registration_positions,
+                             read_batch_targets, write_batch_report)
+from test_registration_index import write_zonasi_csv
+
+def test_batch_matches_single_lookup():
+    """Test bahwa hasil batch sama dengan lookup satu per satu"""
+
+    print("="*80)
+    print("🧪 TESTING BATCH LOOKUP")
+    print("="*80)
+
+    csv_file = os.path.join(tempfile.mkdtemp(), 'hasil_zonasi_only.csv')
+    write_zonasi_csv(csv_file, 1000)
+
+    lines = ["registration_number,quota", "# kelas 9A", ""]
+    lines += [f"20227910-16-1-{i:05d}" for i in range(0, 1000, 3)]
+    lines += ["20227910-16-1-00500;600", "20227910-16-1-77777"]
+    targets = read_batch_targets(lines, default_quota=139)
+    report = find_registration_positions(targets, csv_file)
+
+    assert len(report) == len(targets) and not report[-1]['found'] and report[-2]['quota'] == 600, \
+        "Parsing input batch salah"
+
+    for row in report[:-1]:
+        single = find_registration_position(row['registration_number'], csv_file=csv_file, quota=row['quota'])
+        assert (single['position'], single['probability']) == (row['position'], row['probability']), \
+            f"Batch berbeda dengan lookup tunggal: {row}"
+        assert row['in_quota'] == (row['position'] <= row['quota']), f"Flag in_quota salah: {row}"
+
+    output = io.StringIO()
+    write_batch_report(report, output, 'json')
+    assert len(json.loads(output.getvalue())) == len(report), "Laporan JSON tidak lengkap"
+
+    print(f"✅ {len(report)} nomor diproses dalam satu pass, hasil sama dengan lookup tunggal")
+
+if __name__ == "__main__":
+    test_batch_matches_single_lookup()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Batch lookup: ✅ PASS")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test benchmark suite (benchmark.py) pada ukuran kecil (offline)
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import BENCHMARKS, compare_runs, parse_size, run_suite
+
+def test_benchmark_suite_small():
+    """Test semua benchmark jalan di proses terpisah dan mencatat waktu, RSS dan throughput"""
+
+    print("="*80)
+    print("🧪 TESTING BENCHMARK SUITE")
+    print("="*80)
+
+    assert [parse_size(size) for size in ('1000', '10k', '1M', '2.5m')] == [1000, 10000, 1000000, 2500000], \
+        "parse_size salah"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        run = run_suite([500], list(BENCHMARKS), workdir)
+
+    results = {result['benchmark']: result for result in run['results']}
+    assert set(results) == set(BENCHMARKS), f"Benchmark hilang: {set(BENCHMARKS) - set(results)}"
+
+    for name, result in results.items():
+        assert 'error' not in result, f"{name} gagal: {result['error']}"
+        assert result['seconds'] > 0 and result['throughput_per_s'] and result['peak_rss_mb'], \
+            f"{name} tidak lengkap: {result}"
+
+    assert results['scrape_pages']['items'] == 500 and results['find_registration_position']['items'] == 500, \
+        "Jumlah item salah"
+
+    comparison = compare_runs(run, run)
+    assert len(comparison) == len(BENCHMARKS) and all(row['speedup'] == 1.0 for row in comparison), \
+        "Perbandingan run salah"
+
+    print(f"✅ {len(results)} benchmark tercatat (commit {run['git_commit']})")
+
+if __name__ == "__main__":
+    test_benchmark_suite_small()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Benchmark suite: ✅ PASS")
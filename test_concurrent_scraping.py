@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Test concurrent scraping di SPMBClient dan RegistrationScraper (offline, tanpa akses API)
+"""
+
+import sys
+import os
+import csv
+import random
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spmb_client import SPMBClient
+from run import PROBE_FAILED, RegistrationScraper
+
+class MockProgress:
+    def progress(self, value):
+        pass
+
+class MockStatus:
+    def text(self, message):
+        pass
+
+def make_fake_fetch_page(total_records, limit_per_page, failing_pages=()):
+    """Buat fetch_page palsu yang mengembalikan halaman dengan urutan distance_1"""
+    total_pages = (total_records + limit_per_page - 1) // limit_per_page
+
+    def fake_fetch_page(page=1, limit=100, npsn='20227910', option_type='zonasi',
+                        orderby='distance_1', order='asc', major_id=None):
+        # Random latency so pages complete out of order
+        time.sleep(random.uniform(0, 0.01))
+        if page in failing_pages:
+            return None
+
+        start = (page - 1) * limit
+        items = [
+            {'registration_number': f"20227910-16-1-{i:05d}", 'distance_1': float(i)}
+            for i in range(start, min(start + limit, total_records))
+        ]
+        return {
+            'code': 200,
+            'result': {
+                'itemsList': items,
+                'pagination': {
+                    'current_page': page,
+                    'total_pages': total_pages,
+                    'total_records': total_records
+                }
+            }
+        }
+
+    return fake_fetch_page
+
+def test_concurrent_page_order():
+    """Test bahwa hasil concurrent sama persis dengan urutan halaman"""
+
+    print("="*80)
+    print("🧪 TESTING CONCURRENT PAGE FAN-OUT")
+    print("="*80)
+
+    scraper = SPMBClient("http://localhost/api/public/registration",
+                         max_workers=8, requests_per_second=0)
+    scraper.fetch_page = make_fake_fetch_page(total_records=2950, limit_per_page=100)
+
+    data = scraper.scrape_all_pages(MockProgress(), MockStatus(), limit_per_page=100, concurrent=True)
+    distances = [record['distance_1'] for record in data]
+
+    assert len(data) == 2950, f"Jumlah records salah: {len(data)}"
+    assert distances == sorted(distances), "Urutan halaman tidak terjaga"
+
+    print(f"✅ {len(data)} records dari 30 halaman, urutan distance_1 terjaga")
+
+def test_concurrent_failed_page():
+    """Test bahwa halaman gagal memotong hasil agar ranking tidak bolong"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING CONCURRENT FAILED PAGE")
+    print("="*80)
+
+    scraper = SPMBClient("http://localhost/api/public/registration",
+                         max_workers=4, requests_per_second=0)
+    scraper.fetch_page = make_fake_fetch_page(total_records=1000, limit_per_page=100, failing_pages={6})
+
+    data = scraper.scrape_all_pages(MockProgress(), MockStatus(), limit_per_page=100, concurrent=True)
+
+    assert len(data) == 500, f"Seharusnya hanya halaman 1-5 (500 records), didapat {len(data)}"
+
+    print(f"✅ Halaman 6 gagal, hanya halaman 1-5 ({len(data)} records) yang dipakai")
+
+def test_concurrent_registration_prober():
+    """Test bahwa prober concurrent menghasilkan hasil_valid.csv yang sama dengan sequential"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING CONCURRENT REGISTRATION PROBER")
+    print("="*80)
+
+    def fake_fetch_registration_data(registration_number):
+        number = int(registration_number.split('-')[-1])
+        if number % 3 != 0:
+            return None
+        return {'registration_number': registration_number, 'name': f"Siswa {number}",
+                'distance_1': (number * 7919) % 1000}
+
+    outputs = {}
+    for workers in (1, 8):
+        output_file = os.path.join(tempfile.mkdtemp(), 'hasil_valid.csv')
+        scraper = RegistrationScraper("http://localhost/api/public/registration", output_file,
+                                      max_workers=workers)
+        scraper.fetch_registration_data = fake_fetch_registration_data
+        scraper.scrape_all_registrations(start=0, end=299)
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            outputs[workers] = [row['registration_number'] for row in csv.DictReader(f)]
+
+    assert outputs[1] == outputs[8] and len(outputs[8]) == 100, "Hasil concurrent berbeda dengan sequential"
+    assert scraper.stats.get('hits') == 100 and scraper.stats.get('probes') == 300, \
+        f"Statistik probe salah: {scraper.stats}"
+
+    print(f"✅ CSV identik ({len(outputs[8])} records), stats: {scraper.stats}")
+
+def test_adaptive_registration_search():
+    """Test bahwa adaptive search menemukan semua registrasi dengan probe jauh lebih sedikit"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING ADAPTIVE REGISTRATION SEARCH")
+    print("="*80)
+
+    # Registrasi terisi 0..399 (beberapa bolong) ditambah cluster terpisah di 470..559
+    occupied = {n for n in range(400) if n % 4 != 1} | set(range(470, 560))
+
+    def fake_fetch_registration_data(registration_number):
+        number = int(registration_number.split('-')[-1])
+        if number not in occupied:
+            return None
+        return {'registration_number': registration_number, 'name': f"Siswa {number}",
+                'distance_1': number}
+
+    output_file = os.path.join(tempfile.mkdtemp(), 'hasil_valid.csv')
+    scraper = RegistrationScraper("http://localhost/api/public/registration", output_file,
+                                  max_workers=4, registration_prefix="20206224-31-2-")
+    scraper.fetch_registration_data = fake_fetch_registration_data
+    data = scraper.scrape_adaptive(start=0, max_number=99999, miss_tolerance=50)
+
+    found = {int(record['registration_number'].split('-')[-1]) for record in data}
+    assert found == occupied, f"Registrasi terlewat: {sorted(occupied - found)[:10]}"
+    assert all(record['registration_number'].startswith("20206224-31-2-") for record in data), \
+        "Prefix registrasi tidak dipakai"
+    assert scraper.stats['probes'] <= 1000, f"Terlalu banyak probe: {scraper.stats['probes']}"
+
+    print(f"✅ {len(found)} registrasi ditemukan dengan {scraper.stats['probes']} probe "
+          f"(dari ruang 100000 nomor)")
+
+def test_journal_resume():
+    """Test bahwa run yang terputus bisa dilanjutkan dari jurnal tanpa probe ulang"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING PROBE JOURNAL RESUME")
+    print("="*80)
+
+    interrupt_at = {250}
+
+    def fake_fetch_registration_data(registration_number):
+        number = int(registration_number.split('-')[-1])
+        if number in interrupt_at:
+            raise KeyboardInterrupt
+        if number % 2 != 0:
+            return None
+        return {'registration_number': registration_number, 'name': f"Siswa {number}",
+                'distance_1': 1000 - number}
+
+    output_file = os.path.join(tempfile.mkdtemp(), 'hasil_valid.csv')
+    scraper = RegistrationScraper("http://localhost/api/public/registration", output_file)
+    scraper.fetch_registration_data = fake_fetch_registration_data
+
+    # Run pertama terputus di nomor 250, setelah batch 0-99 dan 100-199 dijurnal
+    try:
+        scraper.scrape_all_registrations(start=0, end=399)
+    except KeyboardInterrupt:
+        pass
+    else:
+        raise AssertionError("Run pertama seharusnya terputus")
+
+    assert not os.path.exists(output_file), "CSV seharusnya belum dibuat sebelum run selesai"
+
+    interrupt_at.clear()
+    data = scraper.scrape_all_registrations(start=0, end=399, resume=True)
+
+    assert scraper.stats['probes'] == 200, \
+        f"Resume seharusnya hanya probe 200 nomor, didapat {scraper.stats['probes']}"
+    assert len(data) == 200 and len(scraper.build_csv_from_journal()) == 200, \
+        f"Jumlah records salah setelah resume: {len(data)}"
+    # Hit rate hanya menghitung probe run ini, bukan records dari jurnal
+    assert scraper.stats['hits'] == 100 and scraper.stats['hit_rate'] == 50.0, \
+        f"Hit rate resume salah: {scraper.stats}"
+
+    print(f"✅ Resume dari jurnal: {scraper.stats['probes']} probe baru, {len(data)} records")
+
+def test_failed_probes_not_journaled():
+    """Test nomor yang gagal di-probe (403/timeout) tidak dijurnal sebagai miss dan di-probe ulang saat resume"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING FAILED PROBES")
+    print("="*80)
+
+    failing = {10, 11, 150}
+
+    def fake_fetch_registration_data(registration_number):
+        number = int(registration_number.split('-')[-1])
+        if number in failing:
+            return PROBE_FAILED
+        if number % 2 != 0:
+            return None
+        return {'registration_number': registration_number, 'name': f"Siswa {number}",
+                'distance_1': number}
+
+    output_file = os.path.join(tempfile.mkdtemp(), 'hasil_valid.csv')
+    scraper = RegistrationScraper("http://localhost/api/public/registration", output_file, max_workers=4)
+    scraper.fetch_registration_data = fake_fetch_registration_data
+    first = scraper.scrape_all_registrations(start=0, end=199)
+
+    journaled = scraper.journal.load()
+    assert not any(scraper.format_registration_number(n) in journaled for n in failing) and \
+        len(journaled) == 197, \
+        "Nomor yang gagal seharusnya tidak masuk jurnal"
+    assert scraper.stats['failed'] == 3 and len(first) == 98, f"Statistik gagal salah: {scraper.stats}"
+
+    failing.clear()
+    data = scraper.scrape_all_registrations(start=0, end=199, resume=True)
+    assert scraper.stats['probes'] == 3 and scraper.stats['failed'] == 0 and len(data) == 100, \
+        f"Resume seharusnya hanya probe ulang 3 nomor yang gagal: {scraper.stats}"
+    assert scraper.stats['hits'] == 2, f"Hit resume seharusnya hanya nomor yang baru ditemukan: {scraper.stats}"
+
+    print(f"✅ 3 nomor gagal tidak dijurnal dan di-probe ulang saat resume ({len(data)} records)")
+
+if __name__ == "__main__":
+    test_concurrent_page_order()
+    test_concurrent_failed_page()
+    test_concurrent_registration_prober()
+    test_adaptive_registration_search()
+    test_journal_resume()
+    test_failed_probes_not_journaled()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Concurrent page order: ✅ PASS")
+    print("Concurrent failed page: ✅ PASS")
+    print("Concurrent registration prober: ✅ PASS")
+    print("Adaptive registration search: ✅ PASS")
+    print("Probe journal resume: ✅ PASS")
+    print("Failed probes: ✅ PASS")
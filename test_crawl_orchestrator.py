@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test crawl orchestrator (crawl_orchestrator.py): work queue, worker processes, retry, budget, resume
+"""
+
+import sys
+import os
+import csv
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crawl_orchestrator import CrawlQueue, OPTION_ORDERING, crawl, run_worker
+from mock_spmb_server import MockSPMBServer, SyntheticDataset
+
+def read_numbers(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [row['registration_number'] for row in csv.DictReader(f)]
+
+def test_province_crawl():
+    """Test banyak sekolah x option_type di-crawl oleh beberapa proses worker dan bisa dilanjutkan"""
+
+    print("="*80)
+    print("🧪 TESTING PROVINCE-WIDE CRAWL")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=300, extra_schools=30, seed=11)
+    npsns = list(dataset.schools)
+    option_types = ['zonasi', 'ketm', 'prestasi-rapor']
+
+    with tempfile.TemporaryDirectory() as tmp, MockSPMBServer(dataset, latency=0.005) as server:
+        queue_path = os.path.join(tmp, 'queue.sqlite')
+        report = crawl(npsns, option_types, queue_path, workers=3, poll_interval=0.2,
+                       base_url=server.registration_url, output_dir=os.path.join(tmp, 'out'),
+                       requests_per_second=100, limit_per_page=50)
+
+        assert report['counts']['done'] == len(npsns) * len(option_types) and not report['failed_jobs'], \
+            f"Tidak semua job selesai: {report['counts']}, {report['failed_jobs'][:2]}"
+
+        queue = CrawlQueue(queue_path)
+        jobs = queue.jobs()
+        queue.close()
+        workers = {job['worker'] for job in jobs}
+        for job in jobs:
+            orderby, order = OPTION_ORDERING[job['option_type']]
+            expected = dataset.query(job['npsn'], option_type=job['option_type'], orderby=orderby, order=order)
+            assert read_numbers(job['output']) == [record['registration_number'] for record in expected], \
+                f"Hasil salah untuk {job['npsn']}/{job['option_type']}"
+
+        assert len(workers) >= 2, f"Job tidak dibagi ke beberapa worker: {workers}"
+
+        rerun = crawl(npsns, option_types, queue_path, workers=1, poll_interval=0.2)
+        assert rerun['requests'] == report['requests'], \
+            "Crawl ulang seharusnya tidak mengulang job yang sudah selesai"
+
+    print(f"✅ {len(jobs)} job, {report['records']:,} records, {report['requests']} requests, "
+          f"{len(workers)} worker, {report['seconds']}s")
+
+def test_resume_and_budget():
+    """Test budget request dihormati, job gagal di-retry, job dari worker yang crash diambil ulang"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING RESUME, BUDGET AND RETRY")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=200, seed=12)
+    with tempfile.TemporaryDirectory() as tmp, MockSPMBServer(dataset) as server:
+        queue_path = os.path.join(tmp, 'queue.sqlite')
+        queue = CrawlQueue(queue_path)
+        queue.set_config({'base_url': server.registration_url, 'output_dir': os.path.join(tmp, 'out'),
+                          'requests_per_second': 0, 'limit_per_page': 50,
+                          'max_requests': 3})
+        queue.enqueue(['20227910', '20206224'], ['zonasi', 'prestasi-rapor'])
+
+        # A worker that crashed while holding a job
+        crashed = queue.claim('crashed-worker', lease=1.5)
+
+        first = run_worker(queue_path, 'worker-a')
+        assert first['budget_exhausted'] and queue.requests_used() == 3 and queue.counts()['done'] == 2, \
+            f"Budget 3 request tidak dihormati: {first}, {queue.counts()}"
+
+        # Every request now gets 403: jobs are retried, then given up on
+        server.forbidden_rate = 1.0
+        queue.set_config(dict(queue.config(), max_requests=None, max_attempts=2, retry_delay=0.05))
+        time.sleep(max(crashed['lease_until'] - time.time(), 0) + 0.1)
+        second = run_worker(queue_path, 'worker-b')
+        assert second['failed'] == 2 and queue.counts()['failed'] == 2, \
+            f"Job gagal seharusnya di-retry lalu failed: {second}, {queue.counts()}"
+
+        server.forbidden_rate = 0.0
+        queue.retry_failed()
+        third = run_worker(queue_path, 'worker-c')
+        jobs = {job['id']: job for job in queue.jobs()}
+        assert queue.counts()['done'] == 4 and jobs[crashed['id']]['worker'] == 'worker-c', \
+            f"Crawl tidak lanjut setelah crash: {third}, {queue.counts()}"
+        queue.close()
+
+    print(f"✅ Budget berhenti di 3 request, {second['retried']} retry sebelum failed, "
+          f"job crash diselesaikan worker-c")
+
+def test_stale_worker_ignored():
+    """Test hasil worker yang lease-nya sudah diambil worker lain diabaikan"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING STALE LEASE")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = CrawlQueue(os.path.join(tmp, 'queue.sqlite'))
+        queue.enqueue(['20227910'], ['zonasi'])
+        stale = queue.claim('stale-worker', lease=0.05)
+        time.sleep(0.1)
+        fresh = queue.claim('fresh-worker', lease=60)
+        assert fresh is not None and fresh['id'] == stale['id'], \
+            "Lease yang kedaluwarsa seharusnya bisa diambil worker lain"
+
+        assert not queue.complete(stale['id'], 'stale-worker', 1, 'stale.csv') and \
+            queue.fail(stale['id'], 'stale-worker', 'timeout', 4, 5.0) is None and \
+            not queue.release(stale['id'], 'stale-worker'), \
+            "Worker lama seharusnya tidak bisa mengubah job"
+        job = queue.jobs()[0]
+        assert (job['status'], job['worker'], job['attempts'], job['output']) == \
+            ('running', 'fresh-worker', 2, None), \
+            f"Job berubah oleh worker lama: {job}"
+
+        assert queue.complete(fresh['id'], 'fresh-worker', 10, 'fresh.csv') and \
+            queue.jobs()[0]['output'] == 'fresh.csv', \
+            "Worker pemegang lease seharusnya bisa menyelesaikan job"
+        queue.close()
+
+    print("✅ complete/fail/release dari worker lama diabaikan, job tetap milik fresh-worker")
+
+if __name__ == "__main__":
+    test_province_crawl()
+    test_resume_and_budget()
+    test_stale_worker_ignored()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Province-wide crawl: ✅ PASS")
+    print("Resume, budget and retry: ✅ PASS")
+    print("Stale lease: ✅ PASS")
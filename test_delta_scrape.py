@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test delta scraping (delta_scrape.py): file hanya ditulis ulang jika ada halaman yang berubah
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from crawl_orchestrator import crawl
+from delta_scrape import load_manifest, scrape_delta
+from mock_spmb_server import MockSPMBServer, SyntheticDataset
+from spmb_client import SPMBClient
+from test_concurrent_scraping import MockProgress, MockStatus
+
+def read_rows(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [(row['registration_number'], float(row['distance_1'])) for row in csv.DictReader(f)]
+
+def expected_rows(dataset, npsn):
+    return [(record['registration_number'], record['distance_1'])
+            for record in dataset.query(npsn, option_type='zonasi', orderby='distance_1', order='asc')]
+
+def test_delta_refresh():
+    """Test refresh tanpa perubahan tidak menulis ulang file, dan setiap perubahan (termasuk yang saling
+    meniadakan) hasilnya sama dengan scrape penuh"""
+
+    print("="*80)
+    print("🧪 TESTING DELTA REFRESH")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=2000, seed=21)
+    with tempfile.TemporaryDirectory() as tmp, MockSPMBServer(dataset) as server:
+        path = os.path.join(tmp, 'hasil_20227910_zonasi.csv')
+        client = SPMBClient(server.registration_url, requests_per_second=0, use_cache=False)
+
+        def refresh(full=False):
+            return scrape_delta(client, path, MockProgress(), MockStatus(), 50, '20227910', 'zonasi',
+                                'distance_1', 'asc', full=full)
+
+        first = refresh()
+        assert first['mode'] == 'full' and read_rows(path) == expected_rows(dataset, '20227910'), \
+            f"Scrape pertama salah: {first}"
+        total_pages = first['total_pages']
+
+        written = os.stat(path).st_mtime_ns
+        same = refresh()
+        assert same['mode'] == 'unchanged' and os.stat(path).st_mtime_ns == written, \
+            f"Tanpa perubahan file seharusnya tidak ditulis ulang: {same}"
+
+        # Withdraw rank 101 and insert a student at about rank 300: the count and the
+        # last pages stay the same, only pages 3-6 change
+        ranked = dataset.query('20227910', option_type='zonasi', orderby='distance_1', order='asc')
+        added = dataset.add_registrations('20227910', 20, seed=5)
+        inserted = next(record for record in added if record['option_type'] == 'zonasi')
+        inserted['distance_1'] = round((ranked[299]['distance_1'] + ranked[300]['distance_1']) / 2, 2)
+        dataset.withdraw([ranked[100]['registration_number']] +
+                         [record['registration_number'] for record in added if record is not inserted])
+        cancelled = refresh()
+        assert cancelled['mode'] == 'delta' and \
+            cancelled['first_changed'] == 3 and \
+            cancelled['records'] == first['records'] and \
+            read_rows(path) == expected_rows(dataset, '20227910'), \
+            f"Withdraw + pendaftar baru tidak terdeteksi: {cancelled}"
+
+        # A corrected distance changes neither the count nor the order
+        ranked = dataset.query('20227910', option_type='zonasi', orderby='distance_1', order='asc')
+        row = len(ranked) - 60
+        ranked[row]['distance_1'] = round((ranked[row]['distance_1'] + ranked[row + 1]['distance_1']) / 2, 2)
+        corrected = refresh()
+        assert corrected['mode'] == 'delta' and \
+            corrected['first_changed'] == row // 50 + 1 and \
+            read_rows(path) == expected_rows(dataset, '20227910'), \
+            f"Koreksi jarak tidak terdeteksi: {corrected}"
+
+        dataset.add_registrations('20227910', 30, seed=1)
+        grown = refresh()
+        assert grown['mode'] == 'delta' and read_rows(path) == expected_rows(dataset, '20227910'), \
+            f"Delta setelah pendaftar baru salah: {grown}"
+
+        manifest = load_manifest(path)
+        full = refresh(full=True)
+        assert load_manifest(path) == manifest and full['pages_fetched'] == full['total_pages'], \
+            "Manifest delta berbeda dengan scrape penuh"
+
+    print(f"✅ {total_pages} halaman: tanpa perubahan tidak ditulis ulang, withdraw + pendaftar baru "
+          f"mulai halaman {cancelled['first_changed']}, koreksi jarak halaman {corrected['first_changed']}")
+
+def test_crawl_refresh():
+    """Test crawl --refresh memakai delta dan hanya menulis ulang hasil yang berubah"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING CRAWL REFRESH")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=1000, extra_schools=5, seed=22)
+    npsns = [npsn for npsn in dataset.schools if npsn != '20206224']
+    with tempfile.TemporaryDirectory() as tmp, MockSPMBServer(dataset) as server:
+        queue_path = os.path.join(tmp, 'queue.sqlite')
+        options = dict(workers=2, poll_interval=0.2, base_url=server.registration_url,
+                       output_dir=os.path.join(tmp, 'out'), requests_per_second=0, limit_per_page=20)
+        crawl(npsns, ['zonasi'], queue_path, **options)
+        paths = [os.path.join(tmp, 'out', f"hasil_{npsn}_zonasi.csv") for npsn in npsns]
+        written = [os.stat(path).st_mtime_ns for path in paths]
+        dataset.add_registrations(npsns[0], 3, seed=2)
+        second = crawl(npsns, ['zonasi'], queue_path, refresh=True, **options)
+
+        assert second['counts']['done'] == len(npsns) and read_rows(paths[0]) == expected_rows(dataset, npsns[0]), \
+            f"Hasil refresh salah: {second['counts']}"
+        rewritten = [path for path, mtime in zip(paths[1:], written[1:]) if os.stat(path).st_mtime_ns != mtime]
+        assert not rewritten, f"Hasil yang tidak berubah ikut ditulis ulang: {rewritten}"
+
+    print(f"✅ Refresh {len(npsns)} sekolah: hanya {npsns[0]} yang ditulis ulang")
+
+if __name__ == "__main__":
+    test_delta_refresh()
+    test_crawl_refresh()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Delta refresh: ✅ PASS")
+    print("Crawl refresh: ✅ PASS")
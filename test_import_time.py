@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test modul inti bisa di-import cepat tanpa streamlit/pandas (untuk CLI dan worker)
+"""
+
+import sys
+import os
+import subprocess
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CORE_MODULES = ['spmb_client', 'response_cache', 'snapshot_store', 'rate_limiter', 'single_flight',
+                'scrape_jobs', 'registration_index', 'lookup_position']
+HEAVY_MODULES = ['streamlit', 'plotly', 'pandas', 'requests', 'pyarrow']
+
+def import_in_subprocess(module):
+    """Import satu modul di interpreter baru; kembalikan (detik, modul berat yang ikut ter-import)"""
+    code = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(elapsed, ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=PACKAGE_DIR, capture_output=True,
+                            text=True, check=True).stdout.split()
+    return float(output[0]), output[1].split(',') if len(output) > 1 else []
+
+def test_core_imports_are_light():
+    """Test modul inti tidak menarik streamlit, plotly, pandas, requests atau pyarrow"""
+
+    print("="*80)
+    print("🧪 TESTING CORE IMPORT TIME")
+    print("="*80)
+
+    too_heavy = []
+    for module in CORE_MODULES:
+        elapsed, heavy = import_in_subprocess(module)
+        print(f"   {module:<20} {elapsed * 1000:6.1f} ms {heavy or ''}")
+        if heavy or elapsed > 0.1:
+            too_heavy.append(module)
+    assert not too_heavy, f"Modul inti terlalu berat: {too_heavy}"
+
+    print("✅ Semua modul inti ringan")
+
+def test_cli_does_not_import_streamlit():
+    """Test script CLI scraping tidak lagi bergantung pada streamlit"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING CLI WITHOUT STREAMLIT")
+    print("="*80)
+
+    elapsed, heavy = import_in_subprocess('scrape_smkn4_multiple_jurusan')
+    assert 'streamlit' not in heavy and 'plotly' not in heavy, f"CLI masih meng-import {heavy}"
+
+    print(f"✅ CLI siap dalam {elapsed * 1000:.0f} ms tanpa streamlit")
+
+if __name__ == "__main__":
+    test_core_imports_are_light()
+    test_cli_does_not_import_streamlit()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Core import time: ✅ PASS")
+    print("CLI without streamlit: ✅ PASS")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test local JSON lookup service (offline, server di port acak)
+"""
+
+import json
+import sys
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from lookup_service import LookupService, create_server
+from snapshot_store import write_snapshot
+from test_registration_index import write_zonasi_csv
+
+def get_json(base_url, path):
+    try:
+        with urllib.request.urlopen(base_url + path, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def write_prestasi_csv(path):
+    rows = [{'registration_number': f"20206224-31-2-{i:05d}", 'name': f"Siswa {i}",
+             'school_name': 'SMP NEGERI 1', 'created_at': '2025-06-10',
+             'first_option_name': f"SMKN 4 PADALARANG - {'PEMASARAN' if i % 2 else 'TEKNIK ELEKTRONIKA'} - PRESTASI NILAI RAPOR",
+             'score': 50 + (i * 37) % 50}
+            for i in range(300)]
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+def test_lookup_service():
+    """Test endpoint /position, /neighbors, /top dan hot-swap snapshot"""
+
+    print("="*80)
+    print("🧪 TESTING LOOKUP SERVICE")
+    print("="*80)
+
+    server = None
+    try:
+        tmp_dir = tempfile.mkdtemp()
+        zonasi_file = os.path.join(tmp_dir, 'hasil_zonasi_only.csv')
+        prestasi_file = os.path.join(tmp_dir, 'hasil_all_prestasi_rapor.csv')
+        write_zonasi_csv(zonasi_file, 500)
+        write_prestasi_csv(prestasi_file)
+
+        service = LookupService(zonasi_file, prestasi_file, reload_interval=0.05)
+        service.start_watcher()
+        server = create_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        status, position = get_json(base_url, "/position/20227910-16-1-00200?quota=250")
+        assert status == 200 and position['position'] == 201 and position['in_quota'], \
+            f"/position salah: {status} {position}"
+
+        status, neighbors = get_json(base_url, "/neighbors/20227910-16-1-00200?k=3")
+        assert status == 200 and [row['position'] for row in neighbors['window']] == list(range(198, 205)), \
+            f"/neighbors salah: {status} {neighbors}"
+
+        status, top = get_json(base_url, "/top?jurusan=PEMASARAN&n=10")
+        scores = [row['score'] for row in top.get('data', [])]
+        assert status == 200 and len(scores) == 10 and scores == sorted(scores, reverse=True), \
+            f"/top salah: {status} {top}"
+
+        status, _ = get_json(base_url, "/position/20227910-16-1-99999")
+        assert status == 404, "Nomor yang tidak ada seharusnya 404"
+
+        for path in ("/neighbors/20227910-16-1-00200?k=-1", "/top?jurusan=PEMASARAN&n=-3"):
+            status, error = get_json(base_url, path)
+            assert status == 400, f"Nilai negatif seharusnya 400: {path} -> {status} {error}"
+
+        # Snapshot baru ditulis -> service pindah ke generasi baru
+        time.sleep(0.05)
+        write_zonasi_csv(zonasi_file, 100)
+        write_snapshot(pd.read_csv(zonasi_file), zonasi_file)
+        deadline = time.time() + 5
+        while time.time() < deadline and service.state.generation == 1:
+            time.sleep(0.05)
+
+        status, position = get_json(base_url, "/position/20227910-16-1-00050")
+        assert status == 200 and position['total_zonasi'] == 100, f"Hot-swap snapshot gagal: {status} {position}"
+
+        print(f"✅ Semua endpoint benar, hot-swap ke generasi {service.state.generation}")
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    test_lookup_service()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Lookup service: ✅ PASS")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test mock SPMB API server (mock_spmb_server.py) dengan scraper asli (offline)
+"""
+
+import sys
+import os
+import time
+
+import requests
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_spmb_server import MockSPMBServer, SyntheticDataset
+from run import PROBE_FAILED, RegistrationScraper
+from spmb_client import SPMBClient
+from test_concurrent_scraping import MockProgress, MockStatus
+
+def test_scrapers_against_mock():
+    """Test SPMBClient dan RegistrationScraper membaca data sintetis dengan benar"""
+
+    print("="*80)
+    print("🧪 TESTING SCRAPERS AGAINST MOCK API")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=2000, seed=3)
+    with MockSPMBServer(dataset, latency=0.002) as server:
+        scraper = SPMBClient(server.registration_url, max_workers=4, requests_per_second=0,
+                             use_cache=False)
+        expected = dataset.query('20206224', option_type='prestasi-rapor', orderby='score', order='desc')
+        results = {}
+        for concurrent in (True, False):
+            results[concurrent] = scraper.scrape_all_pages(MockProgress(), MockStatus(), limit_per_page=100,
+                                                           npsn='20206224', option_type='prestasi-rapor',
+                                                           orderby='score', order='desc',
+                                                           concurrent=concurrent)
+        assert results[True] == expected and results[False] == expected and len(expected) == 2000, \
+            f"Hasil scrape salah: {len(results[True])}, {len(results[False])}"
+
+        school = requests.get(f"{server.base_url}/school/20206224",
+                              params={'populate': 'options'}, timeout=5).json()['result']
+        major = school['options'][2]
+        page = scraper.fetch_page(1, 50, '20206224', 'prestasi-rapor', 'score', 'desc', major_id=major['id'])
+        items = page['result']['itemsList']
+        assert items and all(item['first_option_name'] == major['name'] for item in items), \
+            "Filter major_id salah"
+
+        zonasi = scraper.fetch_page(1, 100, '20227910', 'zonasi', 'distance_1', 'asc')['result']['itemsList']
+        distances = [item['distance_1'] for item in zonasi]
+        assert distances == sorted(distances) and all(item['option_type'] == 'zonasi' for item in zonasi), \
+            "Filter option_type/urutan distance_1 salah"
+
+        prober = RegistrationScraper(server.registration_url, use_cache=False)
+        hit = prober.fetch_registration_data(zonasi[0]['registration_number'])
+        miss = prober.fetch_registration_data("20227910-16-1-99999")
+        assert hit == zonasi[0] and miss is None, "Endpoint /registration/<number> salah"
+
+    print(f"✅ {len(expected)} records, {len(school['options'])} jurusan, lookup hit/miss benar")
+
+def test_latency_and_faults():
+    """Test latency, 403 dan error 500 bisa diatur dan deterministik untuk seed yang sama"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING MOCK LATENCY AND FAULTS")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=500)
+    runs = []
+    for _ in range(2):
+        with MockSPMBServer(dataset, forbidden_rate=0.2, error_rate=0.1, seed=7) as server:
+            statuses = []
+            for page in range(1, 201):
+                response = requests.get(server.registration_url,
+                                        params={'npsn': '20227910', 'page': page % 5 + 1, 'limit': 100},
+                                        timeout=5)
+                statuses.append(response.status_code)
+            runs.append(statuses)
+            stats = server.stats()
+
+    assert runs[0] == runs[1], "Fault injection tidak deterministik"
+    assert 20 <= stats['forbidden'] <= 60 and 5 <= stats['errors'] <= 40 and stats['requests'] == 200, \
+        f"Rate fault salah: {stats}"
+
+    with MockSPMBServer(dataset, forbidden_rate=1.0) as server:
+        errors = []
+        scraper = SPMBClient(server.registration_url, requests_per_second=0, use_cache=False,
+                             on_error=errors.append)
+        assert scraper.fetch_page(1, 10, '20227910') is None and '403' in errors[0], \
+            "403 seharusnya dilaporkan lewat on_error"
+        prober = RegistrationScraper(server.registration_url, use_cache=False, max_retries=0)
+        assert prober.fetch_registration_data("20227910-16-1-00001") is PROBE_FAILED, \
+            "403 seharusnya PROBE_FAILED, bukan 'tidak ditemukan'"
+
+    with MockSPMBServer(dataset, latency=0.05, jitter=0.02) as server:
+        started = time.perf_counter()
+        requests.get(f"{server.base_url}/school/20227910", timeout=5)
+        elapsed = time.perf_counter() - started
+    assert 0.03 <= elapsed < 0.5, f"Latency salah: {elapsed:.3f}s"
+
+    print(f"✅ Fault deterministik: {stats}, latency {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    test_scrapers_against_mock()
+    test_latency_and_faults()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Scrapers against mock API: ✅ PASS")
+    print("Mock latency and faults: ✅ PASS")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test neighbor query engine di show_neighbors.py (offline)
+"""
+
+import csv
+import sys
+import os
+import tempfile
+import time
+
+import numpy as np
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from show_neighbors import get_engine, show_neighbors_batch, show_student_neighbors
+from test_registration_index import write_zonasi_csv
+
+def test_neighbor_window():
+    """Test window ±k, distance gaps, dan gap ke batas kuota dibanding scan manual"""
+
+    print("="*80)
+    print("🧪 TESTING NEIGHBOR WINDOW")
+    print("="*80)
+
+    csv_file = os.path.join(tempfile.mkdtemp(), 'hasil_zonasi_only.csv')
+    write_zonasi_csv(csv_file, 2000)
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    distances = [float(row['distance_1']) for row in rows]
+
+    engine = get_engine(csv_file)
+    result = engine.query("20227910-16-1-00003", k=5, quota=139)
+
+    expected_window = [row['registration_number'] for row in rows[0:9]]
+    assert list(result['window']['registration_number']) == expected_window, "Window di awal ranking salah"
+    assert np.allclose(result['gaps'], np.diff(distances[0:9])), "Distance gaps salah"
+    assert result['distance_to_cutoff'] == distances[3] - distances[138] and result['in_quota'], \
+        "Gap ke batas kuota salah"
+
+    last = engine.query("20227910-16-1-01999", k=5, quota=139)
+    assert last['position'] == 2000 and np.isnan(last['gap_below']) and len(last['distances']) == 6, \
+        "Window di akhir ranking salah"
+
+    assert engine.query("20227910-16-1-99999") is None, "Nomor yang tidak ada seharusnya None"
+
+    show_student_neighbors("20227910-16-1-00150", csv_file=csv_file, neighbors=3)
+    show_neighbors_batch(["20227910-16-1-00150", "20227910-16-1-99999"], csv_file=csv_file)
+
+    print("✅ Window, gaps dan gap kuota sesuai dengan scan manual")
+
+def test_wide_window_speed():
+    """Test bahwa window lebar (k=500) untuk banyak target tetap cepat"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING WIDE WINDOW SPEED")
+    print("="*80)
+
+    csv_file = os.path.join(tempfile.mkdtemp(), 'hasil_zonasi_only.csv')
+    write_zonasi_csv(csv_file, 50000)
+    engine = get_engine(csv_file)
+
+    targets = [f"20227910-16-1-{i:05d}" for i in range(0, 50000, 50)]
+    started = time.perf_counter()
+    results = engine.query_batch(targets, k=500, quota=139)
+    per_query_ms = (time.perf_counter() - started) / len(targets) * 1000
+
+    assert all(result is not None for result in results), "Ada target yang tidak ditemukan"
+    assert per_query_ms < 1.0, f"Terlalu lambat: {per_query_ms:.4f} ms per query"
+
+    print(f"✅ {len(targets)} query k=500: {per_query_ms:.4f} ms per query")
+
+if __name__ == "__main__":
+    test_neighbor_window()
+    test_wide_window_speed()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Neighbor window: ✅ PASS")
+    print("Wide window speed: ✅ PASS")
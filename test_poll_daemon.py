@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test polling daemon (poll_daemon.py) dan snapshot history (snapshot_history.py)
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_spmb_server import MockSPMBServer, SyntheticDataset
+from poll_daemon import PollDaemon, expand_targets, poll_interval
+from snapshot_history import SnapshotHistory
+from spmb_client import SPMBClient
+
+def test_snapshot_history():
+    """Test snapshot immutable per perubahan, pointer latest, dan baca data pada titik waktu tertentu"""
+
+    print("="*80)
+    print("🧪 TESTING SNAPSHOT HISTORY")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=1000, seed=31)
+    with tempfile.TemporaryDirectory() as tmp, MockSPMBServer(dataset) as server:
+        history = SnapshotHistory(os.path.join(tmp, 'history'))
+        client = SPMBClient(server.registration_url, requests_per_second=0, use_cache=False)
+        config = {'schools': [{'npsn': '20227910', 'option_types': ['zonasi'], 'limit_per_page': 50}]}
+        daemon = PollDaemon(config, history, client)
+        target = daemon.targets[0]
+
+        t0 = datetime(2025, 6, 10, 8, 0, tzinfo=timezone.utc)
+        first = daemon.poll(target, t0)
+        same = daemon.poll(target, t0 + timedelta(hours=1))
+        dataset.add_registrations('20227910', 20, seed=3)
+        changed = daemon.poll(target, t0 + timedelta(hours=2))
+
+        snapshots = history.snapshots('20227910_zonasi')
+        assert first['snapshot'] and not same['snapshot'] and changed['snapshot'] and len(snapshots) == 2, \
+            f"Snapshot seharusnya hanya dibuat saat data berubah: {[s for _, s in snapshots]}"
+
+        pointer = history.latest('20227910_zonasi')
+        assert pointer['snapshot'] == os.path.basename(changed['snapshot']) and \
+            pointer['checked_at'] == pointer['taken_at'], \
+            f"Pointer latest salah: {pointer}"
+
+        before = history.read('20227910_zonasi', t0 + timedelta(minutes=90), columns=['registration_number'])
+        latest = history.read('20227910_zonasi')
+        assert len(before) == first['records'] and \
+            len(latest) == changed['records'] and \
+            len(latest) > len(before), \
+            f"Baca titik waktu salah: {len(before)}, {len(latest)}"
+        assert history.read('20227910_zonasi', t0 - timedelta(days=1)) is None, \
+            "Sebelum snapshot pertama seharusnya None"
+
+        assert not any(os.stat(path).st_mode & 0o222 for _, path in snapshots), "Snapshot seharusnya read-only"
+        try:
+            history.record('20227910_zonasi', before, taken_at=t0)
+        except FileExistsError:
+            pass
+        else:
+            raise AssertionError("Snapshot lama tertimpa")
+
+    print(f"✅ 3 poll -> 2 snapshot ({', '.join(os.path.basename(path) for _, path in snapshots)})")
+
+def test_schedule_tightens():
+    """Test interval poll makin rapat menjelang deadline dan poll terakhir tepat saat deadline"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING POLL SCHEDULE")
+    print("="*80)
+
+    config = {'interval': 3600, 'min_interval': 300, 'schools': [
+        {'npsn': '20227910', 'option_types': ['zonasi', 'ketm'], 'deadline': '2025-06-14T15:00:00+07:00'},
+        {'npsn': '20206224', 'option_types': ['prestasi-rapor'], 'interval': 1800},
+    ]}
+    targets = expand_targets(config)
+    deadline = targets[0]['deadline']
+    intervals = [poll_interval(targets[0], deadline - timedelta(hours=hours)) for hours in (48, 2, 0.5)]
+    assert intervals == [3600, 720, 300] and poll_interval(targets[0], deadline + timedelta(hours=1)) == 3600, \
+        f"Interval salah: {intervals}"
+    assert len(targets) == 3 and targets[2]['interval'] == 1800 and targets[2]['deadline'] is None, \
+        "Setting per sekolah salah"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = SnapshotHistory(tmp)
+        history.record(targets[0]['series'], pd.DataFrame({'registration_number': ['a']}),
+                       taken_at=deadline - timedelta(minutes=4))
+        daemon = PollDaemon(config, history, client=object())
+        assert daemon.next_due(targets[0]) == deadline, \
+            f"Poll terakhir seharusnya tepat di deadline: {daemon.next_due(targets[0])}"
+
+    print(f"✅ Interval 48j/2j/30m sebelum deadline: {intervals} detik")
+
+def test_daemon_run():
+    """Test loop daemon mem-poll semua target sesuai jadwal dan bisa dihentikan"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING DAEMON LOOP")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=300, seed=32)
+    with tempfile.TemporaryDirectory() as tmp, MockSPMBServer(dataset) as server:
+        client = SPMBClient(server.registration_url, requests_per_second=0, use_cache=False)
+        config = {'interval': 0.2, 'min_interval': 0.1, 'history': os.path.join(tmp, 'history'),
+                  'schools': [{'npsn': '20227910', 'option_types': ['zonasi', 'ketm'],
+                               'outputs': {'zonasi': os.path.join(tmp, 'hasil_zonasi_only.csv')}}]}
+        daemon = PollDaemon(config, client=client)
+        polls = daemon.run(max_polls=6)
+
+        series = daemon.history.list_series()
+        pointers = [daemon.history.latest(name) for name in series]
+        assert polls == 6 and series == ['20227910_ketm', '20227910_zonasi'], f"Poll salah: {polls}, {series}"
+        assert all(len(daemon.history.snapshots(name)) == 1 for name in series) and \
+            all(pointer['checked_at'] > pointer['taken_at'] for pointer in pointers), \
+            "Data tidak berubah seharusnya hanya 1 snapshot per series"
+        assert os.path.exists(os.path.join(tmp, 'hasil_zonasi_only.csv')), \
+            "Output hasil_zonasi_only.csv tidak diperbarui"
+
+        daemon.stop()
+        assert daemon.run() == 0, "Daemon seharusnya berhenti setelah stop()"
+
+    print(f"✅ {polls} poll untuk {len(series)} series, 1 snapshot masing-masing")
+
+if __name__ == "__main__":
+    test_snapshot_history()
+    test_schedule_tightens()
+    test_daemon_run()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Snapshot history: ✅ PASS")
+    print("Poll schedule: ✅ PASS")
+    print("Daemon loop: ✅ PASS")
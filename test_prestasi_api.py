@@ -11,8 +11,11 @@ import json
 import pandas as pd
 from typing import Dict, List, Optional
 
+from response_cache import default_cache, fetch_json
+
 class PrestasiAPITester:
     def __init__(self):
+        self.cache = default_cache()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -27,9 +30,7 @@ class PrestasiAPITester:
         
         try:
             print(f"Fetching school options for NPSN: {npsn}")
-            response = self.session.get(school_url, timeout=15)
-            response.raise_for_status()
-            data = response.json()
+            data = fetch_json(self.session, school_url, timeout=15, cache=self.cache)
             
             if data.get('code') == 200:
                 print("✅ Successfully fetched school options")
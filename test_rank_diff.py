@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test rank diff (rank_diff.py): perubahan peringkat, pendaftar baru, withdraw dan batas kuota
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rank_diff import change_feed, diff_rankings, student_change
+
+def ranking(keys):
+    return pd.DataFrame({'registration_number': pd.Series(keys, dtype='str')})
+
+def registrations(count, path='1'):
+    return np.char.add(f'20227910-16-{path}-', np.char.zfill(np.arange(count).astype(str), 7))
+
+def test_small_diff():
+    """Test delta per siswa, pendaftar baru, withdraw dan siswa yang melewati batas kuota"""
+
+    print("="*80)
+    print("🧪 TESTING RANK DIFF")
+    print("="*80)
+
+    before = ranking(['a', 'b', 'c', 'd', 'e', 'f'])
+    after = ranking(['a', 'x', 'b', 'd', 'c', 'f', 'y'])
+    diff = diff_rankings(before, after, quota=3)
+    summary = diff['summary']
+
+    moved = dict(zip(diff['moved']['registration_number'], diff['moved']['delta']))
+    assert moved == {'b': -1, 'c': -2}, f"Delta salah: {moved}"
+    assert list(diff['new']['registration_number']) == ['x', 'y'] and list(diff['new']['rank_after']) == [2, 7], \
+        f"Pendaftar baru salah: {diff['new']}"
+    assert list(diff['withdrawn']['registration_number']) == ['e'] and \
+        list(diff['withdrawn']['rank_before']) == [5], \
+        f"Withdraw salah: {diff['withdrawn']}"
+    assert list(diff['crossed_out']['registration_number']) == ['c'] and len(diff['crossed_in']) == 0, \
+        f"Batas kuota salah: {diff['crossed_out']}"
+    assert (summary['unchanged'], summary['new_in_quota'], summary['withdrawn_in_quota']) == (3, 1, 0), \
+        f"Ringkasan salah: {summary}"
+
+    statuses = {key: student_change(diff, key)['status'] for key in ('a', 'c', 'e', 'x', 'zzz')}
+    assert statuses == {'a': 'unchanged', 'c': 'moved', 'e': 'withdrawn', 'x': 'new', 'zzz': 'not_found'}, \
+        f"Status siswa salah: {statuses}"
+    c = student_change(diff, 'c')
+    assert (c['rank_before'], c['rank_after'], c['in_quota_before'], c['in_quota_after']) == (3, 5, True, False), \
+        f"Perubahan siswa salah: {c}"
+
+    print(f"✅ {summary}")
+
+def test_compact_feed():
+    """Test satu pendaftar baru di atas menghasilkan feed pendek, bukan satu baris per siswa"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING CHANGE FEED")
+    print("="*80)
+
+    keys = list(registrations(10000))
+    after = keys[:10] + ['NEW'] + keys[10:5000] + keys[5001:]
+    diff = diff_rankings(ranking(keys), ranking(after), quota=139)
+    feed = change_feed(diff)
+
+    events = list(feed['event'])
+    assert sorted(events) == ['crossed_out', 'new', 'shift', 'withdrawn'], f"Feed tidak ringkas: {events}"
+    shifts = feed[feed['event'] == 'shift']
+    assert list(shifts['count']) == [4990] and \
+        list(shifts['delta']) == [-1] and \
+        list(shifts['rank_after']) == [12], \
+        f"Shift salah: {shifts}"
+    crossed = feed[feed['event'] == 'crossed_out']
+    assert list(crossed['registration_number']) == [keys[138]], f"Crossed salah: {crossed}"
+
+    unchanged = change_feed(diff_rankings(ranking(keys), ranking(keys), quota=139))
+    assert len(unchanged) == 0 and list(unchanged.columns) == list(feed.columns), \
+        f"Tanpa perubahan seharusnya feed kosong: {unchanged}"
+
+    print(f"✅ 1 pendaftar baru + 1 withdraw di antara 10.000 siswa -> {len(feed)} event")
+
+def test_million_rows():
+    """Test diff dua snapshot 1 juta baris selesai di bawah 1 detik"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING 1M-ROW DIFF")
+    print("="*80)
+
+    count = 1_000_000
+    keys = registrations(count)
+    rng = np.random.default_rng(24)
+    kept = np.delete(keys, rng.choice(count, 500, replace=False))
+    inserted = np.insert(kept, np.sort(rng.integers(0, len(kept), 1000)), registrations(1000, path='2'))
+    before, after = ranking(keys), ranking(inserted)
+
+    best = float('inf')
+    for _ in range(3):
+        started = time.perf_counter()
+        diff = diff_rankings(before, after, quota=139)
+        feed = change_feed(diff)
+        best = min(best, time.perf_counter() - started)
+
+    summary = diff['summary']
+    assert (summary['new'], summary['withdrawn'], summary['total_after']) == (1000, 500, count + 500), \
+        f"Ringkasan salah: {summary}"
+    assert best < 1.0, f"Terlalu lambat: {best:.2f}s"
+
+    print(f"✅ 1M vs {len(after):,} baris dalam {best * 1000:.0f} ms, {len(feed):,} event")
+
+if __name__ == "__main__":
+    test_small_diff()
+    test_compact_feed()
+    test_million_rows()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Rank diff: ✅ PASS")
+    print("Change feed: ✅ PASS")
+    print("1M-row diff: ✅ PASS")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test adaptive rate limiter (AIMD, backoff 403/429/5xx, budget lintas proses)
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_spmb_server import MockSPMBServer, SyntheticDataset
+from rate_limiter import AdaptiveRateLimiter
+from spmb_client import SPMBClient
+from test_concurrent_scraping import MockProgress, MockStatus
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def test_aimd_backoff():
+    """Test rate naik saat sehat, turun dan pause eksponensial saat 429/403, turun saat latency naik"""
+
+    print("="*80)
+    print("🧪 TESTING AIMD BACKOFF")
+    print("="*80)
+
+    limiter = AdaptiveRateLimiter(20, base_backoff=0.2, max_backoff=1.0)
+    start_rate = limiter.rate
+    for _ in range(200):
+        limiter.record(200, 0.01)
+    assert start_rate < limiter.rate <= 20, f"Rate tidak naik: {start_rate} -> {limiter.rate}"
+
+    before = limiter.rate
+    limiter.record(429, 0.01)
+    limiter.record(403, 0.01)  # in flight during the same backoff, ignored
+    assert abs(limiter.rate - before / 2) <= 1e-9 and limiter.stats()['backoffs'] == 1, \
+        f"Backoff pertama salah: {limiter.stats()}"
+
+    started = time.time()
+    limiter.acquire()
+    assert time.time() - started >= 0.15, "acquire tidak menunggu backoff"
+
+    limiter.record(None, 5.0)
+    assert 0.3 < limiter.stats()['blocked_for'] <= 0.4, \
+        f"Backoff kedua seharusnya dua kali lipat: {limiter.stats()}"
+
+    slow = AdaptiveRateLimiter(20)
+    for _ in range(50):
+        slow.record(200, 0.01)
+    steady_rate = slow.rate
+    for _ in range(10):
+        slow.record(200, 0.2)
+    assert slow.stats()['slowdowns'] >= 1 and slow.rate < steady_rate, \
+        f"Latency naik tidak memperlambat: {slow.stats()}"
+
+    assert AdaptiveRateLimiter(0).rate is None, "Rate 0 seharusnya mematikan limiter"
+
+    print(f"✅ AIMD: {start_rate} -> {before:.1f} rps, backoff 0.2s -> 0.4s, slowdown saat latency naik")
+
+def test_shared_budget_across_processes():
+    """Test dua proses dengan state file yang sama berbagi satu budget request"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING CROSS-PROCESS BUDGET")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'rate.json')
+        code = (
+            "import json, time\n"
+            "from rate_limiter import AdaptiveRateLimiter\n"
+            f"limiter = AdaptiveRateLimiter(20, initial_rate=20, state_file={state_file!r})\n"
+            "stamps = []\n"
+            "for _ in range(15):\n"
+            "    limiter.acquire()\n"
+            "    stamps.append(time.time())\n"
+            "print(json.dumps(stamps))\n"
+        )
+        workers = [subprocess.Popen([sys.executable, "-c", code], cwd=PACKAGE_DIR, stdout=subprocess.PIPE,
+                                    text=True) for _ in range(2)]
+        stamps = sorted(stamp for worker in workers for stamp in json.loads(worker.communicate()[0]))
+
+    span = stamps[-1] - stamps[0]
+    median_gap = sorted(b - a for a, b in zip(stamps, stamps[1:]))[len(stamps) // 2]
+    # 30 requests at 20 rps take ~1.45s together; independent limiters would need only ~0.7s
+    assert span >= 1.3 and median_gap >= 0.04, \
+        f"Budget tidak dibagi: span {span:.2f}s, median gap {median_gap * 1000:.0f} ms"
+
+    print(f"✅ 2 proses x 15 request dalam {span:.2f}s (budget 20 rps bersama)")
+
+def test_scrape_recovers_from_faults():
+    """Test scrape concurrent tetap lengkap walau API mengembalikan 403/500 acak"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING SCRAPE UNDER 403/500")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=2000, seed=5)
+    with MockSPMBServer(dataset, forbidden_rate=0.2, error_rate=0.1, seed=5) as server:
+        errors = []
+        scraper = SPMBClient(server.registration_url, max_workers=4, use_cache=False,
+                             on_error=errors.append, max_retries=5)
+        scraper.rate_limiter = AdaptiveRateLimiter(50, base_backoff=0.05, max_backoff=0.5)
+        records = scraper.scrape_all_pages(MockProgress(), MockStatus(), limit_per_page=100, npsn='20206224',
+                                           option_type='prestasi-rapor', orderby='score', order='desc',
+                                           concurrent=True)
+        faults = server.stats()
+
+    expected = dataset.query('20206224', option_type='prestasi-rapor', orderby='score', order='desc')
+    stats = scraper.rate_limiter.stats()
+    assert records == expected and not errors, \
+        f"Scrape tidak lengkap: {len(records)}/{len(expected)}, errors: {errors[:2]}"
+    assert stats['backoffs'] >= 1 and faults['forbidden'] + faults['errors'] >= 1, \
+        f"Backoff tidak terjadi: {stats}, {faults}"
+
+    print(f"✅ {len(records)} records lengkap, {faults['forbidden']} x 403 dan {faults['errors']} x 500 "
+          f"di-retry, {stats['backoffs']} backoff")
+
+def test_retry_backoff_without_limiter():
+    """Test retry 403 tetap diberi jeda saat rate limiting dimatikan (requests_per_second=0)"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING RETRY BACKOFF WITHOUT LIMITER")
+    print("="*80)
+
+    import requests
+
+    from response_cache import fetch_json
+
+    disabled = AdaptiveRateLimiter(0)
+    assert disabled.record(403, 0.01) is None, "Limiter mati seharusnya tidak melaporkan backoff"
+    paced = AdaptiveRateLimiter(20, base_backoff=0.2)
+    assert 0.15 < paced.record(429, 0.01) <= 0.21 and paced.record(200, 0.01) == 0.0, \
+        "record() seharusnya melaporkan backoff yang diterapkan"
+
+    dataset = SyntheticDataset(registrations_per_school=50)
+    with MockSPMBServer(dataset, forbidden_rate=1.0) as server:
+        started = time.perf_counter()
+        try:
+            fetch_json(requests.Session(), f"{server.registration_url}/20227910-16-1-00001", timeout=5,
+                       throttle=disabled.acquire, feedback=disabled.record, retries=2)
+        except requests.exceptions.HTTPError:
+            pass
+        else:
+            raise AssertionError("403 seharusnya dilempar setelah retry habis")
+        elapsed = time.perf_counter() - started
+        requests_made = server.stats()['requests']
+
+    # 0.5s + 1.0s between the three attempts
+    assert requests_made == 3 and elapsed >= 1.4, f"Retry tanpa jeda: {requests_made} requests dalam {elapsed:.3f}s"
+
+    print(f"✅ {requests_made} requests dengan backoff {elapsed:.2f}s saat limiter mati")
+
+if __name__ == "__main__":
+    test_aimd_backoff()
+    test_shared_budget_across_processes()
+    test_scrape_recovers_from_faults()
+    test_retry_backoff_without_limiter()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("AIMD backoff: ✅ PASS")
+    print("Cross-process budget: ✅ PASS")
+    print("Scrape under 403/500: ✅ PASS")
+    print("Retry backoff without limiter: ✅ PASS")
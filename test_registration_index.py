@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test persistent registration-number index untuk lookup_position (offline)
+"""
+
+import csv
+import sys
+import os
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from registration_index import RegistrationIndex
+from lookup_position import find_registration_position
+
+def write_zonasi_csv(path, count, quoted_name_at=None):
+    """Tulis CSV zonasi sintetis yang sudah urut berdasarkan distance_1"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['registration_number', 'name', 'distance_1'])
+        writer.writeheader()
+        for i in range(count):
+            name = f"Siswa {i}"
+            if i == quoted_name_at:
+                name = 'Siswa "Ganda"\nBaris, Dua'
+            writer.writerow({'registration_number': f"20227910-16-1-{i:05d}", 'name': name,
+                             'distance_1': 100 + i})
+
+def test_index_lookup():
+    """Test bahwa index memberikan posisi yang sama dengan scan linear"""
+
+    print("="*80)
+    print("🧪 TESTING REGISTRATION INDEX LOOKUP")
+    print("="*80)
+
+    csv_file = os.path.join(tempfile.mkdtemp(), 'hasil_zonasi_only.csv')
+    write_zonasi_csv(csv_file, 5000, quoted_name_at=10)
+
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    index = RegistrationIndex(csv_file)
+    for position in (1, 10, 11, 12, 2500, 5000):
+        expected = rows[position - 1]
+        rank, record = index.lookup(expected['registration_number'])
+        assert rank == position and record == expected, f"Lookup salah untuk posisi {position}: {rank} {record}"
+
+    assert index.lookup("20227910-16-1-99999") is None and index.total == 5000, \
+        "Nomor yang tidak ada seharusnya tidak ditemukan"
+
+    print(f"✅ Index cocok dengan scan linear ({index.total} records, termasuk field multi-baris)")
+
+def test_index_rebuild_on_change():
+    """Test bahwa index dibangun ulang ketika snapshot CSV berubah"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING REGISTRATION INDEX REBUILD")
+    print("="*80)
+
+    csv_file = os.path.join(tempfile.mkdtemp(), 'hasil_zonasi_only.csv')
+    write_zonasi_csv(csv_file, 200)
+
+    first = find_registration_position("20227910-16-1-00150", csv_file=csv_file)
+    index_mtime = os.path.getmtime(f"{os.path.splitext(csv_file)[0]}.index.sqlite")
+
+    # Lookup kedua memakai index yang sama tanpa build ulang
+    find_registration_position("20227910-16-1-00010", csv_file=csv_file)
+    assert os.path.getmtime(f"{os.path.splitext(csv_file)[0]}.index.sqlite") == index_mtime, \
+        "Index dibangun ulang padahal CSV tidak berubah"
+
+    time.sleep(0.01)
+    write_zonasi_csv(csv_file, 100)
+    second = find_registration_position("20227910-16-1-00150", csv_file=csv_file)
+    third = find_registration_position("20227910-16-1-00050", csv_file=csv_file)
+
+    assert first['position'] == 151 and not second['found'] and third['total_zonasi'] == 100, \
+        f"Index tidak mengikuti perubahan CSV: {first} {second} {third}"
+
+    print("✅ Index dipakai ulang selama CSV sama dan dibangun ulang setelah CSV berubah")
+
+if __name__ == "__main__":
+    test_index_lookup()
+    test_index_rebuild_on_change()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Index lookup: ✅ PASS")
+    print("Index rebuild: ✅ PASS")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test on-disk response cache untuk semua client SPMB API (offline)
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from response_cache import ResponseCache
+
+API_URL = "https://spmb.jabarprov.go.id/api/public/registration"
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+class FakeSession:
+    """Session palsu yang menghitung berapa kali network dipanggil"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return FakeResponse({'code': 200, 'result': {'url': url, 'params': params,
+                                                     'padding': 'x' * 1000}})
+
+def test_cache_hit_and_key():
+    """Test bahwa request identik (urutan params berbeda) dilayani dari cache"""
+
+    print("="*80)
+    print("🧪 TESTING RESPONSE CACHE HIT/MISS")
+    print("="*80)
+
+    cache = ResponseCache(cache_dir=tempfile.mkdtemp())
+    session = FakeSession()
+    throttled = []
+
+    cache.fetch_json(session, API_URL, {'page': 1, 'npsn': '20227910'}, throttle=lambda: throttled.append(1))
+    cache.fetch_json(session, API_URL, {'npsn': '20227910', 'page': 1}, throttle=lambda: throttled.append(1))
+    cache.fetch_json(session, API_URL, {'npsn': '20227910', 'page': 2}, throttle=lambda: throttled.append(1))
+
+    stats = cache.stats()
+    assert session.calls == 2 and len(throttled) == 2, \
+        f"Network dipanggil {session.calls}x, throttle {len(throttled)}x (seharusnya 2)"
+    assert stats['hits'] == 1 and stats['misses'] == 2, f"Counter salah: {stats}"
+
+    print(f"✅ Cache bekerja: {stats}")
+
+def test_cache_ttl_and_eviction():
+    """Test TTL per endpoint dan LRU eviction berdasarkan ukuran"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING RESPONSE CACHE TTL DAN EVICTION")
+    print("="*80)
+
+    # TTL 0 detik untuk list registrasi -> selalu expired
+    cache = ResponseCache(cache_dir=tempfile.mkdtemp(), ttls=[(r'/registration$', 0)])
+    session = FakeSession()
+    cache.fetch_json(session, API_URL, {'page': 1})
+    time.sleep(0.01)
+    cache.fetch_json(session, API_URL, {'page': 1})
+    assert session.calls == 2, "Entry yang expired masih dipakai"
+    print("✅ Entry expired diambil ulang dari network")
+
+    # Batas 10 KB: hanya sebagian kecil dari 30 halaman yang tetap tersimpan
+    cache = ResponseCache(cache_dir=tempfile.mkdtemp(), max_bytes=10 * 1024)
+    session = FakeSession()
+    for page in range(1, 31):
+        cache.fetch_json(session, API_URL, {'page': page})
+        time.sleep(0.002)
+
+    stats = cache.stats()
+    assert stats['evictions'] != 0 and cache._scan_size() <= 10 * 1024, \
+        f"Eviction tidak berjalan: {stats}, size {cache._scan_size()}"
+
+    # Halaman terbaru masih ada, halaman pertama sudah di-evict
+    calls_before = session.calls
+    cache.fetch_json(session, API_URL, {'page': 30})
+    cache.fetch_json(session, API_URL, {'page': 1})
+    assert session.calls == calls_before + 1, "Urutan LRU eviction salah"
+
+    print(f"✅ LRU eviction menjaga cache di bawah batas: {stats['evictions']} entries di-evict")
+
+if __name__ == "__main__":
+    test_cache_hit_and_key()
+    test_cache_ttl_and_eviction()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Cache hit/miss: ✅ PASS")
+    print("Cache TTL & eviction: ✅ PASS")
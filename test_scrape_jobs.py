@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test background scrape jobs (scrape_jobs.py) dengan SPMBClient (offline)
+"""
+
+import sys
+import os
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrape_jobs import JobRegistry
+from spmb_client import SPMBClient
+from test_concurrent_scraping import make_fake_fetch_page
+
+def slow_scrape(job, total_records, concurrent, npsn='20227910'):
+    scraper = SPMBClient("http://localhost/api/public/registration",
+                         max_workers=2, requests_per_second=0, on_error=job.text)
+    fake_fetch_page = make_fake_fetch_page(total_records=total_records, limit_per_page=100)
+
+    def slow_fetch_page(*args, **kwargs):
+        time.sleep(0.02)
+        return fake_fetch_page(*args, **kwargs)
+
+    scraper.fetch_page = slow_fetch_page
+    return scraper.scrape_all_pages(job, job, limit_per_page=100, npsn=npsn, concurrent=concurrent,
+                                    cancel_event=job.cancel_event)
+
+def wait_for(job, timeout=10):
+    deadline = time.time() + timeout
+    while job.running and time.time() < deadline:
+        time.sleep(0.01)
+    return not job.running
+
+def test_job_shared_and_completes():
+    """Test job yang sama dipakai bersama dan progress terbaca dari luar thread"""
+
+    print("="*80)
+    print("🧪 TESTING BACKGROUND SCRAPE JOB")
+    print("="*80)
+
+    registry = JobRegistry()
+    job = registry.submit(('prestasi-rapor', '20206224'), slow_scrape, 1000, True, '20206224')
+    same = registry.submit(('prestasi-rapor', '20206224'), slow_scrape, 1000, True, '20206224')
+    other = registry.submit(('prestasi-rapor', '20227910'), slow_scrape, 300, False)
+
+    assert same is job and other is not job, "Job dengan key sama seharusnya dipakai bersama"
+
+    assert wait_for(job) and wait_for(other), "Job tidak selesai"
+
+    assert job.status == 'done' and len(job.result) == 1000 and job.fraction == 1.0, \
+        f"Status/hasil salah: {job.status}, {len(job.result or [])}, {job.fraction}"
+    assert len(other.result) == 300 and not registry.running_jobs(), "Job sequential salah"
+
+    again = registry.submit(('prestasi-rapor', '20206224'), slow_scrape, 100, True)
+    assert again is not job and wait_for(again) and registry.latest(('prestasi-rapor', '20206224')) is again, \
+        "Job baru seharusnya dibuat setelah job lama selesai"
+
+    print(f"✅ Job dipakai bersama, {len(job.result)} records dalam {job.elapsed:.2f}s")
+
+def test_job_cancel_and_failure():
+    """Test cancel menghentikan fetch halaman berikutnya dan error tercatat"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING JOB CANCEL AND FAILURE")
+    print("="*80)
+
+    registry = JobRegistry()
+    results = {}
+    for concurrent in (True, False):
+        job = registry.submit(('cancel', concurrent), slow_scrape, 10000, concurrent)
+        time.sleep(0.2)
+        job.cancel()
+        started = time.time()
+        assert wait_for(job, timeout=2), "Job tidak berhenti setelah cancel"
+        assert job.status == 'cancelled' and len(job.result) < 10000, f"Cancel tidak bekerja: {job.status}"
+        results[concurrent] = (len(job.result), time.time() - started)
+
+    def broken(job):
+        raise ValueError("API berubah")
+
+    failed = registry.submit(('broken',), broken)
+    wait_for(failed)
+    assert failed.status == 'failed' and 'API berubah' in failed.error, "Error job tidak tercatat"
+
+    print(f"✅ Cancel concurrent/sequential: {results}, error tercatat")
+
+if __name__ == "__main__":
+    test_job_shared_and_completes()
+    test_job_cancel_and_failure()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Shared background job: ✅ PASS")
+    print("Cancel and failure: ✅ PASS")
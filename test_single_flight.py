@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test single-flight dedup untuk scrape identik dari beberapa sesi (offline)
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from spmb_client import SPMBClient
+from test_concurrent_scraping import MockProgress, MockStatus, make_fake_fetch_page
+
+class CountingFetch:
+    """fetch_page palsu yang lambat dan menghitung request ke API"""
+
+    def __init__(self, total_records):
+        self.fake_fetch_page = make_fake_fetch_page(total_records=total_records, limit_per_page=100)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.02)
+        return self.fake_fetch_page(*args, **kwargs)
+
+def run_sessions(fetch, sessions, npsn_for=lambda i: '20206224', cancel_for=lambda i: None):
+    """Jalankan beberapa sesi bersamaan, masing-masing dengan scraper sendiri"""
+    results = [None] * sessions
+
+    def session(i):
+        scraper = SPMBClient("http://localhost/api/public/registration",
+                             max_workers=2, requests_per_second=0)
+        scraper.fetch_page = fetch
+        results[i] = scraper.scrape_all_pages(MockProgress(), MockStatus(), limit_per_page=100,
+                                              npsn=npsn_for(i), option_type='prestasi-rapor',
+                                              orderby='score', order='desc', concurrent=True,
+                                              cancel_event=cancel_for(i))
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_identical_scrapes_share_one_fetch():
+    """Test 5 sesi dengan parameter sama hanya menghasilkan satu set request"""
+
+    print("="*80)
+    print("🧪 TESTING SINGLE-FLIGHT SCRAPE")
+    print("="*80)
+
+    fetch = CountingFetch(1000)
+    results = run_sessions(fetch, 5)
+
+    assert all(len(result) == 1000 for result in results), \
+        f"Jumlah records salah: {[len(result) for result in results]}"
+    assert fetch.calls == 10, f"Seharusnya 10 request, ternyata {fetch.calls}"
+
+    other = CountingFetch(1000)
+    run_sessions(other, 2, npsn_for=lambda i: f"2020622{i}")
+    assert other.calls == 20, f"NPSN berbeda tidak boleh digabung: {other.calls} request"
+
+    print(f"✅ 5 sesi identik: {fetch.calls} request (tanpa dedup: 50)")
+
+def test_cancel_does_not_leak():
+    """Test cancel leader tidak memotong hasil sesi lain, cancel waiter hanya menghentikan dirinya"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING SINGLE-FLIGHT CANCEL")
+    print("="*80)
+
+    leader_cancel = threading.Event()
+    threading.Timer(0.05, leader_cancel.set).start()
+    results = run_sessions(CountingFetch(2000), 3,
+                           cancel_for=lambda i: leader_cancel if i == 0 else None)
+
+    assert len(results[0]) < 2000 and all(len(result) == 2000 for result in results[1:]), \
+        f"Hasil setelah leader cancel salah: {[len(result) for result in results]}"
+
+    waiter_cancel = threading.Event()
+    threading.Timer(0.05, waiter_cancel.set).start()
+    results = run_sessions(CountingFetch(2000), 2,
+                           cancel_for=lambda i: waiter_cancel if i == 1 else None)
+
+    assert len(results[0]) == 2000 and results[1] == [], \
+        f"Hasil setelah waiter cancel salah: {[len(result) for result in results]}"
+
+    print("✅ Cancel hanya berlaku untuk sesi yang membatalkan")
+
+if __name__ == "__main__":
+    test_identical_scrapes_share_one_fetch()
+    test_cancel_does_not_leak()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Single-flight scrape: ✅ PASS")
+    print("Single-flight cancel: ✅ PASS")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test columnar snapshot store (Parquet) untuk file hasil_*.csv (offline)
+"""
+
+import sys
+import os
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scrape_paginated import PaginatedScraper
+from snapshot_store import read_snapshot, snapshot_path, LOOKUP_COLUMNS
+from lookup_position import find_registration_position
+
+def make_records(count):
+    """Buat data zonasi sintetis yang sudah urut berdasarkan distance_1"""
+    return [
+        {
+            'registration_number': f"20227910-16-1-{i:05d}",
+            'name': f"Siswa {i}",
+            'school_name': f"SMP NEGERI {i % 7 + 1} PADALARANG",
+            'option_type': 'zonasi' if i % 5 else 'ketm',
+            'first_option_name': 'SMAN 1 PADALARANG - ZONASI',
+            'distance_1': str(100 + i * 3.5),
+            'score': '',
+            'address_city': 'KAB. BANDUNG BARAT'
+        }
+        for i in range(count)
+    ]
+
+def test_snapshot_roundtrip():
+    """Test bahwa scraper menulis snapshot bertipe dan reader memakai snapshot tersebut"""
+
+    print("="*80)
+    print("🧪 TESTING SNAPSHOT ROUNDTRIP")
+    print("="*80)
+
+    tmp_dir = tempfile.mkdtemp()
+    all_file = os.path.join(tmp_dir, 'hasil_paginated_sorted.csv')
+    zonasi_file = os.path.join(tmp_dir, 'hasil_zonasi_only.csv')
+
+    scraper = PaginatedScraper("http://localhost/api/public/registration", all_file, zonasi_file,
+                               use_cache=False)
+    scraper.save_to_csv(make_records(500))
+
+    assert os.path.exists(snapshot_path(zonasi_file)), "Snapshot parquet tidak ditulis"
+
+    df = read_snapshot(zonasi_file, columns=LOOKUP_COLUMNS + ['not_a_column'])
+    assert list(df.columns) == LOOKUP_COLUMNS and len(df) == 400, \
+        f"Proyeksi kolom salah: {list(df.columns)} ({len(df)} rows)"
+    assert str(df['school_name'].dtype) == 'category' and str(df['distance_1'].dtype) == 'float64', \
+        f"Tipe kolom salah: {dict(df.dtypes)}"
+
+    result = find_registration_position("20227910-16-1-00006", csv_file=zonasi_file)
+    assert result['found'] and result['position'] == 5 and result['total_zonasi'] == 400, \
+        f"Lookup posisi salah: {result}"
+
+    print(f"✅ Snapshot bertipe: {len(df)} rows, posisi #{result['position']} dari {result['total_zonasi']}")
+
+def test_csv_fallback():
+    """Test bahwa CSV yang lebih baru dari snapshot tetap dibaca dari CSV"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING CSV FALLBACK")
+    print("="*80)
+
+    tmp_dir = tempfile.mkdtemp()
+    csv_file = os.path.join(tmp_dir, 'hasil_zonasi_only.csv')
+    with open(csv_file, 'w', encoding='utf-8') as f:
+        f.write("registration_number,name,distance_1\n20227910-16-1-00001,Siswa 1,150.5\n")
+
+    df = read_snapshot(csv_file)
+    assert len(df) == 1 and df['distance_1'].iloc[0] == 150.5, "CSV fallback gagal"
+
+    print("✅ CSV tanpa snapshot dibaca dengan tipe yang benar")
+
+if __name__ == "__main__":
+    test_snapshot_roundtrip()
+    test_csv_fallback()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Snapshot roundtrip: ✅ PASS")
+    print("CSV fallback: ✅ PASS")
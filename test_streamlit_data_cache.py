@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test cached data layer untuk tab Top 50 per Jurusan di streamlit_app.py (offline)
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit_app import load_prestasi_dataset
+from test_lookup_service import write_prestasi_csv
+
+def test_dataset_reused_until_snapshot_changes():
+    """Test frame, analisis dan download dipakai ulang sampai file berubah"""
+
+    print("="*80)
+    print("🧪 TESTING STREAMLIT DATA CACHE")
+    print("="*80)
+
+    prestasi_file = os.path.join(tempfile.mkdtemp(), 'hasil_all_prestasi_rapor.csv')
+    assert load_prestasi_dataset(prestasi_file) is None, "File yang tidak ada seharusnya None"
+
+    write_prestasi_csv(prestasi_file)
+    dataset = load_prestasi_dataset(prestasi_file)
+    assert sorted(dataset.analysis) == ['PEMASARAN', 'TEKNIK ELEKTRONIKA'], \
+        f"Analisis salah: {list(dataset.analysis)}"
+
+    started = time.perf_counter()
+    for _ in range(100):
+        again = load_prestasi_dataset(prestasi_file)
+    rerun_ms = (time.perf_counter() - started) / 100 * 1000
+    assert again is dataset, "Dataset dibangun ulang padahal file tidak berubah"
+
+    payload = dataset.download("comparison", lambda: dataset.comparison)
+    assert dataset.download("comparison", lambda: None) is payload, "Payload download diserialisasi ulang"
+
+    # Tambah satu jurusan baru -> ukuran file berubah -> dataset dibangun ulang
+    df = pd.read_csv(prestasi_file)
+    extra = df.head(1).assign(first_option_name='SMKN 4 PADALARANG - AGRIBISNIS TANAMAN - PRESTASI NILAI RAPOR')
+    pd.concat([df, extra]).to_csv(prestasi_file, index=False)
+
+    reloaded = load_prestasi_dataset(prestasi_file)
+    assert reloaded is not dataset and 'AGRIBISNIS TANAMAN' in reloaded.analysis, \
+        "Dataset tidak dibangun ulang setelah file berubah"
+
+    print(f"✅ Rerun tanpa perubahan: {rerun_ms:.3f} ms, dibangun ulang setelah file berubah")
+
+if __name__ == "__main__":
+    test_dataset_reused_until_snapshot_changes()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Streamlit data cache: ✅ PASS")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test watchlist alerts (watchlist.py): alert dievaluasi per snapshot baru dan ditulis ke outbox JSONL
+"""
+
+import sys
+import os
+import csv
+import tempfile
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mock_spmb_server import MockSPMBServer, SyntheticDataset
+from poll_daemon import PollDaemon, expand_targets
+from snapshot_history import SnapshotHistory
+from spmb_client import SPMBClient
+from watchlist import AlertOutbox, WatchlistMonitor, read_watchlist
+
+def write_ranking(path, keys):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['registration_number', 'name'])
+        for key in keys:
+            writer.writerow([key, f"Siswa {key}"])
+
+def test_watchlist_alerts():
+    """Test alert keluar/masuk kuota, dekat batas kuota dan withdraw hanya muncul sekali per perubahan"""
+
+    print("="*80)
+    print("🧪 TESTING WATCHLIST ALERTS")
+    print("="*80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = read_watchlist(['registration_number,quota', '# komentar', 's005', 's012;10;1', '',
+                                  's020\t', 's099'], default_quota=8, default_margin=2)
+        assert [(e['registration_number'], e['quota'], e['margin']) for e in entries] == \
+            [('s005', 8, 2), ('s012', 10, 1), ('s020', 8, 2), ('s099', 8, 2)], \
+            f"Parsing watchlist salah: {entries}"
+
+        watchlist_file = os.path.join(tmp, 'watchlist.txt')
+        with open(watchlist_file, 'w', encoding='utf-8') as f:
+            f.write("s005\ns012,10,1\ns020\ns099\n")
+        csv_file = os.path.join(tmp, 'hasil_zonasi_only.csv')
+        outbox = os.path.join(tmp, 'alerts.jsonl')
+        monitor = WatchlistMonitor(watchlist_file, outbox, default_quota=8, default_margin=2)
+
+        keys = [f"s{i:03d}" for i in range(30)]
+        write_ranking(csv_file, keys)
+        first = monitor.check(csv_file, source='zonasi')
+        assert sorted((a['registration_number'], a['alert']) for a in first['alerts']) == \
+            [('s005', 'near_cutoff')], \
+            f"Check pertama seharusnya hanya near_cutoff: {first['alerts']}"
+
+        same = monitor.check(csv_file, source='zonasi')
+        assert same['looked_up'] == 0 and not same['alerts'], \
+            f"CSV yang sama seharusnya tidak di-lookup ulang: {same}"
+
+        # s005 drops from #6 to #10 (out of quota 8), s012 climbs to #4, s020 withdraws
+        changed = [k for k in keys if k not in ('s005', 's012', 's020')]
+        changed = changed[:3] + ['s012'] + changed[3:8] + ['s005'] + changed[8:]
+        write_ranking(csv_file, changed)
+        second = monitor.check(csv_file, source='zonasi', snapshot='snap-2')
+        triggered = sorted((a['registration_number'], a['alert'], a['previous_rank'], a['rank'])
+                           for a in second['alerts'])
+        assert triggered == [('s005', 'out_of_quota', 6, 10), ('s012', 'into_quota', 13, 4),
+                             ('s020', 'withdrawn', 21, None)], f"Alert salah: {triggered}"
+
+        delivered = AlertOutbox(outbox).load()
+        assert len(delivered) == 4 and \
+            all(a['source'] == 'zonasi' for a in delivered) and \
+            delivered[-1]['snapshot'] == 'snap-2', \
+            f"Outbox salah: {delivered}"
+
+        with open(outbox, 'a', encoding='utf-8') as f:
+            f.write('{"alert": "trunc')
+        assert len(AlertOutbox(outbox).load()) == 4, "Baris terpotong seharusnya dilewati"
+
+    print(f"✅ {len(first['alerts'])} alert awal, {len(second['alerts'])} alert setelah perubahan, "
+          f"0 lookup untuk CSV yang sama")
+
+def test_daemon_watchlist():
+    """Test polling daemon mengevaluasi watchlist setiap snapshot baru, prestasi hanya per jurusan"""
+
+    print("\n" + "="*80)
+    print("🧪 TESTING DAEMON WATCHLIST")
+    print("="*80)
+
+    dataset = SyntheticDataset(registrations_per_school=1000, seed=33)
+    with tempfile.TemporaryDirectory() as tmp, MockSPMBServer(dataset) as server:
+        ranked = dataset.query('20227910', option_type='zonasi', orderby='distance_1', order='asc')
+        watched = [record['registration_number'] for record in ranked[125:139]]
+        watchlist_file = os.path.join(tmp, 'watchlist.txt')
+        with open(watchlist_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(watched) + '\n')
+
+        outbox = os.path.join(tmp, 'alerts.jsonl')
+        client = SPMBClient(server.registration_url, requests_per_second=0, use_cache=False)
+        config = {'outbox': outbox, 'schools': [{'npsn': '20227910', 'option_types': ['zonasi'],
+                                                 'limit_per_page': 50, 'watchlist': watchlist_file}]}
+        daemon = PollDaemon(config, SnapshotHistory(os.path.join(tmp, 'history')), client)
+        target = daemon.targets[0]
+
+        first = daemon.poll(target)
+        unchanged = daemon.poll(target)
+        dataset.add_registrations('20227910', 200, seed=4)
+        changed = daemon.poll(target)
+
+        assert len(first['alerts']) == 6 and not unchanged['alerts'], \
+            f"Alert awal salah: {len(first['alerts'])}, {len(unchanged['alerts'])}"
+
+        ranks = {record['registration_number']: rank for rank, record in enumerate(
+            dataset.query('20227910', option_type='zonasi', orderby='distance_1', order='asc'), 1)}
+        expected_out = sorted(key for key in watched if ranks[key] > 139)
+        out = sorted(a['registration_number'] for a in changed['alerts'] if a['alert'] == 'out_of_quota')
+        assert expected_out and out == expected_out, f"out_of_quota salah: {out} vs {expected_out}"
+        assert all(a['rank'] == ranks[a['registration_number']] for a in changed['alerts']), \
+            "Rank di alert tidak sesuai data terbaru"
+        pointer = daemon.history.latest(target['series'])
+        assert all(a['snapshot'] == pointer['snapshot'] for a in changed['alerts']), \
+            "Alert seharusnya menyebut snapshot terbaru"
+
+        # Prestasi quotas are per jurusan: only a single-major list can be watched
+        targets = expand_targets({'schools': [
+            {'npsn': '20206224', 'option_types': ['prestasi-rapor'], 'watchlist': watchlist_file},
+            {'npsn': '20206224', 'option_types': ['prestasi-rapor'], 'major_id': '202062242',
+             'watchlist': watchlist_file},
+        ]})
+        assert [target['watchlist'] for target in targets] == [None, watchlist_file], \
+            "Watchlist prestasi tanpa major_id seharusnya diabaikan"
+
+    print(f"✅ {len(watched)} siswa dipantau: {len(first['alerts'])} near_cutoff awal, "
+          f"{len(out)} out_of_quota setelah 200 pendaftar baru")
+
+if __name__ == "__main__":
+    test_watchlist_alerts()
+    test_daemon_watchlist()
+
+    print("\n" + "="*80)
+    print("TEST RESULTS SUMMARY")
+    print("="*80)
+    print("Watchlist alerts: ✅ PASS")
+    print("Daemon watchlist: ✅ PASS")
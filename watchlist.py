@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Watchlist alerts: check watched registration numbers against every new result snapshot.
+
+A watchlist is one "registration_number[,quota[,margin]]" per line; blank lines,
+# comments and a header are skipped, like lookup_position.py --batch. Each check
+looks up only the watched numbers in the result file's RegistrationIndex and
+compares them with the ranks seen at the previous check, so alerts fire once per
+change:
+
+    out_of_quota   was inside the quota, now outside
+    into_quota     was outside, now inside
+    near_cutoff    came within `margin` places of the cutoff (on either side)
+    withdrawn      was in the list, now missing
+
+A student seen for the first time only raises near_cutoff. Alerts are appended to a
+JSON-lines outbox.
+
+Ranks are positions in the result file, so the file must be one list ranked against
+one quota: zonasi-style lists, or prestasi-rapor scraped for a single jurusan
+(major_id). The unsplit prestasi-rapor list mixes every jurusan, each with its own
+quota, and is refused by watchable().
+
+    python watchlist.py watchlist.txt --csv hasil_zonasi_only.csv --outbox watchlist_alerts.jsonl
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from registration_index import get_index
+
+def read_watchlist(lines: Iterable[str], default_quota: int = 139, default_margin: int = 5) -> List[Dict]:
+    """Parse "registration_number[,quota[,margin]]" lines into watch entries"""
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        parts = [part.strip() for part in line.replace(';', ',').replace('\t', ',').split(',')]
+        if parts[0].lower() == 'registration_number':
+            continue
+
+        try:
+            quota = int(parts[1]) if len(parts) > 1 and parts[1] else default_quota
+        except ValueError:
+            quota = default_quota
+        try:
+            margin = int(parts[2]) if len(parts) > 2 and parts[2] else default_margin
+        except ValueError:
+            margin = default_margin
+        entries.append({'registration_number': parts[0], 'quota': quota, 'margin': margin})
+
+    return entries
+
+def watchable(option_type: str, major_id: Optional[str] = None) -> bool:
+    """Whether positions in this list are ranks against a single quota"""
+    return option_type != 'prestasi-rapor' or bool(major_id)
+
+def near_cutoff(rank: Optional[int], entry: Dict) -> bool:
+    return rank is not None and abs(rank - entry['quota']) <= entry['margin']
+
+def evaluate(entries: List[Dict], ranks: Dict[str, int], previous: Dict[str, Optional[int]]) -> List[Dict]:
+    """Alerts for the watched students whose state changed.
+
+    ranks holds the current rank of every watched student in the list; previous is
+    the rank at the last check (None if absent then, missing key if never checked).
+    """
+    alerts = []
+    for entry in entries:
+        registration_number = entry['registration_number']
+        rank = ranks.get(registration_number)
+        seen = registration_number in previous
+        before = previous.get(registration_number)
+
+        triggered = []
+        if seen and before is not None and rank is None:
+            triggered.append('withdrawn')
+        if before is not None and rank is not None:
+            if before <= entry['quota'] < rank:
+                triggered.append('out_of_quota')
+            elif rank <= entry['quota'] < before:
+                triggered.append('into_quota')
+        if near_cutoff(rank, entry) and not near_cutoff(before, entry):
+            triggered.append('near_cutoff')
+
+        for alert in triggered:
+            alerts.append({'alert': alert, 'registration_number': registration_number, 'rank': rank,
+                           'previous_rank': before, 'quota': entry['quota']})
+    return alerts
+
+class AlertOutbox:
+    """Append-only JSON-lines file of triggered alerts"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, alerts: List[Dict]):
+        """Append alerts and flush them to disk"""
+        if not alerts:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> List[Dict]:
+        alerts = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        alerts.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A reader racing a writer can see a truncated last line
+                        continue
+        except FileNotFoundError:
+            pass
+        return alerts
+
+class WatchlistMonitor:
+    """Evaluate a watchlist file against result CSVs and deliver alerts to an outbox.
+
+    The ranks seen at the last check are kept per source (one result list, e.g. a
+    SnapshotHistory series) in a JSON state file next to the watchlist. A source
+    whose CSV is unchanged since its last check is skipped without any lookup.
+    """
+
+    def __init__(self, watchlist_file: str, outbox: str = 'watchlist_alerts.jsonl',
+                 state_file: Optional[str] = None, default_quota: int = 139, default_margin: int = 5):
+        self.watchlist_file = watchlist_file
+        self.outbox = AlertOutbox(outbox)
+        self.state_file = state_file or f"{os.path.splitext(watchlist_file)[0]}.state.json"
+        self.default_quota = default_quota
+        self.default_margin = default_margin
+        self.entries = []
+        self.watchlist_signature = None
+
+    def load_entries(self) -> List[Dict]:
+        """Re-read the watchlist when it was edited since the last check"""
+        stat = os.stat(self.watchlist_file)
+        signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+        if signature != self.watchlist_signature:
+            with open(self.watchlist_file, 'r', encoding='utf-8') as f:
+                self.entries = read_watchlist(f, self.default_quota, self.default_margin)
+            self.watchlist_signature = signature
+        return self.entries
+
+    def load_state(self) -> Dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, state: Dict):
+        tmp_path = f"{self.state_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    def check(self, csv_file: str, source: Optional[str] = None, snapshot: Optional[str] = None) -> Optional[Dict]:
+        """Check the watchlist against a result CSV and append new alerts to the outbox.
+
+        Returns a summary (source, looked_up, total, alerts) or None on error.
+        """
+        source = source or os.path.abspath(csv_file)
+        try:
+            entries = self.load_entries()
+            index = get_index(csv_file)
+            index.ensure_current()
+        except (OSError, ValueError) as e:
+            print(f"❌ Watchlist {self.watchlist_file}: {e}")
+            return None
+
+        state = self.load_state()
+        previous = state.get(source, {})
+        watched = {entry['registration_number'] for entry in entries}
+        if previous.get('signature') == index.signature and watched <= previous.get('ranks', {}).keys():
+            return {'source': source, 'looked_up': 0, 'total': index.total, 'alerts': []}
+
+        ranks = index.lookup_ranks(sorted(watched))
+        alerts = evaluate(entries, ranks, previous.get('ranks', {}))
+        checked_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        for alert in alerts:
+            alert.update(source=source, snapshot=snapshot, total=index.total, checked_at=checked_at)
+        self.outbox.append(alerts)
+
+        state[source] = {'signature': index.signature, 'checked_at': checked_at,
+                         'ranks': {key: ranks.get(key) for key in sorted(watched)}}
+        self.save_state(state)
+        return {'source': source, 'looked_up': len(watched), 'total': index.total, 'alerts': alerts}
+
+def format_alert(alert: Dict) -> str:
+    ranks = f"#{alert['previous_rank'] or '-'} -> #{alert['rank'] or '-'}"
+    return f"🔔 {alert['registration_number']} {alert['alert']} ({ranks}, kuota {alert['quota']})"
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a watchlist against a result file and write alerts")
+    parser.add_argument('watchlist', help="File with one registration_number[,quota[,margin]] per line")
+    parser.add_argument('--csv', default='hasil_zonasi_only.csv', help="Ranked result CSV")
+    parser.add_argument('--option-type', default='zonasi', help="Option type of the result list (default: zonasi)")
+    parser.add_argument('--major-id', help="Jurusan the prestasi-rapor list was scraped for")
+    parser.add_argument('--outbox', default='watchlist_alerts.jsonl', help="Alert outbox (JSON lines)")
+    parser.add_argument('--state', help="State file (default: <watchlist>.state.json)")
+    parser.add_argument('--quota', type=int, default=139, help="Default quota (default: 139)")
+    parser.add_argument('--margin', type=int, default=5, help="Default near-cutoff margin (default: 5)")
+    args = parser.parse_args()
+
+    if not watchable(args.option_type, args.major_id):
+        print("❌ Kuota prestasi-rapor per jurusan: scrape satu jurusan dan berikan --major-id")
+        return
+
+    monitor = WatchlistMonitor(args.watchlist, args.outbox, args.state, args.quota, args.margin)
+    summary = monitor.check(args.csv)
+    if summary is None:
+        return
+
+    for alert in summary['alerts']:
+        print(format_alert(alert))
+    if not summary['looked_up']:
+        print(f"✓ {args.csv} unchanged since the last check")
+    else:
+        print(f"✅ {summary['looked_up']} watched, {len(summary['alerts'])} alerts -> {args.outbox}")
+
+if __name__ == "__main__":
+    main()